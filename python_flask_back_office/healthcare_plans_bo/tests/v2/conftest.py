@@ -0,0 +1,47 @@
+"""
+V2 Test Fixtures
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/conftest.py
+
+An app on TestingConfig (in-memory SQLite, inline password hashing) with
+fresh tables for every test.
+"""
+
+import pytest
+from v2.main_v2 import create_app
+from v2.extensions_v2 import db
+from v2.customer_profile.model import Customer
+from v2.customer_profile.dao import CustomerDAOFactory
+from v2.customer_profile.dao.impl.customer_dao_impl import CustomerDAOImpl
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    CustomerDAOFactory.reset_instance()
+
+
+@pytest.fixture
+def make_customer(app):
+    """Insert a customer through the plain DAO; returns the created Customer"""
+    counter = iter(range(1, 1000))
+
+    def make(**columns) -> Customer:
+        number = next(counter)
+        values = {
+            'email': f'customer{number}@example.com',
+            'mobile_number': f'90000{number:05d}',
+            'password_hash': 'scrypt:1024:8:1$salt$hash',
+            'first_name': 'Asha',
+            'last_name': 'Rao',
+            'city': 'Mysuru',
+            'state': 'KA'
+        }
+        values.update(columns)
+        return CustomerDAOImpl().create(Customer(**values))
+
+    return make
@@ -0,0 +1,34 @@
+"""
+Back-Office Authentication Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_admin_auth.py
+
+The back-office API has no fallback key: it is closed until
+ADMIN_API_KEY is configured.
+"""
+
+import pytest
+
+ADMIN_STATS = '/api/v2/admin/customers/stats'
+
+
+@pytest.mark.parametrize('configured_key', [None, ''])
+def test_unconfigured_key_disables_back_office(app, configured_key):
+    app.config['ADMIN_API_KEY'] = configured_key
+    client = app.test_client()
+
+    for header in ({}, {'X-Admin-Key': ''}, {'X-Admin-Key': 'default-admin-key'}):
+        assert client.get(ADMIN_STATS, headers=header).status_code == 503
+
+
+def test_wrong_or_missing_key_is_rejected(app):
+    client = app.test_client()
+
+    assert client.get(ADMIN_STATS).status_code == 401
+    assert client.get(ADMIN_STATS, headers={'X-Admin-Key': 'default-admin-key'}).status_code == 401
+
+
+def test_configured_key_is_accepted(app):
+    response = app.test_client().get(ADMIN_STATS, headers={'X-Admin-Key': app.config['ADMIN_API_KEY']})
+
+    assert response.status_code == 200
+    assert response.json['success'] is True
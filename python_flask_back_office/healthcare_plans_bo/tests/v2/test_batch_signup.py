@@ -0,0 +1,57 @@
+"""
+Batch Signup Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_batch_signup.py
+
+A malformed item fails on its own; the rest of the enrollment goes
+through and every item is reported in request order.
+"""
+
+import json
+
+BATCH = '/api/v2/customers/batch'
+ADMIN_HEADERS = {'X-Admin-Key': 'test-admin-key'}
+
+
+def customer(number, **fields):
+    values = {
+        'email': f'member{number}@example.com', 'mobile_number': f'98765{number:05d}',
+        'password': 'password1', 'first_name': 'Asha', 'last_name': 'Rao'
+    }
+    values.update(fields)
+    return values
+
+
+def batch_signup(app, items):
+    response = app.test_client().post(BATCH, json={'customers': items}, headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    response.close()
+    return lines
+
+
+def test_non_string_field_fails_only_its_item(app):
+    lines = batch_signup(app, [
+        customer(1, email=5),
+        customer(2),
+        customer(3, password=12345678),
+        customer(4, first_name=None),
+        customer(5)
+    ])
+
+    assert [line['index'] for line in lines] == [0, 1, 2, 3, 4]
+    assert [line['success'] for line in lines] == [False, True, False, False, True]
+    assert lines[0]['message'] == 'email must be a string'
+    assert lines[2]['message'] == 'password must be a string'
+
+
+def test_batch_of_only_malformed_items(app):
+    lines = batch_signup(app, [customer(1, mobile_number=9876500001), customer(2, last_name=[])])
+
+    assert [(line['index'], line['success']) for line in lines] == [(0, False), (1, False)]
+
+
+def test_single_signup_with_non_string_field_is_a_bad_request(app):
+    response = app.test_client().post('/api/v2/customers/signup', json=customer(1, email=5))
+
+    assert response.status_code == 400
+    assert response.json['message'] == 'email must be a string'
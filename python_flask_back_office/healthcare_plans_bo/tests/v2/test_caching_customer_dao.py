@@ -0,0 +1,160 @@
+"""
+CachingCustomerDAO Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_caching_customer_dao.py
+
+A profile changed through the DAO or the service is never served from a
+stale cache entry.
+"""
+
+import pytest
+from v2.extensions_v2 import db
+from v2.customer_profile.model import Customer
+from v2.customer_profile.dao.impl.caching_customer_dao import CachingCustomerDAO
+from v2.customer_profile.dao.impl.customer_dao_impl import CustomerDAOImpl
+from v2.customer_profile.dto import LoginRequestDTO
+from v2.customer_profile.service.impl.customer_service_impl import CustomerServiceImpl
+
+
+class RacingCustomerDAO(CustomerDAOImpl):
+    """
+    Delegate whose next find_by_id reads the row, then lets `during_load`
+    run (a concurrent update) before returning what it read.
+    """
+
+    def __init__(self):
+        self.during_load = None
+
+    def find_by_id(self, customer_id):
+        customer = super().find_by_id(customer_id)
+        hook, self.during_load = self.during_load, None
+        if customer is not None and hook is not None:
+            # The reader holds its own copy; the writer's change does not reach it
+            db.session.expunge(customer)
+            hook()
+        return customer
+
+
+@pytest.fixture
+def caching_dao(app):
+    return CachingCustomerDAO(CustomerDAOImpl(), ttl_seconds=60, negative_ttl_seconds=60)
+
+
+@pytest.fixture
+def workers(app):
+    """Services of two workers, each with its own cache"""
+    return [
+        CustomerServiceImpl(CachingCustomerDAO(CustomerDAOImpl(), ttl_seconds=60))
+        for _ in range(2)
+    ]
+
+
+@pytest.fixture
+def customer(make_customer):
+    customer = Customer()
+    customer.set_password('password1')
+    return make_customer(password_hash=customer.password_hash)
+
+
+def login(worker, email, password):
+    db.session.expunge_all()
+    return worker.login(LoginRequestDTO(email=email, password=password)).success
+
+
+def test_update_profile_is_not_served_stale(app, make_customer, caching_dao):
+    customer_id = make_customer(city='Mysuru').id
+    service = CustomerServiceImpl(caching_dao)
+
+    assert service.get_profile(customer_id).city == 'Mysuru'
+    assert service.get_profile(customer_id).city == 'Mysuru'
+    assert caching_dao.stats()['hits'] >= 1
+
+    updated = service.update_profile(customer_id, {'city': 'Pune', 'first_name': 'Meera'})
+    assert updated.city == 'Pune'
+
+    profile = service.get_profile(customer_id)
+    assert (profile.city, profile.first_name) == ('Pune', 'Meera')
+    assert caching_dao.find_by_id(customer_id).city == 'Pune'
+
+
+def test_find_by_id_and_email_after_update(app, make_customer, caching_dao):
+    customer = make_customer(city='Mysuru')
+    caching_dao.find_by_id(customer.id)
+    caching_dao.find_by_email(customer.email)
+
+    cached = caching_dao.find_by_id(customer.id)
+    cached.city = 'Hubballi'
+    caching_dao.update(cached)
+
+    assert caching_dao.find_by_id(customer.id).city == 'Hubballi'
+    assert caching_dao.find_by_email(customer.email).city == 'Hubballi'
+
+
+def test_create_drops_negative_entry(app, caching_dao):
+    assert caching_dao.find_by_email('new@example.com') is None
+    assert caching_dao.find_by_id(1) is None
+
+    created = caching_dao.create(Customer(
+        email='new@example.com', mobile_number='9111111111', password_hash='x',
+        first_name='New', last_name='Customer'
+    ))
+
+    assert created.id == 1
+    assert caching_dao.find_by_email('new@example.com').id == created.id
+    assert caching_dao.find_by_id(created.id).email == 'new@example.com'
+
+
+def test_read_racing_an_update_does_not_cache_the_old_row(app, make_customer):
+    customer_id = make_customer(first_name='Asha').id
+    delegate = RacingCustomerDAO()
+    caching_dao = CachingCustomerDAO(delegate, ttl_seconds=60)
+
+    writer = CustomerDAOImpl().find_by_id(customer_id)
+    db.session.expunge(writer)
+    writer.first_name = 'Meera'
+    delegate.during_load = lambda: caching_dao.update(writer)
+
+    # This read loaded the row before the update committed
+    assert caching_dao.find_by_id(customer_id).first_name == 'Asha'
+    db.session.expunge_all()
+
+    # ... and must not have cached it
+    assert caching_dao.find_by_id(customer_id).first_name == 'Meera'
+    assert caching_dao.find_by_id(customer_id).first_name == 'Meera'
+
+
+def test_delete_invalidates_entry(app, make_customer, caching_dao):
+    customer = make_customer()
+    assert caching_dao.find_by_id(customer.id) is not None
+    assert caching_dao.find_by_id(customer.id) is not None
+
+    assert caching_dao.delete(customer.id) is True
+    db.session.expunge_all()
+
+    assert caching_dao.find_by_id(customer.id) is None
+    assert caching_dao.find_by_email(customer.email) is None
+
+
+def test_password_change_on_another_worker_applies_at_once(customer, workers):
+    first, second = workers
+    assert login(first, customer.email, 'password1')
+    assert first.get_profile(customer.id)
+
+    db.session.expunge_all()
+    assert second.change_password(customer.id, 'password1', 'password2')
+
+    assert not login(first, customer.email, 'password1')
+    assert login(first, customer.email, 'password2')
+    db.session.expunge_all()
+    with pytest.raises(ValueError):
+        first.change_password(customer.id, 'password1', 'password3')
+
+
+def test_deactivation_on_another_worker_applies_at_once(customer, workers):
+    first, second = workers
+    assert login(first, customer.email, 'password1')
+    assert first.get_profile(customer.id).is_active
+
+    db.session.expunge_all()
+    assert second.deactivate_account(customer.id)
+
+    assert not login(first, customer.email, 'password1')
@@ -0,0 +1,132 @@
+"""
+CustomerDAOImpl Statement Budgets
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_customer_dao_statements.py
+
+Every DAO write is one SQL statement, and the returned Customer can be
+serialized without another one (no refresh, no expired attributes).
+"""
+
+from datetime import timedelta
+
+import pytest
+from v2.common.query_stats import assert_max_queries
+from v2.extensions_v2 import db
+from v2.customer_profile.model import Customer
+from v2.customer_profile.dao import ConcurrentUpdateError
+from v2.customer_profile.dao.impl.caching_customer_dao import CachingCustomerDAO
+from v2.customer_profile.dao.impl.customer_dao_impl import CustomerDAOImpl
+from v2.customer_profile.dto import CustomerResponseDTO
+
+
+@pytest.fixture
+def dao(app):
+    return CustomerDAOImpl()
+
+
+def test_create_is_one_statement(dao):
+    customer = Customer(
+        email='new@example.com', mobile_number='9111111111', password_hash='x',
+        first_name='New', last_name='Customer'
+    )
+    with assert_max_queries(1):
+        created = dao.create(customer)
+        response = CustomerResponseDTO.from_model(created)
+
+    assert response.id == created.id
+    assert response.created_at is not None
+
+
+def test_update_is_one_statement(dao, make_customer):
+    customer = make_customer(city='Mysuru')
+    customer.city = 'Pune'
+
+    with assert_max_queries(1):
+        updated = dao.update(customer)
+        CustomerResponseDTO.from_model(updated)
+
+    db.session.expunge_all()
+    assert dao.find_by_id(customer.id).city == 'Pune'
+
+
+def test_update_of_cached_snapshot_is_one_statement(dao, make_customer):
+    customer_id = make_customer(city='Mysuru').id
+    caching_dao = CachingCustomerDAO(dao)
+    caching_dao.find_by_id(customer_id)
+    db.session.expunge_all()
+    snapshot = caching_dao.find_by_id(customer_id)
+    snapshot.city = 'Pune'
+
+    with assert_max_queries(1):
+        updated = dao.update(snapshot)
+        CustomerResponseDTO.from_model(updated)
+
+    db.session.expunge_all()
+    assert dao.find_by_id(customer_id).city == 'Pune'
+
+
+def test_update_with_if_match_is_one_statement(dao, make_customer):
+    customer = make_customer(city='Mysuru')
+    version = customer.updated_at
+    customer.city = 'Pune'
+
+    with assert_max_queries(1):
+        updated = dao.update(customer, expected_updated_at=version)
+        CustomerResponseDTO.from_model(updated)
+
+    assert updated.updated_at > version
+    db.session.expunge_all()
+    stored = dao.find_by_id(updated.id)
+    assert (stored.city, stored.updated_at) == ('Pune', updated.updated_at)
+
+
+def test_update_with_stale_if_match_is_refused_in_one_statement(dao, make_customer):
+    customer = make_customer(city='Mysuru')
+    customer_id = customer.id
+    stale_version = customer.updated_at - timedelta(seconds=1)
+    customer.city = 'Pune'
+
+    with assert_max_queries(1):
+        with pytest.raises(ConcurrentUpdateError):
+            dao.update(customer, expected_updated_at=stale_version)
+
+    db.session.expunge_all()
+    assert dao.find_by_id(customer_id).city == 'Mysuru'
+
+
+def test_delete_is_one_statement(dao, make_customer):
+    customer_id = make_customer().id
+
+    with assert_max_queries(1):
+        assert dao.delete(customer_id) is True
+
+    assert dao.find_by_id(customer_id) is None
+
+
+@pytest.mark.parametrize('read', [
+    lambda dao, customer: dao.find_by_id(customer.id),
+    lambda dao, customer: dao.find_by_email(customer.email),
+    lambda dao, customer: dao.find_by_ids([customer.id]),
+    lambda dao, customer: dao.find_version(customer.id),
+    lambda dao, customer: dao.find_columns_by_id(customer.id, ['email', 'city']),
+    lambda dao, customer: dao.find_credentials_by_email(customer.email),
+    lambda dao, customer: dao.find_credentials_by_id(customer.id),
+], ids=['find_by_id', 'find_by_email', 'find_by_ids', 'find_version', 'find_columns_by_id',
+        'find_credentials_by_email', 'find_credentials_by_id'])
+def test_reads_are_one_statement(dao, make_customer, read):
+    customer = make_customer()
+    db.session.expunge_all()
+
+    with assert_max_queries(1):
+        assert read(dao, customer)
+
+
+def test_bulk_create_is_insert_plus_id_lookup(dao):
+    rows = [
+        {'email': f'bulk{number}@example.com', 'mobile_number': f'91000{number:05d}',
+         'password_hash': 'x', 'first_name': 'Bulk', 'last_name': str(number)}
+        for number in range(20)
+    ]
+    with assert_max_queries(2):
+        ids = dao.bulk_create(rows)
+
+    assert len(ids) == 20
@@ -0,0 +1,45 @@
+"""
+Customer Listing Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_customer_listing.py
+
+Customers of a database created while created_at was still nullable are
+backfilled, and the keyset listing then pages through all of them.
+"""
+
+from sqlalchemy import update
+from v2.extensions_v2 import db
+from v2.customer_profile.model import Customer
+from v2.customer_profile.dao.impl.customer_dao_impl import backfill_created_at
+
+ADMIN_HEADERS = {'X-Admin-Key': 'test-admin-key'}
+
+
+def test_legacy_rows_without_created_at_are_listed_after_the_backfill(app, make_customer, monkeypatch):
+    # Schema as it was before created_at became NOT NULL
+    monkeypatch.setattr(Customer.__table__.c.created_at, 'nullable', True)
+    db.drop_all()
+    db.create_all()
+
+    customer_ids = [make_customer().id for _ in range(4)]
+    table = Customer.__table__
+    db.session.execute(
+        update(table).where(table.c.id.in_(customer_ids[1:3])).values(created_at=None)
+    )
+    db.session.commit()
+
+    assert backfill_created_at() == 2
+    assert backfill_created_at() == 0
+
+    client = app.test_client()
+    listed, cursor = [], None
+    while True:
+        query = '/api/v2/admin/customers?limit=1' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(query, headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        page = response.get_json()['data']
+        listed.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert sorted(listed) == customer_ids
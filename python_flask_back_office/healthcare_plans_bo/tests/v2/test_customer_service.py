@@ -0,0 +1,47 @@
+"""
+CustomerServiceImpl Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_customer_service.py
+
+A profile read that is in flight while the profile changes is not shared
+with reads arriving after the change.
+"""
+
+import pytest
+from v2.extensions_v2 import single_flight
+from v2.customer_profile.dao.impl.customer_dao_impl import CustomerDAOImpl
+from v2.customer_profile.service.impl.customer_service_impl import CustomerServiceImpl
+
+
+class InterruptedCustomerDAO(CustomerDAOImpl):
+    """Delegate whose next find_by_id runs `during_load` before returning"""
+
+    def __init__(self):
+        self.during_load = None
+
+    def find_by_id(self, customer_id):
+        customer = super().find_by_id(customer_id)
+        hook, self.during_load = self.during_load, None
+        if hook is not None:
+            hook()
+        return customer
+
+
+@pytest.mark.parametrize('change', [
+    lambda service, customer_id: service.deactivate_account(customer_id),
+    lambda service, customer_id: service.update_profile(customer_id, {'city': 'Pune'}),
+], ids=['deactivate_account', 'update_profile'])
+def test_reads_after_a_change_do_not_join_the_read_in_flight(app, make_customer, monkeypatch, change):
+    monkeypatch.setattr(single_flight, 'timeout_seconds', 0.5)
+    customer_id = make_customer().id
+    service = CustomerServiceImpl(InterruptedCustomerDAO())
+    later_reads = []
+
+    def change_then_read():
+        change(service, customer_id)
+        later_reads.append(service.get_profile(customer_id))
+
+    service._customer_dao.during_load = change_then_read
+    service.get_profile(customer_id)
+
+    # Joining the in-flight read would have timed out instead
+    assert later_reads == [service.get_profile(customer_id)]
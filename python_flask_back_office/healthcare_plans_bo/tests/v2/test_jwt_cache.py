@@ -0,0 +1,64 @@
+"""
+JWT Decode Cache Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_jwt_cache.py
+
+A cached token is only accepted while the keys and algorithms it was
+verified with are still configured.
+"""
+
+import pytest
+from flask_jwt_extended import JWTManager, create_access_token, decode_token
+from jwt.exceptions import InvalidTokenError
+from v2.extensions_v2 import jwt, signing_keys
+from v2.common.jwt_cache import CACHE_EXTENSION, decode_hook_supported
+from v2.common.jwt_keys import generate_signing_key
+
+
+def load_keys(app, directory, active_kid=None, accept_hs256=False):
+    app.config.update(
+        JWT_SIGNING_KEYS_DIR=str(directory),
+        JWT_SIGNING_KID=active_kid,
+        JWT_ACCEPT_HS256_TOKENS=accept_hs256
+    )
+    signing_keys.init_app(app, jwt)
+
+
+def test_installed_library_has_the_decode_hook():
+    assert decode_hook_supported()
+
+
+def test_token_of_a_removed_key_is_rejected_after_reload(app, tmp_path):
+    old_kid = generate_signing_key(str(tmp_path))
+    load_keys(app, tmp_path, old_kid)
+    token = create_access_token(identity='1')
+    assert decode_token(token)['sub'] == '1'
+    assert len(app.extensions[CACHE_EXTENSION]) == 1
+
+    (tmp_path / f'{old_kid}.pem').unlink()
+    new_kid = generate_signing_key(str(tmp_path))
+    load_keys(app, tmp_path, new_kid)
+
+    with pytest.raises(InvalidTokenError):
+        decode_token(token)
+
+
+def test_hs256_token_is_rejected_once_hs256_is_turned_off(app, tmp_path):
+    token = create_access_token(identity='1')
+    generate_signing_key(str(tmp_path))
+
+    load_keys(app, tmp_path, accept_hs256=True)
+    assert decode_token(token)['sub'] == '1'
+
+    load_keys(app, tmp_path, accept_hs256=False)
+    with pytest.raises(InvalidTokenError):
+        decode_token(token)
+
+
+def test_cache_is_off_when_the_decode_hook_changed(app, monkeypatch):
+    def changed_hook(self, encoded_token, csrf_value=None, allow_expired=False, audience=None):
+        raise NotImplementedError
+
+    monkeypatch.setattr(JWTManager, '_decode_jwt_from_config', changed_hook, raising=False)
+    jwt.init_app(app)
+
+    assert app.extensions[CACHE_EXTENSION] is None
@@ -0,0 +1,37 @@
+"""
+Login Throttle Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_login_throttle.py
+
+Behind the proxy, clients are throttled by their own address, taken from
+the proxy's X-Forwarded-For entry, not by the proxy's address.
+"""
+
+import pytest
+from v2.extensions_v2 import login_throttle
+
+LOGIN = '/api/v2/customers/login'
+
+
+@pytest.fixture
+def client(app):
+    app.config.update(LOGIN_THROTTLE_IP_BURST=2, LOGIN_THROTTLE_IP_PER_MINUTE=0.001)
+    login_throttle.init_app(app)
+    return app.test_client()
+
+
+def login(client, forwarded_for, number):
+    credentials = {'email': f'nobody{number}@example.com', 'password': 'wrong-password'}
+    return client.post(LOGIN, json=credentials, headers={'X-Forwarded-For': forwarded_for}).status_code
+
+
+def test_clients_behind_the_proxy_get_separate_buckets(client):
+    assert [login(client, '203.0.113.1', number) for number in range(3)] == [401, 401, 429]
+
+    assert login(client, '203.0.113.2', 3) == 401
+
+
+def test_only_the_trusted_proxy_entry_is_used(client):
+    # Entries added by the client itself do not give it a fresh bucket
+    statuses = [login(client, f'198.51.100.{number}, 203.0.113.1', number) for number in range(3)]
+
+    assert statuses == [401, 401, 429]
@@ -0,0 +1,37 @@
+"""
+PasswordHashExecutor Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_password_hashing.py
+
+With a pool configured, every hash of a request goes through the pool,
+its max_pending slots and its timeout; a one-item batch is no exception.
+"""
+
+import pytest
+from v2.common.password_hashers import create_hasher, verify_password
+from v2.common.password_hashing import PasswordHashExecutor, PasswordHashingBusyError
+
+
+@pytest.fixture
+def executor():
+    executor = PasswordHashExecutor()
+    executor.configure(workers=1, max_pending=1, timeout=0.2,
+                       hasher=create_hasher('scrypt', {'n': 1024, 'r': 8, 'p': 1}))
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_one_item_batch_is_hashed_in_the_pool(executor):
+    [password_hash] = executor.hash_many(['password1'], bounded=True)
+
+    assert verify_password(password_hash, 'password1')
+    assert executor._pool is not None
+
+
+def test_one_item_batch_waits_for_a_slot(executor):
+    # Another request holds the only max_pending slot
+    executor._slots.acquire()
+    try:
+        with pytest.raises(PasswordHashingBusyError):
+            executor.hash_many(['password1'], bounded=True)
+    finally:
+        executor._slots.release()
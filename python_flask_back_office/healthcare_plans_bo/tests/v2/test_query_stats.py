@@ -0,0 +1,26 @@
+"""
+Per-Request Query Statistics Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_query_stats.py
+
+Statements run while a streamed body is produced count for the request
+that streamed it.
+"""
+
+from v2.extensions_v2 import query_stats
+
+ADMIN_HEADERS = {'X-Admin-Key': 'test-admin-key'}
+
+
+def test_streamed_export_statements_are_counted(app, make_customer):
+    make_customer()
+    make_customer()
+
+    response = app.test_client().get('/api/v2/admin/customers/export?format=ndjson', headers=ADMIN_HEADERS)
+    assert response.is_streamed
+    assert len(response.get_data().splitlines()) == 2
+    response.close()
+
+    export = query_stats.stats()['endpoints']['admin_customer_v2.export_customers']
+    assert export['requests'] == 1
+    assert export['max_statements'] >= 1
+
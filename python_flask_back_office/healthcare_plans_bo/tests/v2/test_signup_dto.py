@@ -0,0 +1,52 @@
+"""
+Signup Validation Tests
+Location: python_flask_back_office/healthcare_plans_bo/tests/v2/test_signup_dto.py
+
+Signup accepts any email containing '@' and any mobile number of at
+least 10 characters, whether validated alone or in a batch.
+"""
+
+import pytest
+from v2.customer_profile.dto import SignupRequestDTO
+
+
+def signup(**fields):
+    values = {
+        'email': 'asha@example.com', 'mobile_number': '9876543210', 'password': 'password1',
+        'first_name': 'Asha', 'last_name': 'Rao'
+    }
+    values.update(fields)
+    return SignupRequestDTO.from_dict(values)
+
+
+@pytest.mark.parametrize('fields', [
+    {'mobile_number': '(555) 123-4567'},
+    {'mobile_number': '+1 (555) 123-4567'},
+    {'mobile_number': '555.123.4567'},
+    {'mobile_number': '+91 98765 43210'},
+    {'email': 'a@localhost'},
+])
+def test_accepted(fields):
+    assert signup(**fields).validate() == (True, None)
+
+
+@pytest.mark.parametrize('fields, message', [
+    ({'email': ''}, 'Valid email is required'),
+    ({'email': 'asha.example.com'}, 'Valid email is required'),
+    ({'mobile_number': ''}, 'Valid mobile number is required (minimum 10 digits)'),
+    ({'mobile_number': '555-1234'}, 'Valid mobile number is required (minimum 10 digits)'),
+    ({'password': 'short'}, 'Password must be at least 8 characters'),
+    ({'first_name': ' '}, 'First name is required'),
+    ({'last_name': ''}, 'Last name is required'),
+])
+def test_rejected(fields, message):
+    assert signup(**fields).validate() == (False, message)
+
+
+def test_batch_matches_single_validation():
+    requests = [signup(), signup(email='nope'), signup(mobile_number='(555) 123-4567'), signup(password='')]
+
+    assert SignupRequestDTO.validate_many(requests) == [request.validate()[1] for request in requests]
+    assert SignupRequestDTO.validate_many(requests) == [
+        None, 'Valid email is required', None, 'Password must be at least 8 characters'
+    ]
@@ -0,0 +1,21 @@
+"""
+V3 Test Fixtures
+
+An app on TestingConfig (in-memory SQLite, inline password hashing) with
+fresh tables for every test.
+"""
+
+import pytest
+from v3.main_v3 import create_app
+from v3.config import TestingConfig
+from v3.extensions import db
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,39 @@
+"""
+Admin Authentication Tests for V3
+
+The admin endpoints have no fallback key: they are closed until
+ADMIN_API_KEY is configured.
+"""
+
+import pytest
+
+ADMIN_ENDPOINTS = [
+    '/api/v3/admin/refresh-tokens/stats',
+    '/api/v3/admin/bulkheads/stats',
+    '/api/v3/admin/queries/stats'
+]
+
+
+@pytest.mark.parametrize('path', ADMIN_ENDPOINTS)
+@pytest.mark.parametrize('configured_key', [None, ''])
+def test_unconfigured_key_disables_admin_endpoints(app, path, configured_key):
+    app.config['ADMIN_API_KEY'] = configured_key
+    client = app.test_client()
+
+    for header in ({}, {'X-Admin-Key': ''}, {'X-Admin-Key': 'default-admin-key'}):
+        assert client.get(path, headers=header).status_code == 503
+
+
+@pytest.mark.parametrize('path', ADMIN_ENDPOINTS)
+def test_wrong_or_missing_key_is_rejected(app, path):
+    client = app.test_client()
+
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'X-Admin-Key': 'default-admin-key'}).status_code == 401
+
+
+@pytest.mark.parametrize('path', ADMIN_ENDPOINTS)
+def test_configured_key_is_accepted(app, path):
+    response = app.test_client().get(path, headers={'X-Admin-Key': app.config['ADMIN_API_KEY']})
+
+    assert response.status_code == 200
@@ -3,5 +3,6 @@ V2 API Module
 """
 
 from .health import health_bp
+from .well_known import well_known_bp
 
-__all__ = ['health_bp']
+__all__ = ['health_bp', 'well_known_bp']
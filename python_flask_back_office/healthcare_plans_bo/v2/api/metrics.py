@@ -0,0 +1,30 @@
+"""
+Metrics Endpoint for V2
+Location: python_flask_back_office/healthcare_plans_bo/v2/api/metrics.py
+"""
+
+from flask import Blueprint, Response, jsonify
+from v2.extensions_v2 import request_metrics
+
+metrics_bp = Blueprint('metrics_v2', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus Metrics
+    
+    GET /metrics
+    
+    Text exposition format, summed over all gunicorn workers when
+    PROMETHEUS_MULTIPROC_DIR is set (see v2/common/metrics.py). Meant to
+    be scraped from inside the network. 404 when METRICS_ENABLED is off
+    or prometheus_client is not installed.
+    """
+    if not request_metrics.enabled:
+        return jsonify({
+            'success': False,
+            'message': 'Metrics are disabled'
+        }), 404
+    body, content_type = request_metrics.exposition()
+    return Response(body, content_type=content_type)
@@ -0,0 +1,34 @@
+"""
+Well-Known Endpoints for V2
+Location: python_flask_back_office/healthcare_plans_bo/v2/api/well_known.py
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from v2.extensions_v2 import signing_keys
+
+well_known_bp = Blueprint('well_known_v2', __name__)
+
+
+@well_known_bp.route('/jwks.json', methods=['GET'])
+def jwks():
+    """
+    JSON Web Key Set
+    
+    GET /.well-known/jwks.json
+    
+    Public keys that verify the access tokens issued by this API, by kid
+    (empty while tokens are HS256-signed). Cacheable for
+    JWKS_MAX_AGE_SECONDS; revalidate with If-None-Match.
+    
+    Response:
+    {
+        "keys": [
+            {"kty": "OKP", "crv": "Ed25519", "x": "...", "kid": "20240101-1a2b3c4d", "alg": "EdDSA", "use": "sig"}
+        ]
+    }
+    """
+    response = jsonify(signing_keys.jwks())
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('JWKS_MAX_AGE_SECONDS', 3600)
+    response.add_etag()
+    return response.make_conditional(request)
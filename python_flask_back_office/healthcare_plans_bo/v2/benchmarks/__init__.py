@@ -0,0 +1,7 @@
+"""
+V2 Benchmarks
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/__init__.py
+
+Standalone benchmark scripts. Run from healthcare_plans_bo, e.g.:
+    python -m v2.benchmarks.bench_password_hashing
+"""
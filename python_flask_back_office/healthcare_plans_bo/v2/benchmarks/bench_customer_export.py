@@ -0,0 +1,120 @@
+"""
+Customer Export Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_customer_export.py
+
+Seeds a SQLite database with synthetic customers, then streams the full
+export through CustomerService.export_customers in a fresh process for
+each format and reports rows/sec and the peak RSS of that process. Peak
+RSS should stay roughly constant when --rows grows.
+
+Usage:
+    python -m v2.benchmarks.bench_customer_export --rows 1000000
+    python -m v2.benchmarks.bench_customer_export --database /tmp/export.db --keep
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SEED_BATCH = 10000
+
+
+def seed(database_url: str, rows: int) -> None:
+    """Insert `rows` synthetic customers with executemany batches"""
+    from sqlalchemy import create_engine, insert
+    from v2.customer_profile.model import Customer
+
+    engine = create_engine(database_url)
+    Customer.metadata.create_all(engine)
+    table = Customer.__table__
+    started_at = datetime(2020, 1, 1)
+    with engine.begin() as connection:
+        for offset in range(0, rows, SEED_BATCH):
+            connection.execute(insert(table), [
+                {
+                    'email': f'customer{i}@example.com',
+                    'mobile_number': f'{9000000000 + i}',
+                    'password_hash': 'scrypt:32768:8:1$benchmark$0000',
+                    'first_name': f'First{i}',
+                    'last_name': f'Last{i}',
+                    'address': f'{i} Benchmark Street',
+                    'city': 'Bengaluru',
+                    'state': 'KA',
+                    'pincode': '560001',
+                    'is_active': i % 10 != 0,
+                    'is_verified': i % 3 == 0,
+                    'created_at': started_at + timedelta(seconds=i),
+                    'updated_at': started_at + timedelta(seconds=i)
+                }
+                for i in range(offset, min(offset + SEED_BATCH, rows))
+            ])
+    engine.dispose()
+
+
+def export(export_format: str) -> None:
+    """Child process: stream the export to /dev/null and print the results"""
+    from v2.main_v2 import create_app
+    from v2.customer_profile.dto import CustomerExportRequestDTO
+    from v2.customer_profile.service import CustomerServiceFactory
+
+    app = create_app('production')
+    with app.app_context():
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        written = lines = 0
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as sink:
+            chunks = CustomerServiceFactory.get_instance().export_customers(
+                CustomerExportRequestDTO(format=export_format)
+            )
+            for chunk in chunks:
+                sink.write(chunk)
+                written += len(chunk)
+                lines += chunk.count('\n')
+        elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rows = lines - 1 if export_format == 'csv' else lines
+    print(f"RESULT {rows} {elapsed:.3f} {written} {baseline_kb} {peak_kb}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='synthetic customers to seed')
+    parser.add_argument('--database', help='SQLite file to use (seeded only if it does not exist)')
+    parser.add_argument('--keep', action='store_true', help='keep the database file afterwards')
+    parser.add_argument('--export-only', metavar='FORMAT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.export_only:
+        export(args.export_only)
+        return
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), 'bench_customer_export.db')
+    database_url = f'sqlite:///{os.path.abspath(path)}'
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        seed(database_url, args.rows)
+        print(f"Seeded {args.rows} customers in {time.perf_counter() - started:.1f}s ({path})")
+
+    env = dict(os.environ, DATABASE_URL=database_url)
+    print(f"{'format':>6}  {'rows':>9}  {'rows/sec':>9}  {'MB out':>7}  {'RSS before':>10}  {'peak RSS':>9}")
+    for export_format in ('ndjson', 'csv'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'v2.benchmarks.bench_customer_export', '--export-only', export_format],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = next(line for line in output.splitlines() if line.startswith('RESULT '))
+        rows, elapsed, written, baseline_kb, peak_kb = result.split()[1:]
+        print(f"{export_format:>6}  {int(rows):>9}  {int(rows) / float(elapsed):>9.0f}  "
+              f"{int(written) / 1e6:>7.1f}  {int(baseline_kb) / 1024:>8.1f}MB  {int(peak_kb) / 1024:>7.1f}MB")
+
+    if not args.keep and not args.database:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
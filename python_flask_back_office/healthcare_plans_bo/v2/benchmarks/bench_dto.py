@@ -0,0 +1,212 @@
+"""
+DTO Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_dto.py
+
+Compares the slotted/frozen DTOs with generated to_dict/from_row against
+copies of the previous plain-dataclass DTOs:
+
+- memory: bytes retained per CustomerResponseDTO (tracemalloc)
+- build: DTOs/sec from Customer instances (from_model) and from row tuples
+- to_dict: dicts/sec
+- listing: one page read from SQLite as ORM entities + from_model (before)
+  versus selected columns + from_row (now)
+- validation: SignupRequestDTO.validate per request versus validate_many
+  (same '@' / length checks)
+
+Usage:
+    python -m v2.benchmarks.bench_dto --count 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+from v2.customer_profile.dto import CustomerResponseDTO, SignupRequestDTO
+
+
+@dataclass
+class PreviousCustomerResponseDTO:
+    """CustomerResponseDTO as it was: plain dataclass, hand-written copies"""
+    id: int
+    email: str
+    mobile_number: str
+    first_name: str
+    last_name: str
+    full_name: str
+    date_of_birth: Optional[date]
+    address: Optional[str]
+    city: Optional[str]
+    state: Optional[str]
+    pincode: Optional[str]
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, customer) -> 'PreviousCustomerResponseDTO':
+        return cls(
+            id=customer.id,
+            email=customer.email,
+            mobile_number=customer.mobile_number,
+            first_name=customer.first_name,
+            last_name=customer.last_name,
+            full_name=customer.full_name,
+            date_of_birth=customer.date_of_birth,
+            address=customer.address,
+            city=customer.city,
+            state=customer.state,
+            pincode=customer.pincode,
+            is_active=customer.is_active,
+            is_verified=customer.is_verified,
+            created_at=customer.created_at
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'email': self.email,
+            'mobile_number': self.mobile_number,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'full_name': self.full_name,
+            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
+            'address': self.address,
+            'city': self.city,
+            'state': self.state,
+            'pincode': self.pincode,
+            'is_active': self.is_active,
+            'is_verified': self.is_verified,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+def previous_validate(request) -> tuple:
+    """SignupRequestDTO.validate as it was"""
+    if not request.email or '@' not in request.email:
+        return False, 'Valid email is required'
+    if not request.mobile_number or len(request.mobile_number) < 10:
+        return False, 'Valid mobile number is required (minimum 10 digits)'
+    if not request.password or len(request.password) < 8:
+        return False, 'Password must be at least 8 characters'
+    if not request.first_name:
+        return False, 'First name is required'
+    if not request.last_name:
+        return False, 'Last name is required'
+    return True, None
+
+
+def make_customer(i: int):
+    from v2.customer_profile.model import Customer
+    return Customer(
+        id=i, email=f'customer{i}@example.com', mobile_number=f'{9000000000 + i}',
+        password_hash='x', first_name='Benchmark', last_name=f'Customer{i}',
+        date_of_birth=date(1990, 1, 31), address=f'{i} Benchmark Street', city='Bengaluru',
+        state='KA', pincode='560001', is_active=True, is_verified=False,
+        created_at=datetime(2024, 1, 1) + timedelta(seconds=i)
+    )
+
+
+def rate(fn, items) -> float:
+    """Calls/sec of fn over items"""
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def retained_bytes(build, sources) -> float:
+    """Average bytes still allocated per object after building them all"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build(source) for source in sources]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return retained / len(sources)
+
+
+def report(label: str, before: float, now: float, unit: str) -> None:
+    print(f'{label:<34}  {before:>12,.0f}  {now:>12,.0f}  {unit:<9}  {now / before:>5.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000, help='objects per measurement')
+    parser.add_argument('--page', type=int, default=500, help='rows per listing page')
+    args = parser.parse_args()
+
+    customers = [make_customer(i) for i in range(1, args.count + 1)]
+    rows = [tuple(getattr(c, column) for column in CustomerResponseDTO.COLUMNS) for c in customers]
+
+    def previous_from_row(row):
+        values = dict(zip(CustomerResponseDTO.COLUMNS, row))
+        return PreviousCustomerResponseDTO(full_name=f"{values['first_name']} {values['last_name']}", **values)
+
+    print(f"{'':<34}  {'before':>12}  {'now':>12}")
+    report('memory per profile DTO', retained_bytes(previous_from_row, rows),
+           retained_bytes(CustomerResponseDTO.from_row, rows), 'bytes')
+    report('from_model (Customer instance)', rate(PreviousCustomerResponseDTO.from_model, customers),
+           rate(CustomerResponseDTO.from_model, customers), 'DTOs/s')
+    report('from row tuple', rate(previous_from_row, rows), rate(CustomerResponseDTO.from_row, rows), 'DTOs/s')
+
+    previous = [PreviousCustomerResponseDTO.from_model(c) for c in customers]
+    now = [CustomerResponseDTO.from_model(c) for c in customers]
+    report('to_dict', rate(PreviousCustomerResponseDTO.to_dict, previous),
+           rate(CustomerResponseDTO.to_dict, now), 'dicts/s')
+
+    signups = [SignupRequestDTO.from_dict({
+        'email': f'customer{i}@example.com', 'mobile_number': f'{9000000000 + i}',
+        'password': 'benchmark-password', 'first_name': 'Benchmark', 'last_name': f'Customer{i}'
+    }) for i in range(args.count)]
+    started = time.perf_counter()
+    for signup in signups:
+        previous_validate(signup)
+    previous_rate = len(signups) / (time.perf_counter() - started)
+    started = time.perf_counter()
+    SignupRequestDTO.validate_many(signups)
+    report('signup validation (batch)', previous_rate,
+           len(signups) / (time.perf_counter() - started), 'reqs/s')
+
+    listing_rates = measure_listing(args.page, min(args.count, 20000))
+    report(f'listing page of {args.page} (SQLite)', *listing_rates, 'pages/s')
+
+
+def measure_listing(page: int, rows: int, repeat: int = 50):
+    """Pages/sec: ORM entities + from_model (before) vs columns + from_row (now)"""
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session, undefer
+    from v2.customer_profile.model import Customer
+
+    engine = create_engine('sqlite://')
+    Customer.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Customer.__table__), [
+            {column: getattr(make_customer(i), column) for column in CustomerResponseDTO.COLUMNS + ('password_hash',)}
+            for i in range(1, rows + 1)
+        ])
+
+    order = (Customer.created_at, Customer.id)
+    columns = [getattr(Customer, column) for column in CustomerResponseDTO.COLUMNS]
+    results = []
+    for build in (
+        lambda session: [PreviousCustomerResponseDTO.from_model(c) for c in session.scalars(
+            select(Customer).options(undefer(Customer.address)).order_by(*order).limit(page))],
+        lambda session: [CustomerResponseDTO.from_row(row) for row in session.execute(
+            select(*columns).order_by(*order).limit(page))]
+    ):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            with Session(engine) as session:
+                build(session)
+        results.append(repeat / (time.perf_counter() - started))
+    engine.dispose()
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+JSON Serialization Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_json_provider.py
+
+Measures response-body serialization throughput for the profile and login
+DTOs: Flask's default provider with to_dict() (the old behaviour) against
+FastJSONProvider on the stdlib fallback and on orjson, both through
+to_dict() and, for CustomerResponseDTO, passing the DTO itself. Each case
+builds a full response (`provider.response(...)`) as jsonify does.
+
+Usage:
+    python -m v2.benchmarks.bench_json_provider --iterations 200000
+    python -m v2.benchmarks.bench_json_provider --items 100
+"""
+
+import argparse
+import time
+from datetime import date, datetime
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from v2.common import json_provider
+from v2.common.json_provider import FastJSONProvider
+from v2.customer_profile.dto import CustomerResponseDTO, LoginResponseDTO
+
+
+def make_profile(customer_id: int) -> CustomerResponseDTO:
+    return CustomerResponseDTO(
+        id=customer_id,
+        email=f'customer{customer_id}@example.com',
+        mobile_number=f'{9000000000 + customer_id}',
+        first_name='Benchmark',
+        last_name=f'Customer{customer_id}',
+        full_name=f'Benchmark Customer{customer_id}',
+        date_of_birth=date(1990, 1, 31),
+        address=f'{customer_id} Benchmark Street',
+        city='Bengaluru',
+        state='KA',
+        pincode='560001',
+        is_active=True,
+        is_verified=False,
+        created_at=datetime(2024, 1, 1, 12, 30, 45, 123456)
+    )
+
+
+def make_login() -> LoginResponseDTO:
+    return LoginResponseDTO(
+        success=True,
+        message='Login successful',
+        access_token='x' * 300,
+        refresh_token='y' * 300,
+        customer_id=1,
+        email='customer1@example.com',
+        full_name='Benchmark Customer1'
+    )
+
+
+def measure(provider, build, iterations: int) -> float:
+    """Responses per second for `provider.response(build())`"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        provider.response(build())
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000, help='responses per measurement')
+    parser.add_argument('--items', type=int, default=1, help='profiles per profile response (1 = GET /me)')
+    args = parser.parse_args()
+
+    if json_provider.orjson is None:
+        print('orjson is not installed: only the stdlib fallback is measured')
+
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    profiles = [make_profile(i) for i in range(1, args.items + 1)]
+    login = make_login()
+
+    def profile_dicts():
+        return {'success': True, 'data': [profile.to_dict() for profile in profiles]}
+
+    def profile_dtos():
+        return {'success': True, 'data': profiles}
+
+    cases = [
+        ('CustomerResponseDTO', [
+            ('default + to_dict', default, profile_dicts),
+            ('fast + to_dict', fast, profile_dicts),
+            ('fast + DTO', fast, profile_dtos)
+        ]),
+        ('LoginResponseDTO', [
+            ('default + to_dict', default, login.to_dict),
+            ('fast + to_dict', fast, login.to_dict)
+        ])
+    ]
+
+    with app.app_context():
+        for backend in ('orjson', 'stdlib') if json_provider.orjson else ('stdlib',):
+            saved, json_provider.orjson = json_provider.orjson, (json_provider.orjson if backend == 'orjson' else None)
+            try:
+                print(f'\nFastJSONProvider backend: {backend}')
+                print(f"{'dto':<20}  {'path':<18}  {'responses/sec':>13}  {'speedup':>7}")
+                for dto_name, variants in cases:
+                    baseline = None
+                    for label, provider, build in variants:
+                        throughput = measure(provider, build, args.iterations)
+                        baseline = baseline or throughput
+                        print(f'{dto_name:<20}  {label:<18}  {throughput:>13.0f}  {throughput / baseline:>6.2f}x')
+            finally:
+                json_provider.orjson = saved
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+JWT Decode Cache Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_jwt_cache.py
+
+Measures what @jwt_required() costs /me with and without the
+CachingJWTManager decode cache, for a client reusing one access token:
+
+- auth only: verify_jwt_in_request() inside a request context (the work
+  @jwt_required() does before the view runs)
+- GET /me: full requests through the test client against the testing
+  config (in-memory SQLite), with If-None-Match so the view itself is
+  one small query and a 304
+
+Usage:
+    python -m v2.benchmarks.bench_jwt_cache --iterations 20000
+"""
+
+import argparse
+import time
+from flask_jwt_extended import verify_jwt_in_request
+from v2.common.jwt_cache import CACHE_EXTENSION
+
+
+def rate(fn, iterations: int) -> float:
+    """Calls/sec of fn()"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def report(label: str, before: float, now: float, unit: str) -> None:
+    print(f'{label:<24}  {before:>12,.0f}  {now:>12,.0f}  {unit:<7}  {now / before:>5.2f}x  '
+          f'{1e6 / before:>7.1f}  {1e6 / now:>7.1f}  us/call')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000, help='calls per measurement')
+    args = parser.parse_args()
+
+    from v2.main_v2 import create_app
+    app = create_app('testing')
+    client = app.test_client()
+    client.post('/api/v2/customers/signup', json={
+        'email': 'benchmark@example.com', 'mobile_number': '9000000001', 'password': 'benchmark-password',
+        'first_name': 'Benchmark', 'last_name': 'Customer'
+    })
+    access_token = client.post('/api/v2/customers/login', json={
+        'email': 'benchmark@example.com', 'password': 'benchmark-password'
+    }).json['data']['access_token']
+    headers = {'Authorization': f'Bearer {access_token}'}
+    headers['If-None-Match'] = client.get('/api/v2/customers/me', headers=headers).headers['ETag']
+
+    cache = app.extensions[CACHE_EXTENSION]
+
+    def with_cache(enabled: bool, fn):
+        app.extensions[CACHE_EXTENSION] = cache if enabled else None
+        fn()  # warm up (fills the cache when enabled)
+        return rate(fn, args.iterations)
+
+    with app.test_request_context('/api/v2/customers/me', headers=headers):
+        auth = [with_cache(enabled, verify_jwt_in_request) for enabled in (False, True)]
+
+    def get_me():
+        assert client.get('/api/v2/customers/me', headers=headers).status_code == 304
+
+    requests = [with_cache(enabled, get_me) for enabled in (False, True)]
+
+    print(f"{'':<24}  {'no cache':>12}  {'cache':>12}")
+    report('auth only', *auth, 'calls/s')
+    report('GET /me (304)', *requests, 'reqs/s')
+    print(f"cache: {cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
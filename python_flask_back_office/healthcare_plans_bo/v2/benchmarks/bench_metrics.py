@@ -0,0 +1,99 @@
+"""
+Request Metrics Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_metrics.py
+
+Per-request cost of the Prometheus instrumentation (v2/common/metrics.py):
+
+- wrapper: the WSGI wrapper RequestMetrics puts around the app, around
+  a no-op app (what every request pays)
+- timed_stage: one stage timer
+- GET /api/v2/health through the test client with METRICS_ENABLED off
+  and on (the difference is the end-to-end overhead)
+
+Run it once plainly and once with --multiprocess-dir, where every
+observation goes to a memory-mapped file as under gunicorn.
+
+Usage:
+    python -m v2.benchmarks.bench_metrics --iterations 20000
+    python -m v2.benchmarks.bench_metrics --multiprocess-dir /dev/shm/bench-metrics
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+ROUNDS = 5
+
+
+def per_call_us(fn, iterations: int) -> float:
+    """Microseconds per fn() call"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return 1e6 * (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000, help='calls per measurement')
+    parser.add_argument('--multiprocess-dir', default=None, help='PROMETHEUS_MULTIPROC_DIR to use (emptied)')
+    args = parser.parse_args()
+
+    if args.multiprocess_dir:
+        # Must be set before prometheus_client is imported
+        shutil.rmtree(args.multiprocess_dir, ignore_errors=True)
+        os.makedirs(args.multiprocess_dir)
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = args.multiprocess_dir
+
+    from v2.main_v2 import create_app
+    from v2.common.metrics import timed_stage, _InstrumentedApp
+
+    app = create_app('testing')
+    client = app.test_client()
+    environ = {'REQUEST_METHOD': 'GET'}
+
+    def noop_app(environ, start_response):
+        start_response('200 OK', [])
+        return []
+
+    wrapped = _InstrumentedApp(noop_app)
+
+    def wrapper():
+        wrapped(environ, lambda status, headers, exc_info=None: None)
+
+    def stage():
+        with timed_stage('benchmark', 'stage'):
+            pass
+
+    def get_health():
+        assert client.get('/api/v2/health').status_code == 200
+
+    wrapper_us = per_call_us(wrapper, args.iterations)
+    stage_us = per_call_us(stage, args.iterations)
+
+    # Alternate rounds with and without the wrapper (best round of each),
+    # so drift on a shared machine does not land on one side
+    get_health()
+    instrumented_app, plain_app = app.wsgi_app, app.wsgi_app.wsgi_app
+    rounds = {instrumented_app: [], plain_app: []}
+    for _ in range(ROUNDS):
+        for wsgi_app, results in rounds.items():
+            app.wsgi_app = wsgi_app
+            results.append(per_call_us(get_health, args.iterations // ROUNDS))
+    app.wsgi_app = instrumented_app
+    instrumented, plain = min(rounds[instrumented_app]), min(rounds[plain_app])
+
+    mode = 'multiprocess' if args.multiprocess_dir else 'single process'
+    print(f'mode: {mode}')
+    print(f"{'WSGI wrapper':<28}  {wrapper_us:>7.2f}  us/request")
+    print(f"{'timed_stage':<28}  {stage_us:>7.2f}  us/stage")
+    print(f"{'GET /health, no metrics':<28}  {plain:>7.1f}  us/request")
+    print(f"{'GET /health, metrics':<28}  {instrumented:>7.1f}  us/request  (+{instrumented - plain:.1f})")
+
+    if args.multiprocess_dir:
+        shutil.rmtree(args.multiprocess_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
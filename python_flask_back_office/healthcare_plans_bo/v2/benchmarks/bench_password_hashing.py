@@ -0,0 +1,64 @@
+"""
+Password Hashing Throughput Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_password_hashing.py
+
+Simulates a login burst: a fixed set of request threads each verify a
+password, first inline (the old behaviour, serialised by the GIL) and then
+through PasswordHashExecutor with 1..N pool processes. Throughput should
+grow with the pool size up to the number of cores.
+
+Usage:
+    python -m v2.benchmarks.bench_password_hashing --threads 4 --logins 64
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+from v2.common.password_hashing import PasswordHashExecutor
+
+
+def run_burst(executor: PasswordHashExecutor, password_hash: str, threads: int, logins: int) -> float:
+    """Verify `logins` passwords from `threads` request threads, return logins/sec"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        results = list(request_threads.map(
+            lambda _: executor.verify(password_hash, 'benchmark-password'),
+            range(logins)
+        ))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=max(4, os.cpu_count() or 1),
+                        help='concurrent request threads')
+    parser.add_argument('--logins', type=int, default=64, help='logins per measurement')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='largest pool size to measure')
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash('benchmark-password')
+    executor = PasswordHashExecutor()
+
+    print(f"{'pool workers':>12}  {'logins/sec':>10}  {'speedup':>7}")
+
+    executor.configure(workers=0)
+    baseline = run_burst(executor, password_hash, args.threads, args.logins)
+    print(f"{'inline':>12}  {baseline:>10.1f}  {1.0:>6.2f}x")
+
+    pool_sizes = sorted({2 ** i for i in range(args.max_workers.bit_length()) if 2 ** i <= args.max_workers}
+                        | {args.max_workers})
+    for workers in pool_sizes:
+        executor.configure(workers=workers, max_pending=args.logins)
+        run_burst(executor, password_hash, args.threads, workers)  # warm up pool processes
+        throughput = run_burst(executor, password_hash, args.threads, args.logins)
+        print(f"{workers:>12}  {throughput:>10.1f}  {throughput / baseline:>6.2f}x")
+
+    executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    main()
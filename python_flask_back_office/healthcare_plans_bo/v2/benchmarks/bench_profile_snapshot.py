@@ -0,0 +1,93 @@
+"""
+Profile Snapshot Benchmark
+Location: python_flask_back_office/healthcare_plans_bo/v2/benchmarks/bench_profile_snapshot.py
+
+Compares GET /me served from the database with GET /me?view=summary
+served from the profile snapshot in the access token
+(PROFILE_SNAPSHOT_CLAIMS_ENABLED), through the test client against the
+testing config (in-memory SQLite):
+
+- /me: full profile (version lookup for the ETag + profile SELECT)
+- /me?view=summary, token without snapshot: summary column SELECT
+- /me?view=summary, token with snapshot: no query while the remembered
+  profile_version is fresh (PROFILE_SNAPSHOT_VERSION_TTL_SECONDS)
+
+SQLite in memory is the cheapest database there is; against MySQL the
+DB-backed rows lose a network round trip per query on top.
+
+Usage:
+    python -m v2.benchmarks.bench_profile_snapshot --iterations 5000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from sqlalchemy import event
+
+
+def rate(fn, iterations: int) -> float:
+    """Calls/sec of fn()"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5000, help='requests per measurement')
+    args = parser.parse_args()
+
+    from v2.main_v2 import create_app
+    from v2.extensions_v2 import db
+    from v2.customer_profile.dao import CustomerDAOFactory
+    from v2.customer_profile.service import CustomerServiceFactory
+
+    app = create_app('testing')
+    app.config['PROFILE_SNAPSHOT_CLAIMS_ENABLED'] = True
+    CustomerDAOFactory.reset_instance()
+    CustomerServiceFactory.reset_instance()
+
+    client = app.test_client()
+    client.post('/api/v2/customers/signup', json={
+        'email': 'benchmark@example.com', 'mobile_number': '9000000001', 'password': 'benchmark-password',
+        'first_name': 'Benchmark', 'last_name': 'Customer'
+    })
+    with_snapshot = client.post('/api/v2/customers/login', json={
+        'email': 'benchmark@example.com', 'password': 'benchmark-password'
+    }).json['data']['access_token']
+    with app.app_context():
+        from flask_jwt_extended import create_access_token
+        without_snapshot = create_access_token(identity='1')
+
+    queries = [0]
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *_: queries.__setitem__(0, queries[0] + 1))
+
+    cases = [
+        ('GET /me (database)', '/api/v2/customers/me', without_snapshot),
+        ('summary (database)', '/api/v2/customers/me?view=summary', without_snapshot),
+        ('summary (token claims)', '/api/v2/customers/me?view=summary', with_snapshot),
+    ]
+
+    print(f"{'':<24}  {'reqs/s':>10}  {'us/req':>8}  {'queries/req':>11}")
+    baseline = None
+    for label, url, token in cases:
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def get():
+            assert client.get(url, headers=headers).status_code == 200
+
+        # /me prints debug lines on every request
+        with contextlib.redirect_stdout(io.StringIO()):
+            get()  # warm up (JWT decode cache, remembered profile_version)
+            queries[0] = 0
+            reqs = rate(get, args.iterations)
+        baseline = baseline or reqs
+        print(f'{label:<24}  {reqs:>10,.0f}  {1e6 / reqs:>8.1f}  {queries[0] / args.iterations:>11.2f}  '
+              f'{reqs / baseline:>5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+V2 Common Module
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/__init__.py
+
+Cross-cutting infrastructure shared by the V2 domain modules.
+"""
+
+from .admin_auth import admin_key_required
+from .bulkhead import Bulkhead, Bulkheads, BulkheadRejectedError
+from .conditional import (
+    PreconditionFailedError,
+    make_etag,
+    if_match_timestamp,
+    is_not_modified,
+    set_validators,
+    not_modified
+)
+from .dto_codegen import dto_class
+from .json_provider import FastJSONProvider
+from .jwt_cache import CachingJWTManager
+from .jwt_keys import SigningKeys, SigningKeyError, KeySet, generate_signing_key
+from .metrics import RequestMetrics, timed_stage
+from .password_hashers import (
+    PasswordHasher,
+    HASHERS,
+    create_hasher,
+    identify_hasher,
+    calibrate
+)
+from .password_hashing import (
+    PasswordHashExecutor,
+    PasswordHashingError,
+    PasswordHashingBusyError,
+    PasswordHashingTimeoutError
+)
+from .query_stats import QueryStats, QueryLog, assert_max_queries, normalize_sql
+from .rate_limit import LoginThrottle, LocalBucketStore, SQLiteBucketStore
+from .single_flight import SingleFlight, SingleFlightTimeoutError
+from .sparse_fields import FieldSet, InvalidFieldsError
+from .streaming_export import EXPORT_FORMATS, iter_ndjson, iter_csv
+from .token_verifier import TokenVerifier
+from .ttl_cache import TTLCache, MISSING
+from .write_behind import WriteBehindBuffer
+
+__all__ = [
+    'admin_key_required',
+    'Bulkhead',
+    'Bulkheads',
+    'BulkheadRejectedError',
+    'PreconditionFailedError',
+    'make_etag',
+    'if_match_timestamp',
+    'is_not_modified',
+    'set_validators',
+    'not_modified',
+    'dto_class',
+    'FastJSONProvider',
+    'CachingJWTManager',
+    'SigningKeys',
+    'SigningKeyError',
+    'KeySet',
+    'generate_signing_key',
+    'RequestMetrics',
+    'timed_stage',
+    'PasswordHasher',
+    'HASHERS',
+    'create_hasher',
+    'identify_hasher',
+    'calibrate',
+    'PasswordHashExecutor',
+    'PasswordHashingError',
+    'PasswordHashingBusyError',
+    'PasswordHashingTimeoutError',
+    'QueryStats',
+    'QueryLog',
+    'assert_max_queries',
+    'normalize_sql',
+    'LoginThrottle',
+    'LocalBucketStore',
+    'SQLiteBucketStore',
+    'SingleFlight',
+    'SingleFlightTimeoutError',
+    'FieldSet',
+    'InvalidFieldsError',
+    'EXPORT_FORMATS',
+    'iter_ndjson',
+    'iter_csv',
+    'TokenVerifier',
+    'TTLCache',
+    'MISSING',
+    'WriteBehindBuffer'
+]
@@ -0,0 +1,37 @@
+"""
+Admin API Key Authentication
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/admin_auth.py
+"""
+
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, request
+
+
+def admin_key_required(view):
+    """
+    Protect a back-office view with the X-Admin-Key header (ADMIN_API_KEY).
+    
+    Fails closed: without a configured key the view is not reachable at
+    all (503), there is no built-in fallback key.
+    """
+    
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected_key = current_app.config.get('ADMIN_API_KEY')
+        if not expected_key:
+            return jsonify({
+                'success': False,
+                'error': 'Service Unavailable',
+                'message': 'Back-office API is disabled: ADMIN_API_KEY is not configured'
+            }), 503
+        admin_key = request.headers.get('X-Admin-Key', '')
+        if not hmac.compare_digest(admin_key.encode(), expected_key.encode()):
+            return jsonify({
+                'success': False,
+                'error': 'Unauthorized',
+                'message': 'Valid X-Admin-Key header is required'
+            }), 401
+        return view(*args, **kwargs)
+    
+    return wrapper
@@ -0,0 +1,191 @@
+"""
+Bulkheads
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/bulkhead.py
+
+Concurrency limits per class of endpoints, so a burst of expensive
+requests (signup/login run the password KDF) cannot take every thread of
+a worker while cheap ones (/me, /health) wait behind them.
+
+A bulkhead admits max_concurrent requests at a time. Up to max_queue more
+wait for a slot, each for at most queue_timeout_seconds; a request that
+finds the queue full, or whose wait runs out, gets an immediate 503 with
+Retry-After instead of holding its connection until the gunicorn timeout.
+Endpoints that belong to no bulkhead are never limited.
+
+Limits are per worker process, like the threads they protect.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from flask import g, jsonify, request
+
+
+class BulkheadRejectedError(RuntimeError):
+    """Raised by Bulkhead.acquire() when a request is not admitted"""
+
+
+class BulkheadFullError(BulkheadRejectedError):
+    """The wait queue is full"""
+
+
+class BulkheadTimeoutError(BulkheadRejectedError):
+    """No slot freed up within the queue timeout"""
+
+
+class Bulkhead:
+    """Counting semaphore with a bounded wait queue, a queue deadline and counters"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int = 0, queue_timeout_seconds: float = 1.0):
+        self.name = name
+        self.max_concurrent = max(int(max_concurrent), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.queue_timeout = float(queue_timeout_seconds)
+        self._condition = threading.Condition()
+        self._active = 0
+        self._queued = 0
+        self._admitted = 0
+        self._queued_total = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._wait_seconds = 0.0
+
+    def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed; raises BulkheadRejectedError"""
+        with self._condition:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                self._admitted += 1
+                return
+            if self._queued >= self.max_queue:
+                self._rejected_full += 1
+                raise BulkheadFullError(f'Bulkhead {self.name!r} is full')
+
+            self._queued += 1
+            self._queued_total += 1
+            started = time.monotonic()
+            deadline = started + self.queue_timeout
+            try:
+                while self._active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_timeout += 1
+                        raise BulkheadTimeoutError(
+                            f'Bulkhead {self.name!r}: no slot within {self.queue_timeout}s'
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                self._queued -= 1
+                self._wait_seconds += time.monotonic() - started
+            self._active += 1
+            self._admitted += 1
+
+    def release(self) -> None:
+        """Give the slot back and wake one waiting request"""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        """Limits, current occupancy and counters"""
+        with self._condition:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout_seconds': self.queue_timeout,
+                'active': self._active,
+                'queued': self._queued,
+                'admitted': self._admitted,
+                'queued_total': self._queued_total,
+                'rejected_queue_full': self._rejected_full,
+                'rejected_timeout': self._rejected_timeout,
+                'avg_queue_wait_ms': round(1000 * self._wait_seconds / self._queued_total, 2)
+                if self._queued_total else 0.0
+            }
+
+
+class Bulkheads:
+    """
+    Flask extension assigning requests to bulkheads by endpoint or
+    blueprint, from the BULKHEADS config:
+
+        BULKHEADS = {
+            'credentials': {
+                'max_concurrent': 2, 'max_queue': 8, 'queue_timeout_seconds': 1.0,
+                'blueprints': ['customer_v2.signup_v2'],
+                'endpoints': ['customer_v2.login_v2.login']
+            }
+        }
+
+    An endpoint listed by name wins over its blueprints, and a nested
+    blueprint over its parent. The slot is taken before the view runs and
+    given back at request teardown, or, for a streamed response, once the
+    server has finished sending it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._bulkheads: Dict[str, Bulkhead] = {}
+        self._by_endpoint: Dict[str, Bulkhead] = {}
+        self._by_blueprint: Dict[str, Bulkhead] = {}
+        self._resolved: Dict[Optional[str], Optional[Bulkhead]] = {}
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config and guard every request"""
+        self.enabled = app.config.get('BULKHEADS_ENABLED', True)
+        self._bulkheads, self._by_endpoint, self._by_blueprint, self._resolved = {}, {}, {}, {}
+        for name, settings in app.config.get('BULKHEADS', {}).items():
+            settings = dict(settings)
+            endpoints: Iterable[str] = settings.pop('endpoints', ())
+            blueprints: Iterable[str] = settings.pop('blueprints', ())
+            bulkhead = self._bulkheads[name] = Bulkhead(name, **settings)
+            self._by_endpoint.update((endpoint, bulkhead) for endpoint in endpoints)
+            self._by_blueprint.update((blueprint, bulkhead) for blueprint in blueprints)
+        if self.enabled and self._bulkheads:
+            app.before_request(self._enter)
+            app.after_request(self._hold_while_streaming)
+            app.teardown_request(self._leave)
+
+    def stats(self) -> dict:
+        """Counters of every bulkhead in this worker"""
+        return {name: bulkhead.stats() for name, bulkhead in self._bulkheads.items()}
+
+    def _bulkhead_for_request(self) -> Optional[Bulkhead]:
+        endpoint = request.endpoint
+        if endpoint not in self._resolved:
+            bulkhead = self._by_endpoint.get(endpoint)
+            if bulkhead is None:
+                # request.blueprints: innermost first
+                bulkhead = next(
+                    (self._by_blueprint[name] for name in request.blueprints if name in self._by_blueprint), None
+                )
+            self._resolved[endpoint] = bulkhead
+        return self._resolved[endpoint]
+
+    def _enter(self):
+        bulkhead = self._bulkhead_for_request()
+        if bulkhead is None:
+            return None
+        try:
+            bulkhead.acquire()
+        except BulkheadRejectedError:
+            response = jsonify({
+                'success': False,
+                'message': 'Server is busy, please retry shortly'
+            })
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        g._bulkhead = bulkhead
+        return None
+
+    def _hold_while_streaming(self, response):
+        if response.is_streamed:
+            bulkhead = g.pop('_bulkhead', None)
+            if bulkhead is not None:
+                response.call_on_close(bulkhead.release)
+        return response
+
+    def _leave(self, error=None) -> None:
+        bulkhead = g.pop('_bulkhead', None)
+        if bulkhead is not None:
+            bulkhead.release()
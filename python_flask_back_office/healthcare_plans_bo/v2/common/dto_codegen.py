@@ -0,0 +1,101 @@
+"""
+DTO Code Generation
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/dto_codegen.py
+
+`dto_class` turns a class into a slotted, frozen dataclass and compiles its
+hot paths once, when the class is defined (the way dataclasses builds
+__init__): a to_dict that reads every field directly, and a from_row that
+builds an instance from a sequence of column values.
+"""
+
+import dataclasses
+import typing
+from datetime import date, datetime, time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+_TEMPORAL_TYPES = (date, datetime, time)
+
+
+def _is_temporal(annotation) -> bool:
+    """date/datetime/time, possibly wrapped in Optional[...]"""
+    candidates = typing.get_args(annotation) or (annotation,)
+    return any(isinstance(candidate, type) and issubclass(candidate, _TEMPORAL_TYPES)
+               for candidate in candidates)
+
+
+def _compile(name: str, source: str, namespace: dict) -> Callable:
+    exec(compile(source, f'<generated {name}>', 'exec'), namespace)
+    return namespace[name]
+
+
+def compile_to_dict(cls) -> Callable[[object], dict]:
+    """
+    to_dict(self) for a dataclass: one dict display over all fields, with
+    date/datetime/time fields as ISO 8601 strings (None stays None).
+    """
+    hints = typing.get_type_hints(cls)
+    entries = []
+    for field in dataclasses.fields(cls):
+        value = f'self.{field.name}'
+        if _is_temporal(hints.get(field.name)):
+            value = f'None if {value} is None else {value}.isoformat()'
+        entries.append(f'        {field.name!r}: {value},')
+    source = '\n'.join([
+        'def to_dict(self):',
+        '    """Convert to dictionary for JSON response"""',
+        '    return {',
+        *entries,
+        '    }'
+    ])
+    return _compile('to_dict', source, {})
+
+
+def compile_from_row(cls, columns: Sequence[str],
+                     derived: Optional[Dict[str, Tuple[Tuple[str, ...], Callable]]] = None) -> Callable:
+    """
+    from_row(row) for a slotted dataclass: unpacks a sequence of `columns`
+    values and stores each field straight into its slot, skipping __init__
+    (a frozen __init__ pays an object.__setattr__ call per field).
+
+    derived maps fields that are not columns to (source columns,
+    fn(*values)). Every field must be one or the other.
+    """
+    derived = derived or {}
+    local = {column: f'_c{index}' for index, column in enumerate(columns)}
+    namespace = {'_new': object.__new__, '_cls': cls}
+    body = [f"    {', '.join(local.values())}{',' if len(columns) == 1 else ''} = row",
+            '    self = _new(_cls)']
+    for field in dataclasses.fields(cls):
+        if field.name in derived:
+            sources, fn = derived[field.name]
+            namespace[f'_derive_{field.name}'] = fn
+            value = f"_derive_{field.name}({', '.join(local[source] for source in sources)})"
+        elif field.name in local:
+            value = local[field.name]
+        else:
+            raise TypeError(f'{cls.__name__}.{field.name} is neither a column nor derived')
+        namespace[f'_set_{field.name}'] = cls.__dict__[field.name].__set__
+        body.append(f'    _set_{field.name}(self, {value})')
+    source = '\n'.join(['def from_row(row):', *body, '    return self'])
+    return _compile('from_row', source, namespace)
+
+
+def dto_class(cls=None, *, to_dict: bool = False, columns: Optional[Sequence[str]] = None,
+              derived: Optional[Dict[str, Tuple[Tuple[str, ...], Callable]]] = None):
+    """
+    Class decorator: @dataclass(slots=True, frozen=True), plus
+
+    - with to_dict: a to_dict method generated by compile_to_dict (left out
+      by default, so request DTOs holding secrets cannot be dumped by it)
+    - with columns: COLUMNS and a from_row staticmethod (compile_from_row)
+    """
+    def wrap(cls):
+        cls = dataclasses.dataclass(slots=True, frozen=True)(cls)
+        if to_dict:
+            cls.to_dict = compile_to_dict(cls)
+        if columns is not None:
+            cls.COLUMNS = tuple(columns)
+            cls.from_row = staticmethod(compile_from_row(cls, cls.COLUMNS, derived))
+        return cls
+
+    return wrap if cls is None else wrap(cls)
@@ -0,0 +1,195 @@
+"""
+JWT Signing Keys
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/jwt_keys.py
+
+Asymmetric token signing (RS256 / EdDSA) with a key set. Every
+`<kid>.pem` file (PKCS#8 private key) in JWT_SIGNING_KEYS_DIR is a key:
+
+- tokens are signed with the active key (JWT_SIGNING_KID, default the
+  last kid in sort order) and carry its kid in the header
+- tokens are verified with the key their kid names, so tokens signed with
+  an older key stay valid while its file is kept
+- every key's public half is published as a JWK Set, which other services
+  use to verify tokens themselves (see token_verifier)
+
+Rotation: add a new key (`flask generate-jwt-key`) while JWT_SIGNING_KID
+still names the current one, wait for JWKS caches to expire
+(JWKS_MAX_AGE_SECONDS), switch JWT_SIGNING_KID, and delete the old file
+once the tokens it signed have expired (JWT_REFRESH_TOKEN_EXPIRES).
+
+Without JWT_SIGNING_KEYS_DIR, tokens stay HS256 with JWT_SECRET_KEY.
+"""
+
+import os
+import secrets
+from datetime import datetime
+from typing import Dict, List, Optional
+from flask import current_app
+from flask_jwt_extended.config import config as jwt_config
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from jwt.exceptions import InvalidTokenError
+from .jwt_cache import CACHE_EXTENSION
+
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+except ImportError:  # only needed with JWT_SIGNING_KEYS_DIR
+    serialization = ed25519 = rsa = None
+
+ALGORITHMS = ('RS256', 'EdDSA')
+MIN_RSA_KEY_SIZE = 2048
+
+# app.extensions key of the app's KeySet (absent in HS256 mode)
+EXTENSION = 'jwt-signing-keys'
+
+
+class SigningKeyError(RuntimeError):
+    """Raised when the configured signing keys cannot be used"""
+
+
+class SigningKey:
+    """One private key with its kid and JWS algorithm"""
+    __slots__ = ('kid', 'algorithm', 'private_key', 'public_key')
+
+    def __init__(self, kid: str, private_key):
+        if rsa is not None and isinstance(private_key, rsa.RSAPrivateKey):
+            if private_key.key_size < MIN_RSA_KEY_SIZE:
+                raise SigningKeyError(f'JWT key {kid!r}: RSA keys need at least {MIN_RSA_KEY_SIZE} bits')
+            self.algorithm = 'RS256'
+        elif ed25519 is not None and isinstance(private_key, ed25519.Ed25519PrivateKey):
+            self.algorithm = 'EdDSA'
+        else:
+            raise SigningKeyError(f'JWT key {kid!r}: only RSA and Ed25519 keys are supported')
+        self.kid = kid
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+
+    def jwk(self) -> dict:
+        """Public JWK (RFC 7517) with kid, alg and use"""
+        to_jwk = RSAAlgorithm.to_jwk if self.algorithm == 'RS256' else OKPAlgorithm.to_jwk
+        return {**to_jwk(self.public_key, as_dict=True), 'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'}
+
+
+class KeySet:
+    """Signing keys by kid, with the active one"""
+
+    def __init__(self, keys: List[SigningKey], active_kid: Optional[str] = None):
+        if not keys:
+            raise SigningKeyError('No JWT signing keys found')
+        self._keys: Dict[str, SigningKey] = {key.kid: key for key in keys}
+        active_kid = active_kid or max(self._keys)
+        if active_kid not in self._keys:
+            raise SigningKeyError(f'JWT_SIGNING_KID {active_kid!r} has no key file')
+        self.active = self._keys[active_kid]
+
+    @classmethod
+    def load(cls, directory: str, active_kid: Optional[str] = None) -> 'KeySet':
+        """Read every <kid>.pem in directory"""
+        if serialization is None:
+            raise SigningKeyError('JWT_SIGNING_KEYS_DIR needs the cryptography package')
+        keys = []
+        for name in sorted(os.listdir(directory)):
+            kid, extension = os.path.splitext(name)
+            if extension != '.pem':
+                continue
+            with open(os.path.join(directory, name), 'rb') as key_file:
+                keys.append(SigningKey(kid, serialization.load_pem_private_key(key_file.read(), password=None)))
+        return cls(keys, active_kid)
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+
+    @property
+    def algorithms(self) -> List[str]:
+        """Algorithms of all keys (accepted when decoding)"""
+        return sorted({key.algorithm for key in self._keys.values()})
+
+    def jwks(self) -> dict:
+        """JWK Set of the public keys, active key first"""
+        others = [key.jwk() for kid, key in sorted(self._keys.items()) if key is not self.active]
+        return {'keys': [self.active.jwk()] + others}
+
+
+def generate_signing_key(directory: str, algorithm: str = 'EdDSA') -> str:
+    """Write a new private key to directory (mode 0600); returns its kid"""
+    if serialization is None:
+        raise SigningKeyError('Generating JWT signing keys needs the cryptography package')
+    if algorithm == 'RS256':
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=MIN_RSA_KEY_SIZE)
+    elif algorithm == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise SigningKeyError(f'Unsupported algorithm {algorithm!r}; use one of {ALGORITHMS}')
+    kid = f'{datetime.utcnow():%Y%m%d}-{secrets.token_hex(4)}'
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    os.makedirs(directory, exist_ok=True)
+    descriptor = os.open(os.path.join(directory, f'{kid}.pem'), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descriptor, 'wb') as key_file:
+        key_file.write(pem)
+    return kid
+
+
+class SigningKeys:
+    """
+    Flask extension wiring a KeySet into a JWTManager through its
+    encode/decode key and header loaders. Apps without
+    JWT_SIGNING_KEYS_DIR keep the JWTManager defaults (HS256).
+
+    With JWT_ACCEPT_HS256_TOKENS, tokens signed with JWT_SECRET_KEY are
+    still accepted, for the changeover from HS256 (until they expire).
+    """
+
+    def init_app(self, app, jwt_manager) -> None:
+        directory = app.config.get('JWT_SIGNING_KEYS_DIR')
+        if not directory:
+            app.extensions.pop(EXTENSION, None)
+        else:
+            keyset = KeySet.load(directory, app.config.get('JWT_SIGNING_KID'))
+            accept_hs256 = app.config.get('JWT_ACCEPT_HS256_TOKENS', False)
+            app.extensions[EXTENSION] = keyset
+            app.config['JWT_ALGORITHM'] = keyset.active.algorithm
+            app.config['JWT_DECODE_ALGORITHMS'] = keyset.algorithms + (['HS256'] if accept_hs256 else [])
+
+        # Claims decoded under the previous keys or algorithms are verified again
+        decode_cache = app.extensions.get(CACHE_EXTENSION)
+        if decode_cache is not None:
+            decode_cache.clear()
+
+        jwt_manager.encode_key_loader(self._encode_key)
+        jwt_manager.decode_key_loader(self._decode_key)
+        jwt_manager.additional_headers_loader(self._headers)
+
+    @staticmethod
+    def keyset() -> Optional[KeySet]:
+        """The current app's KeySet, or None in HS256 mode"""
+        return current_app.extensions.get(EXTENSION)
+
+    def jwks(self) -> dict:
+        """JWK Set of the current app (no keys in HS256 mode)"""
+        keyset = self.keyset()
+        return keyset.jwks() if keyset is not None else {'keys': []}
+
+    def _encode_key(self, identity):
+        keyset = self.keyset()
+        return keyset.active.private_key if keyset is not None else jwt_config.encode_key
+
+    def _decode_key(self, jwt_header: dict, jwt_payload: dict):
+        keyset = self.keyset()
+        if keyset is None:
+            return jwt_config.decode_key
+        if jwt_header.get('alg', '').startswith('HS'):
+            # HMAC tokens get the secret, never a public key; PyJWT rejects
+            # them anyway unless JWT_ACCEPT_HS256_TOKENS allowed HS256
+            return current_app.config['JWT_SECRET_KEY']
+        key = keyset.get(jwt_header.get('kid'))
+        if key is None:
+            raise InvalidTokenError('Unknown signing key')
+        if jwt_header.get('alg') != key.algorithm:
+            raise InvalidTokenError('Token algorithm does not match its signing key')
+        return key.public_key
+
+    def _headers(self, identity) -> dict:
+        keyset = self.keyset()
+        return {'kid': keyset.active.kid} if keyset is not None else {}
@@ -0,0 +1,182 @@
+"""
+Request Metrics
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/metrics.py
+
+Prometheus instrumentation (prometheus_client; without it everything here
+is a no-op and /metrics answers 404):
+
+- http_request_duration_seconds{method, route}   histogram, fixed buckets
+- http_requests_total{method, route, status}      counter
+- http_requests_in_flight                         gauge
+- stage_duration_seconds{operation, stage}       histogram of the steps
+  inside an operation (validate / dao / hash / token), see timed_stage
+
+`route` is the URL rule (/api/v2/customers/<int:customer_id>), never
+the raw path, so label cardinality stays bounded.
+
+Multiprocess mode: when PROMETHEUS_MULTIPROC_DIR is set (before the app
+is imported; an empty directory per deployment), every gunicorn worker
+writes its values to files there and /metrics adds them up across
+workers. gunicorn's child_exit hook (v2/gunicorn_conf.py) removes the
+in-flight gauge of exited workers.
+"""
+
+import os
+import time
+from typing import Tuple
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+    )
+except ImportError:  # metrics are optional
+    CollectorRegistry = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+if CollectorRegistry is not None:
+    # Own registry: nothing else in the process is exported by accident
+    REGISTRY = CollectorRegistry()
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'Request latency by route',
+        ('method', 'route'), buckets=LATENCY_BUCKETS, registry=REGISTRY
+    )
+    REQUESTS = Counter(
+        'http_requests', 'Responses by route and status code',
+        ('method', 'route', 'status'), registry=REGISTRY
+    )
+    IN_FLIGHT = Gauge(
+        'http_requests_in_flight', 'Requests being handled',
+        multiprocess_mode='livesum', registry=REGISTRY
+    )
+    STAGE_LATENCY = Histogram(
+        'stage_duration_seconds', 'Time spent in one stage of an operation',
+        ('operation', 'stage'), buckets=STAGE_BUCKETS, registry=REGISTRY
+    )
+else:
+    REGISTRY = REQUEST_LATENCY = REQUESTS = IN_FLIGHT = STAGE_LATENCY = None
+
+# Label children by label values: .labels() costs more than the observation
+_latency_children = {}
+_request_children = {}
+_stage_children = {}
+
+# Where the Flask request leaves itself for the WSGI wrapper
+_ENVIRON_KEY = 'metrics.request'
+
+# Off until an app enables METRICS_ENABLED (and prometheus_client is installed)
+_enabled = False
+
+
+class timed_stage:
+    """
+    Times one stage of an operation into stage_duration_seconds:
+
+        with timed_stage('login', 'hash'):
+            customer.check_password(password)
+
+    Time is recorded even when the block raises.
+    """
+    __slots__ = ('_child', '_started')
+
+    def __init__(self, operation: str, stage: str):
+        child = None
+        if _enabled:
+            key = (operation, stage)
+            child = _stage_children.get(key)
+            if child is None:
+                child = _stage_children[key] = STAGE_LATENCY.labels(operation, stage)
+        self._child = child
+
+    def __enter__(self) -> 'timed_stage':
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._child is not None:
+            self._child.observe(time.perf_counter() - self._started)
+
+
+class RequestMetrics:
+    """
+    Flask extension recording latency, status and in-flight count of every
+    request. It wraps app.wsgi_app rather than using request hooks: the
+    hooks would pay for several context-local lookups per request, and a
+    wrapper also sees responses that other hooks produce (429, 503).
+    Latency is measured until the response starts; a streamed body is
+    not included.
+    """
+
+    def init_app(self, app) -> None:
+        """Instrument app if METRICS_ENABLED"""
+        global _enabled
+        _enabled = CollectorRegistry is not None and app.config.get('METRICS_ENABLED', True)
+        if _enabled:
+            app.request_class = _registering(app.request_class)
+            app.wsgi_app = _InstrumentedApp(app.wsgi_app)
+
+    @property
+    def enabled(self) -> bool:
+        return _enabled
+
+    @staticmethod
+    def exposition() -> Tuple[bytes, str]:
+        """Text exposition of all metrics, summed over workers in multiprocess mode"""
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class _InstrumentedApp:
+    """WSGI wrapper around the Flask app"""
+    __slots__ = ('wsgi_app',)
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        status = []
+
+        def capture_status(status_line, headers, exc_info=None):
+            status.append(status_line)
+            return start_response(status_line, headers, exc_info)
+
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            return self.wsgi_app(environ, capture_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            _observe(environ, status[-1][:3] if status else '500', elapsed)
+
+
+def _registering(request_class):
+    """Subclass of request_class that leaves itself in the WSGI environ"""
+
+    class RegisteringRequest(request_class):
+        def __init__(self, environ, *args, **kwargs):
+            super().__init__(environ, *args, **kwargs)
+            environ[_ENVIRON_KEY] = self
+
+    return RegisteringRequest
+
+
+def _observe(environ, status: str, seconds: float) -> None:
+    # url_rule is None when routing failed
+    flask_request = environ.get(_ENVIRON_KEY)
+    rule = getattr(flask_request, 'url_rule', None)
+    key = (environ['REQUEST_METHOD'], rule.rule if rule is not None else '<unmatched>')
+    latency = _latency_children.get(key)
+    if latency is None:
+        latency = _latency_children[key] = REQUEST_LATENCY.labels(*key)
+    latency.observe(seconds)
+    counter_key = key + (status,)
+    counter = _request_children.get(counter_key)
+    if counter is None:
+        counter = _request_children[counter_key] = REQUESTS.labels(*counter_key)
+    counter.inc()
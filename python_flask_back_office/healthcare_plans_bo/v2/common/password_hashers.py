@@ -0,0 +1,272 @@
+"""
+Password Hasher Registry
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/password_hashers.py
+
+Hashers for the supported KDFs with configurable cost parameters:
+- scrypt and pbkdf2 (always available, via werkzeug)
+- argon2 (when argon2-cffi is installed)
+- bcrypt (when bcrypt is installed)
+
+Stored hashes are self-describing, so a hash created under an older policy
+can still be verified and is upgraded by rehashing after a successful login.
+"""
+
+import statistics
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+
+class PasswordHasher(ABC):
+    """Abstract interface for a password KDF with fixed cost parameters"""
+
+    name: str = ''
+
+    def __init__(self, **params):
+        self.params = {**self.default_params(), **params}
+
+    @classmethod
+    @abstractmethod
+    def default_params(cls) -> dict:
+        """Default cost parameters"""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def identifies(cls, password_hash: str) -> bool:
+        """Whether the stored hash was produced by this KDF"""
+        pass
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        pass
+
+    @abstractmethod
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Verify a password (cost is read from the stored hash)"""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a hash of this KDF uses different cost parameters"""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def calibration_steps(cls) -> Iterator[dict]:
+        """Yield parameter sets of increasing cost for calibration"""
+        pass
+
+
+class ScryptHasher(PasswordHasher):
+    """werkzeug scrypt hashes: scrypt:<n>:<r>:<p>$salt$hash"""
+
+    name = 'scrypt'
+
+    @classmethod
+    def default_params(cls) -> dict:
+        return {'n': 2 ** 15, 'r': 8, 'p': 1}
+
+    @property
+    def method(self) -> str:
+        return f"scrypt:{self.params['n']}:{self.params['r']}:{self.params['p']}"
+
+    @classmethod
+    def identifies(cls, password_hash: str) -> bool:
+        return password_hash.startswith('scrypt:')
+
+    def hash(self, password: str) -> str:
+        return generate_password_hash(password, method=self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return check_password_hash(password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split('$', 1)[0] != self.method
+
+    @classmethod
+    def calibration_steps(cls) -> Iterator[dict]:
+        for log_n in range(12, 19):
+            yield {'n': 2 ** log_n, 'r': 8, 'p': 1}
+
+
+class Pbkdf2Hasher(PasswordHasher):
+    """werkzeug pbkdf2 hashes: pbkdf2:<hash_name>:<iterations>$salt$hash"""
+
+    name = 'pbkdf2'
+
+    @classmethod
+    def default_params(cls) -> dict:
+        return {'hash_name': 'sha256', 'iterations': 600000}
+
+    @property
+    def method(self) -> str:
+        return f"pbkdf2:{self.params['hash_name']}:{self.params['iterations']}"
+
+    @classmethod
+    def identifies(cls, password_hash: str) -> bool:
+        return password_hash.startswith('pbkdf2:')
+
+    def hash(self, password: str) -> str:
+        return generate_password_hash(password, method=self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return check_password_hash(password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split('$', 1)[0] != self.method
+
+    @classmethod
+    def calibration_steps(cls) -> Iterator[dict]:
+        for iterations in (100000, 200000, 300000, 450000, 600000, 900000, 1200000, 1800000, 2400000):
+            yield {'hash_name': 'sha256', 'iterations': iterations}
+
+
+class Argon2Hasher(PasswordHasher):
+    """argon2-cffi hashes: $argon2id$v=19$m=...,t=...,p=...$salt$hash"""
+
+    name = 'argon2'
+
+    @classmethod
+    def default_params(cls) -> dict:
+        return {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._hasher = argon2.PasswordHasher(**self.params)
+
+    @classmethod
+    def identifies(cls, password_hash: str) -> bool:
+        return password_hash.startswith('$argon2')
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        try:
+            return self._hasher.verify(password_hash, password)
+        except argon2.exceptions.VerificationError:
+            return False
+        except argon2.exceptions.InvalidHashError:
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self._hasher.check_needs_rehash(password_hash)
+
+    @classmethod
+    def calibration_steps(cls) -> Iterator[dict]:
+        for time_cost in range(1, 11):
+            yield {'time_cost': time_cost, 'memory_cost': 65536, 'parallelism': 4}
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt hashes: $2b$<rounds>$<salt+hash>"""
+
+    name = 'bcrypt'
+
+    @classmethod
+    def default_params(cls) -> dict:
+        return {'rounds': 12}
+
+    @classmethod
+    def identifies(cls, password_hash: str) -> bool:
+        return password_hash.startswith(('$2a$', '$2b$', '$2y$'))
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.params['rounds'])
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+        except ValueError:
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split('$')[2] != f"{self.params['rounds']:02d}"
+
+    @classmethod
+    def calibration_steps(cls) -> Iterator[dict]:
+        for rounds in range(8, 17):
+            yield {'rounds': rounds}
+
+
+HASHERS: Dict[str, Type[PasswordHasher]] = {
+    ScryptHasher.name: ScryptHasher,
+    Pbkdf2Hasher.name: Pbkdf2Hasher
+}
+
+if argon2 is not None:
+    HASHERS[Argon2Hasher.name] = Argon2Hasher
+
+if bcrypt is not None:
+    HASHERS[BcryptHasher.name] = BcryptHasher
+
+
+def create_hasher(name: str, params: Optional[dict] = None) -> PasswordHasher:
+    """Create a registered hasher with the given cost parameters"""
+    if name not in HASHERS:
+        raise ValueError(
+            f"Unknown or unavailable password hasher '{name}' "
+            f"(available: {', '.join(sorted(HASHERS))})"
+        )
+    return HASHERS[name](**(params or {}))
+
+
+def identify_hasher(password_hash: str) -> Optional[Type[PasswordHasher]]:
+    """Return the hasher class that produced a stored hash, if available"""
+    for hasher_class in HASHERS.values():
+        if hasher_class.identifies(password_hash):
+            return hasher_class
+    return None
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Verify a password against a hash produced by any registered hasher"""
+    if not password_hash:
+        return False
+    hasher_class = identify_hasher(password_hash)
+    if hasher_class is None:
+        return False
+    return hasher_class().verify(password_hash, password)
+
+
+def calibrate(name: str, target_ms: float, samples: int = 3) -> Tuple[Optional[dict], List[Tuple[dict, float]]]:
+    """
+    Measure hash time for increasing cost on this host.
+
+    Returns the most expensive parameters whose median hash time stays within
+    target_ms (None if even the cheapest step is too slow) and the measured
+    (params, milliseconds) table.
+    """
+    hasher_class = HASHERS.get(name)
+    if hasher_class is None:
+        raise ValueError(f"Unknown or unavailable password hasher '{name}'")
+
+    recommended = None
+    measurements = []
+    for params in hasher_class.calibration_steps():
+        hasher = hasher_class(**params)
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            hasher.hash('calibration-password')
+            timings.append((time.perf_counter() - started) * 1000)
+        elapsed_ms = statistics.median(timings)
+        measurements.append((params, elapsed_ms))
+        if elapsed_ms > target_ms:
+            break
+        recommended = params
+    return recommended, measurements
@@ -0,0 +1,216 @@
+"""
+Password Hashing Executor
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/password_hashing.py
+
+Runs the password KDF in a bounded process pool so a signup/login does not
+hold a gthread worker thread (and the GIL) for the whole hash computation.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import List, Optional, Sequence
+from v2.common.password_hashers import PasswordHasher, create_hasher, verify_password
+
+
+class PasswordHashingError(Exception):
+    """Base error for password hashing executor failures"""
+
+
+class PasswordHashingBusyError(PasswordHashingError):
+    """Raised when too many hashing jobs are already queued"""
+
+
+class PasswordHashingTimeoutError(PasswordHashingError):
+    """Raised when a hashing job does not complete within the timeout"""
+
+
+def _hash_password(hasher_name: str, params: dict, password: str) -> str:
+    """Hash a password (runs inside a pool process)"""
+    return create_hasher(hasher_name, params).hash(password)
+
+
+def _verify_password(password_hash: str, password: str) -> bool:
+    """Verify a password against a hash (runs inside a pool process)"""
+    return verify_password(password_hash, password)
+
+
+class PasswordHashExecutor:
+    """
+    Bounded process pool for password hashing and verification.
+
+    - workers:     pool size; 0 runs the KDF inline in the calling thread
+    - max_pending: queued + running jobs allowed before callers are rejected
+    - timeout:     seconds a caller waits for its job before giving up
+    - hasher:      the KDF and cost parameters new hashes are created with
+
+    The pool is created lazily and re-created after a fork, so it is safe to
+    configure in the gunicorn master and use from the workers.
+    """
+
+    def __init__(self, app=None):
+        self._workers = 0
+        self._max_pending = 64
+        self._timeout: Optional[float] = None
+        self._hasher: PasswordHasher = create_hasher('scrypt')
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Configure the executor from Flask app config"""
+        hasher_name = app.config.get('PASSWORD_HASHER', 'scrypt')
+        hasher_params = app.config.get('PASSWORD_HASHER_PARAMS', {}).get(hasher_name)
+        self.configure(
+            workers=app.config.get('PASSWORD_HASH_WORKERS', 0),
+            max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 64),
+            timeout=app.config.get('PASSWORD_HASH_TIMEOUT'),
+            hasher=create_hasher(hasher_name, hasher_params)
+        )
+
+    def configure(self, workers: int, max_pending: int = 64, timeout: Optional[float] = None,
+                  hasher: Optional[PasswordHasher] = None) -> None:
+        """(Re)configure pool size, queue-depth limit, timeout and hashing policy"""
+        self.shutdown()
+        self._workers = max(int(workers or 0), 0)
+        self._max_pending = max(int(max_pending), 1)
+        self._timeout = timeout
+        self._hasher = hasher or self._hasher
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+
+    @property
+    def workers(self) -> int:
+        """Configured pool size (0 means inline hashing)"""
+        return self._workers
+
+    @property
+    def hasher(self) -> PasswordHasher:
+        """Hasher used for new password hashes"""
+        return self._hasher
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the current policy"""
+        return self._run(_hash_password, self._hasher.name, self._hasher.params, password)
+
+    def hash_many(self, passwords: Sequence[str], bounded: bool = False) -> List[str]:
+        """
+        Hash a batch of passwords with the current policy, spread over all
+        pool processes, preserving order.
+
+        bounded=True is for batches hashed inside a request: every job
+        takes a max_pending slot (waiting up to the timeout for one) and
+        has the per-job timeout, and at most `workers` jobs of the batch
+        are in the pool at a time, so a signup or login queues behind one
+        round of them rather than the whole batch.
+
+        bounded=False is for offline bulk work (imports): the batch is
+        mapped over the pool in one go, without slots or timeout.
+        """
+        job = partial(_hash_password, self._hasher.name, self._hasher.params)
+        if self._workers == 0 or not passwords:
+            return [job(password) for password in passwords]
+        if bounded:
+            return self._run_window(job, passwords)
+
+        chunksize = max(1, len(passwords) // (self._workers * 4))
+        try:
+            return list(self._get_pool().map(job, passwords, chunksize=chunksize))
+        except BrokenProcessPool:
+            self._discard_pool()
+            raise PasswordHashingError('Password hashing pool is unavailable')
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Verify a password against a stored hash of any supported format"""
+        return self._run(_verify_password, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a stored hash differs from the current policy (no KDF run)"""
+        return not self._hasher.identifies(password_hash) or self._hasher.needs_rehash(password_hash)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool processes (a new pool is created on next use)"""
+        with self._lock:
+            pool, pool_pid = self._pool, self._pool_pid
+            self._pool, self._pool_pid = None, None
+        # A pool inherited across fork belongs to the parent process
+        if pool is not None and pool_pid == os.getpid():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        """Submit a job to the pool and wait for its result"""
+        if self._workers == 0:
+            return fn(*args)
+        return self._result(self._submit(fn, *args))
+
+    def _run_window(self, fn, items: Sequence) -> list:
+        """fn over items, keeping at most `workers` of these jobs submitted at a time"""
+        results = [None] * len(items)
+        in_flight = deque()
+        try:
+            for index, item in enumerate(items):
+                if len(in_flight) >= self._workers:
+                    done_index, future = in_flight.popleft()
+                    results[done_index] = self._result(future)
+                in_flight.append((index, self._submit(fn, item, wait_for_slot=True)))
+            while in_flight:
+                done_index, future = in_flight.popleft()
+                results[done_index] = self._result(future)
+        except BaseException:
+            for _, future in in_flight:
+                future.cancel()
+            raise
+        return results
+
+    def _submit(self, fn, *args, wait_for_slot: bool = False):
+        """Take a max_pending slot and submit a job; returns its future"""
+        slots = self._slots
+        acquired = slots.acquire(timeout=self._timeout) if wait_for_slot else slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHashingBusyError('Password hashing queue is full, please retry shortly')
+
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._discard_pool()
+            raise PasswordHashingError('Password hashing pool is unavailable')
+        except BaseException:
+            slots.release()
+            raise
+
+        # The slot is held until the job really finishes, even if the caller
+        # stops waiting, so max_pending bounds the work queued on the pool.
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _result(self, future):
+        """Wait for a submitted job, up to the timeout"""
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHashingTimeoutError('Password hashing timed out')
+        except BrokenProcessPool:
+            self._discard_pool()
+            raise PasswordHashingError('Password hashing pool is unavailable')
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the pool for the current process, creating it if needed"""
+        pid = os.getpid()
+        with self._lock:
+            if self._pool is None or self._pool_pid != pid:
+                self._pool = ProcessPoolExecutor(max_workers=self._workers)
+                self._pool_pid = pid
+            return self._pool
+
+    def _discard_pool(self) -> None:
+        """Drop a broken pool so the next call starts a fresh one"""
+        with self._lock:
+            self._pool, self._pool_pid = None, None
@@ -0,0 +1,224 @@
+"""
+Login Rate Limiting
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/rate_limit.py
+
+Token buckets that refuse login attempts before the customer lookup and
+the password KDF run, so a flood of guesses costs a dict lookup instead
+of a scrypt. LoginThrottle keeps two buckets per attempt: one per client
+IP (credential stuffing from one source) and one per normalized email
+(guessing one account from many sources).
+
+Buckets live in a SQLite file shared by the workers of one host
+(LOGIN_THROTTLE_STORE_PATH; empty keeps them per worker). Once a key runs
+dry, the worker remembers until when, and rejects further attempts for
+that key from memory without touching the file (the fast path that
+serves an attack). A store that cannot be used (locked past its timeout,
+unwritable) degrades to per-worker buckets instead of failing logins.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .ttl_cache import TTLCache, MISSING
+
+
+def take_token(tokens: float, updated: float, now: float, capacity: float, rate: float) -> Tuple[float, float]:
+    """
+    One token-bucket step: refill since `updated`, then take a token.
+    Returns (tokens left, retry_after); retry_after is 0 when allowed.
+    """
+    tokens = min(capacity, tokens + max(now - updated, 0.0) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class LocalBucketStore:
+    """Buckets in this worker's memory (least recently used dropped past max_keys)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self._max_keys = max_keys
+        self._buckets: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Take a token for key; returns retry_after (0 = allowed)"""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, retry_after = take_token(tokens, updated, now, capacity, rate)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a SQLite file, shared by every process that opens it. Each
+    take is one short write transaction (BEGIN IMMEDIATE serializes them
+    across processes). Rows of buckets that have refilled completely are
+    deleted every PRUNE_EVERY takes.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str, timeout: float = 0.25):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._takes = 0
+        connection = self._connect()
+        try:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_buckets_full_at ON buckets (full_at)')
+        finally:
+            connection.close()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Take a token for key; returns retry_after (0 = allowed). Raises sqlite3.Error"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row is not None else (capacity, now)
+            tokens, retry_after = take_token(tokens, updated, now, capacity, rate)
+            connection.execute(
+                'INSERT INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated, '
+                'full_at = excluded.full_at',
+                (key, tokens, now, now + (capacity - tokens) / rate)
+            )
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                connection.execute('DELETE FROM buckets WHERE full_at < ?', (now,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, opened again in a forked worker"""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = self._connect()
+            local.pid = os.getpid()
+        return local.connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        # Losing the last moments of throttle state in a crash is harmless
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=OFF')
+        return connection
+
+
+class LoginThrottle:
+    """
+    Flask extension limiting login attempts per client IP and per email.
+
+    Each limit is a bucket of LOGIN_THROTTLE_*_BURST attempts refilling at
+    LOGIN_THROTTLE_*_PER_MINUTE. Every attempt takes a token, successful
+    or not. check() is cheap enough to run before the request is
+    validated; it returns the seconds until the caller may try again
+    (0 = go ahead).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._limits = {}
+        self._store = None
+        self._fallback = LocalBucketStore()
+        self._blocked = TTLCache(max_size=100000, ttl_seconds=60)
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+        self._rejected_in_memory = 0
+        self._store_errors = 0
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config"""
+        self.enabled = app.config.get('LOGIN_THROTTLE_ENABLED', True)
+        self._limits = {
+            'ip': (app.config.get('LOGIN_THROTTLE_IP_BURST', 20),
+                   app.config.get('LOGIN_THROTTLE_IP_PER_MINUTE', 10) / 60.0),
+            'email': (app.config.get('LOGIN_THROTTLE_EMAIL_BURST', 5),
+                      app.config.get('LOGIN_THROTTLE_EMAIL_PER_MINUTE', 3) / 60.0),
+        }
+        path = app.config.get('LOGIN_THROTTLE_STORE_PATH')
+        self._store = self._fallback = LocalBucketStore()
+        if self.enabled and path:
+            try:
+                self._store = SQLiteBucketStore(path)
+            except sqlite3.Error as e:
+                print(f"⚠️ Login throttle store {path} unavailable, throttling per worker: {e}")
+        self._blocked.clear()
+
+    def check(self, ip: Optional[str], email: Optional[str]) -> float:
+        """Take a token from the IP and email buckets; returns retry_after (0 = allowed)"""
+        if not self.enabled:
+            return 0.0
+        keys = []
+        if ip:
+            keys.append(('ip', f'ip:{ip}'))
+        if isinstance(email, str) and email.strip():
+            keys.append(('email', f'email:{email_digest(email)}'))
+
+        now = time.time()
+        for _, key in keys:
+            blocked_until = self._blocked.get(key)
+            if blocked_until is not MISSING and blocked_until > now:
+                self._count(rejected=True, in_memory=True)
+                return blocked_until - now
+
+        for kind, key in keys:
+            capacity, rate = self._limits[kind]
+            retry_after = self._take(key, capacity, rate, now)
+            if retry_after > 0:
+                self._blocked.set(key, now + retry_after, ttl_seconds=retry_after)
+                self._count(rejected=True)
+                return retry_after
+
+        self._count(rejected=False)
+        return 0.0
+
+    def stats(self) -> dict:
+        """Counters of this worker"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'shared_store': isinstance(self._store, SQLiteBucketStore),
+                'allowed': self._allowed,
+                'rejected': self._rejected,
+                'rejected_in_memory': self._rejected_in_memory,
+                'store_errors': self._store_errors
+            }
+
+    def _take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        try:
+            return self._store.take(key, capacity, rate, now)
+        except sqlite3.Error:
+            with self._lock:
+                self._store_errors += 1
+            return self._fallback.take(key, capacity, rate, now)
+
+    def _count(self, rejected: bool, in_memory: bool = False) -> None:
+        with self._lock:
+            if not rejected:
+                self._allowed += 1
+            else:
+                self._rejected += 1
+                self._rejected_in_memory += in_memory
+
+
+def email_digest(email: str) -> str:
+    """Bucket key for an email (addresses are not written to the store)"""
+    return hashlib.blake2b(email.strip().lower().encode(), digest_size=16).hexdigest()
@@ -0,0 +1,131 @@
+"""
+Single-Flight Call Coalescing
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/single_flight.py
+
+Concurrent calls for the same key share one execution: the first caller
+(the leader) runs the function, callers arriving while it is in flight
+wait for it and get its result or its exception. Nothing is cached; once
+the call finishes, the next caller runs it again.
+
+Coalescing only happens between threads of one worker process (gthread /
+gevent workers), and only suits idempotent lookups returning values that
+are safe to share, e.g. frozen DTOs.
+"""
+
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlightTimeoutError(TimeoutError):
+    """Raised to a waiting caller when the shared call outlives the timeout"""
+
+
+class _Call:
+    """One in-flight execution"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Per-key coalescing of concurrent calls, usable as a decorator:
+
+        @single_flight(key=lambda self, customer_id: customer_id)
+        def get_profile(self, customer_id): ...
+
+    Keys are scoped to the decorated function, so one instance can serve
+    several lookups. Waiting callers give up after timeout_seconds with
+    SingleFlightTimeoutError (the leader itself is never interrupted).
+    """
+
+    def __init__(self, timeout_seconds: float = 5.0, enabled: bool = True):
+        self.timeout_seconds = timeout_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._coalesced = 0
+        self._timeouts = 0
+        self._errors = 0
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config"""
+        self.timeout_seconds = app.config.get('SINGLE_FLIGHT_TIMEOUT_SECONDS', 5.0)
+        self.enabled = app.config.get('SINGLE_FLIGHT_ENABLED', True)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs), or join the in-flight call for key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout_seconds):
+                with self._lock:
+                    self._timeouts += 1
+                raise SingleFlightTimeoutError(f'Shared call for {key!r} did not finish in {self.timeout_seconds}s')
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._executed += 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Stop new callers from joining the in-flight call for key (e.g.
+        after a write, so they do not get a result read before it).
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def __call__(self, key: Callable[..., Hashable]) -> Callable:
+        """
+        Decorator; key receives the call's arguments. The wrapper's
+        forget(*args, **kwargs) drops the in-flight call for those arguments.
+        """
+        def decorator(fn: Callable) -> Callable:
+            scope = fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                return self.do((scope, key(*args, **kwargs)), fn, *args, **kwargs)
+
+            wrapper.forget = lambda *args, **kwargs: self.forget((scope, key(*args, **kwargs)))
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        """Counters since start: executed vs coalesced calls"""
+        with self._lock:
+            return {
+                'executed': self._executed,
+                'coalesced': self._coalesced,
+                'timeouts': self._timeouts,
+                'errors': self._errors,
+                'in_flight': len(self._calls)
+            }
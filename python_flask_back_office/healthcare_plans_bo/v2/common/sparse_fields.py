@@ -0,0 +1,85 @@
+"""
+Sparse Fieldsets
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/sparse_fields.py
+
+Parses `?fields=a,b,c` against an allowlist and builds, per requested
+combination, the column list to SELECT and a serializer specialized to
+exactly those fields.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when ?fields= names a field outside the allowlist"""
+
+
+class FieldSet:
+    """
+    Allowlist of the fields a resource can be projected to.
+
+    - fields:   allowed output fields, in output order
+    - derived:  output fields computed from other columns,
+                name -> (source columns, fn(row) -> value)
+    - temporal: fields holding date/datetime values (ISO 8601 in output)
+
+    Field combinations are normalized to allowlist order, so the columns and
+    serializer built for a combination are cached and shared by all
+    requests asking for it, whatever order they list the fields in.
+    """
+
+    def __init__(self, fields: Sequence[str],
+                 derived: Optional[Dict[str, Tuple[Tuple[str, ...], Callable[[Mapping], object]]]] = None,
+                 temporal: Iterable[str] = ()):
+        self.fields = tuple(fields)
+        self._derived = dict(derived or {})
+        self._temporal = frozenset(temporal)
+        self.columns = lru_cache(maxsize=256)(self._columns)
+        self.serializer = lru_cache(maxsize=256)(self._serializer)
+
+    def parse(self, raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Normalize a comma-separated field list; None when no list is given
+        (the caller returns the full representation).
+        """
+        if raw is None or not raw.strip():
+            return None
+        requested = {name.strip() for name in raw.split(',') if name.strip()}
+        unknown = requested.difference(self.fields)
+        if unknown:
+            raise InvalidFieldsError(
+                f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(self.fields)}"
+            )
+        return tuple(name for name in self.fields if name in requested)
+
+    def _columns(self, fields: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Columns to SELECT for a normalized field combination"""
+        columns = []
+        for name in fields:
+            for column in self._derived[name][0] if name in self._derived else (name,):
+                if column not in columns:
+                    columns.append(column)
+        return tuple(columns)
+
+    def _serializer(self, fields: Tuple[str, ...]) -> Callable[[Mapping], dict]:
+        """Row mapping -> response dict, for exactly these fields"""
+        getters = []
+        for name in fields:
+            if name in self._derived:
+                getters.append((name, self._derived[name][1]))
+            elif name in self._temporal:
+                getters.append((name, lambda row, key=name: _isoformat(row[key])))
+            else:
+                getters.append((name, lambda row, key=name: row[key]))
+
+        def serialize(row: Mapping) -> dict:
+            return {name: get(row) for name, get in getters}
+
+        return serialize
+
+
+def _isoformat(value):
+    """ISO 8601 for dates/datetimes, None stays None"""
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
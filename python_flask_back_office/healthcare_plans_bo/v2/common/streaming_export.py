@@ -0,0 +1,62 @@
+"""
+Streaming Row Serializers
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/streaming_export.py
+
+Turn an iterator of plain row tuples into NDJSON or CSV text chunks for a
+streamed response or file, without building any per-row objects beyond
+the line being written.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, Sequence
+
+
+def _json_default(value):
+    """Encode the temporal column types as ISO 8601"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def iter_ndjson(columns: Sequence[str], rows: Iterable[tuple], chunk_rows: int = 1000) -> Iterator[str]:
+    """One JSON object per line; yields chunks of up to chunk_rows lines"""
+    encode = json.JSONEncoder(separators=(',', ':'), default=_json_default).encode
+    columns = tuple(columns)
+    lines = []
+    for row in rows:
+        lines.append(encode(dict(zip(columns, row))))
+        if len(lines) >= chunk_rows:
+            lines.append('')
+            yield '\n'.join(lines)
+            lines = []
+    if lines:
+        lines.append('')
+        yield '\n'.join(lines)
+
+
+def iter_csv(columns: Sequence[str], rows: Iterable[tuple], chunk_rows: int = 1000) -> Iterator[str]:
+    """Header line followed by one CSV record per row, in chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# format name -> (serializer, mimetype, file extension)
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (iter_csv, 'text/csv', 'csv')
+}
@@ -0,0 +1,103 @@
+"""
+Write-Behind Buffer
+Location: python_flask_back_office/healthcare_plans_bo/v2/common/write_behind.py
+
+Collects keyed writes in memory and hands them to a flush function in
+batches, off the request thread.
+"""
+
+import atexit
+import os
+import threading
+from typing import Callable, Dict, Hashable, Any, Optional
+
+
+class WriteBehindBuffer:
+    """
+    Coalescing write-behind buffer (one per worker process).
+
+    record(key, value) keeps only the latest value per key. A background
+    thread passes all pending items to flush_fn(items) every flush_interval
+    seconds, or as soon as max_items keys are pending. Whatever is still
+    pending is drained when the process exits. If flush_fn raises, the items
+    are kept (unless superseded by a newer value) and retried next time.
+    """
+
+    def __init__(self, flush_fn: Callable[[Dict[Hashable, Any]], None],
+                 max_items: int = 500, flush_interval: float = 5.0, name: str = 'write-behind'):
+        self._flush_fn = flush_fn
+        self._max_items = max(int(max_items), 1)
+        self._flush_interval = float(flush_interval)
+        self._name = name
+        self._pending: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._closed = False
+        self.flushed_items = 0
+        self.flushed_batches = 0
+        atexit.register(self.close)
+
+    def record(self, key: Hashable, value: Any) -> None:
+        """Queue a write; a later value for the same key replaces it"""
+        with self._lock:
+            self._pending[key] = value
+            full = len(self._pending) >= self._max_items
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all pending items now; returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                items, self._pending = self._pending, {}
+            if not items:
+                return 0
+            try:
+                self._flush_fn(items)
+            except Exception:
+                with self._lock:
+                    for key, value in items.items():
+                        self._pending.setdefault(key, value)
+                raise
+            self.flushed_items += len(items)
+            self.flushed_batches += 1
+            return len(items)
+
+    def close(self) -> None:
+        """Stop the background thread and drain pending items"""
+        self._closed = True
+        self._wake.set()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ {self._name}: failed to drain pending writes: {e}")
+
+    @property
+    def pending(self) -> int:
+        """Number of keys waiting to be flushed"""
+        return len(self._pending)
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher thread (again after a fork)"""
+        pid = os.getpid()
+        if self._thread_pid == pid and self._thread is not None:
+            return
+        with self._lock:
+            if self._thread_pid != pid or self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread_pid = pid
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Flush on the interval or when woken by a full buffer"""
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ {self._name}: flush failed, will retry: {e}")
@@ -4,6 +4,7 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/config_v2.py
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 
@@ -25,6 +26,123 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # Decoded access/refresh token claims cached per worker until the
+    # token's exp (0 = verify every request)
+    JWT_DECODE_CACHE_SIZE = int(os.environ.get('JWT_DECODE_CACHE_SIZE') or 10000)
+    
+    # Asymmetric signing (RS256 / EdDSA): <kid>.pem private keys in this
+    # directory, public halves served at /.well-known/jwks.json. Unset =
+    # HS256 with JWT_SECRET_KEY. See v2/common/jwt_keys.py for rotation.
+    JWT_SIGNING_KEYS_DIR = os.environ.get('JWT_SIGNING_KEYS_DIR') or None
+    JWT_SIGNING_KID = os.environ.get('JWT_SIGNING_KID') or None
+    # Keep accepting HS256 tokens while switching to a key set
+    JWT_ACCEPT_HS256_TOKENS = os.environ.get('JWT_ACCEPT_HS256_TOKENS', 'false').lower() == 'true'
+    JWKS_MAX_AGE_SECONDS = int(os.environ.get('JWKS_MAX_AGE_SECONDS') or 3600)
+    
+    # Embed a profile snapshot in access tokens so GET /me?view=summary is
+    # answered from the token. A snapshot is used only while its version
+    # matches the customer's profile_version, which each worker caches for
+    # the TTL below (a change made through another worker shows up after
+    # at most that long; 0 = look it up on every request)
+    PROFILE_SNAPSHOT_CLAIMS_ENABLED = os.environ.get('PROFILE_SNAPSHOT_CLAIMS_ENABLED', 'false').lower() == 'true'
+    PROFILE_SNAPSHOT_VERSION_TTL_SECONDS = float(os.environ.get('PROFILE_SNAPSHOT_VERSION_TTL_SECONDS') or 5)
+    
+    # Password hashing process pool (0 workers = hash inline)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING') or 64)
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 5.0)
+    
+    # Password hashing policy: KDF for new hashes and cost parameters per KDF.
+    # Tune with `flask calibrate-password-hash`; existing hashes are upgraded
+    # on the next successful login.
+    PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER') or 'scrypt'
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 32768, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 600000},
+        'argon2': {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4},
+        'bcrypt': {'rounds': 12}
+    }
+    
+    # Customer read-through cache (per worker process; other workers see a
+    # change once their entry expires, so keep the TTL short)
+    CUSTOMER_CACHE_ENABLED = os.environ.get('CUSTOMER_CACHE_ENABLED', 'false').lower() == 'true'
+    CUSTOMER_CACHE_MAX_SIZE = int(os.environ.get('CUSTOMER_CACHE_MAX_SIZE') or 10000)
+    CUSTOMER_CACHE_TTL_SECONDS = float(os.environ.get('CUSTOMER_CACHE_TTL_SECONDS') or 30)
+    CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get('CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS') or 5)
+    
+    # Single-flight coalescing of concurrent profile reads for the same
+    # customer (per worker process); waiters give up after the timeout
+    SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    SINGLE_FLIGHT_TIMEOUT_SECONDS = float(os.environ.get('SINGLE_FLIGHT_TIMEOUT_SECONDS') or 5)
+    
+    # Write-behind last_login updates (0 = write synchronously on login)
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL_SECONDS') or 5)
+    LAST_LOGIN_FLUSH_MAX_BATCH = int(os.environ.get('LAST_LOGIN_FLUSH_MAX_BATCH') or 500)
+    
+    # Group enrollment (POST /api/v2/customers/batch)
+    BATCH_SIGNUP_MAX_ITEMS = int(os.environ.get('BATCH_SIGNUP_MAX_ITEMS') or 1000)
+    BATCH_SIGNUP_CHUNK_SIZE = int(os.environ.get('BATCH_SIGNUP_CHUNK_SIZE') or 100)
+    
+    # Profile multi-get (GET /api/v2/customers?ids=...)
+    PROFILE_LOOKUP_MAX_IDS = int(os.environ.get('PROFILE_LOOKUP_MAX_IDS') or 1000)
+    
+    # Proxies in front of the app (Cloud Run's front end is one) whose
+    # X-Forwarded-For entry is trusted as the client address
+    # (request.remote_addr); 0 when clients connect directly
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR') or 1)
+    
+    # Login throttling before the customer lookup and password KDF: token
+    # buckets per client IP and per email (BURST attempts, refilling at
+    # PER_MINUTE), shared by the workers of a host through a SQLite file
+    # (empty path = per worker). Buckets are keyed on request.remote_addr,
+    # the client address after PROXY_FIX_X_FOR.
+    LOGIN_THROTTLE_ENABLED = os.environ.get('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true'
+    LOGIN_THROTTLE_IP_BURST = int(os.environ.get('LOGIN_THROTTLE_IP_BURST') or 20)
+    LOGIN_THROTTLE_IP_PER_MINUTE = float(os.environ.get('LOGIN_THROTTLE_IP_PER_MINUTE') or 10)
+    LOGIN_THROTTLE_EMAIL_BURST = int(os.environ.get('LOGIN_THROTTLE_EMAIL_BURST') or 5)
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE = float(os.environ.get('LOGIN_THROTTLE_EMAIL_PER_MINUTE') or 3)
+    LOGIN_THROTTLE_STORE_PATH = os.environ.get(
+        'LOGIN_THROTTLE_STORE_PATH', os.path.join(tempfile.gettempdir(), 'yhp-v2-login-throttle.sqlite3')
+    )
+    
+    # Bulkheads (per worker): concurrent requests admitted per endpoint
+    # class, how many more may wait for a slot, and for how long before a
+    # 503. With 4 threads per worker, KDF-bound credential endpoints can
+    # hold at most 2 of them and streaming exports 1; unlisted endpoints
+    # (/me, /health, admin stats) are not limited.
+    BULKHEADS_ENABLED = os.environ.get('BULKHEADS_ENABLED', 'true').lower() == 'true'
+    BULKHEADS = {
+        'credentials': {
+            'max_concurrent': int(os.environ.get('BULKHEAD_CREDENTIALS_MAX_CONCURRENT') or 2),
+            'max_queue': int(os.environ.get('BULKHEAD_CREDENTIALS_MAX_QUEUE') or 8),
+            'queue_timeout_seconds': float(os.environ.get('BULKHEAD_CREDENTIALS_QUEUE_TIMEOUT_SECONDS') or 2),
+            'blueprints': ['customer_v2.signup_v2'],
+            'endpoints': ['customer_v2.login_v2.login']
+        },
+        'exports': {
+            'max_concurrent': int(os.environ.get('BULKHEAD_EXPORTS_MAX_CONCURRENT') or 1),
+            'max_queue': int(os.environ.get('BULKHEAD_EXPORTS_MAX_QUEUE') or 2),
+            'queue_timeout_seconds': float(os.environ.get('BULKHEAD_EXPORTS_QUEUE_TIMEOUT_SECONDS') or 10),
+            'endpoints': ['admin_customer_v2.export_customers']
+        }
+    }
+    
+    # Prometheus metrics at /metrics (needs prometheus_client). Across
+    # gunicorn workers, set PROMETHEUS_MULTIPROC_DIR (see v2/common/metrics.py)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # SQL statement counts per request: slow-query log threshold (0 = off), repeats
+    # of one statement shape that count as an N+1 suspect, and whether
+    # responses carry a Server-Timing header with the request's DB time
+    QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', 'true').lower() == 'true'
+    QUERY_SLOW_THRESHOLD_MS = float(os.environ.get('QUERY_SLOW_THRESHOLD_MS') or 100)
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_N_PLUS_ONE_THRESHOLD') or 5)
+    QUERY_STATS_SERVER_TIMING = os.environ.get('QUERY_STATS_SERVER_TIMING', 'false').lower() == 'true'
+    
+    # Back-office endpoints (X-Admin-Key header). No default: while unset,
+    # every back-office endpoint answers 503
+    ADMIN_API_KEY = os.environ.get('ADMIN_API_KEY') or None
+    
     # CORS
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
     
@@ -35,6 +153,13 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    QUERY_STATS_SERVER_TIMING = True
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 16384, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 100000},
+        'argon2': {'time_cost': 1, 'memory_cost': 19456, 'parallelism': 1},
+        'bcrypt': {'rounds': 10}
+    }
 
 
 class ProductionConfig(Config):
@@ -44,6 +169,16 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    PASSWORD_HASH_WORKERS = 0
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS = 0
+    LOGIN_THROTTLE_STORE_PATH = ''
+    ADMIN_API_KEY = 'test-admin-key'
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 1024, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 1000},
+        'argon2': {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1},
+        'bcrypt': {'rounds': 4}
+    }
 
 
 config = {
@@ -5,6 +5,8 @@ Customer Profile - API Module
 from flask import Blueprint
 from .signup_api import signup_bp
 from .login_api import login_bp
+from .profile_lookup_api import lookup_bp
+from .admin_api import admin_customer_bp
 
 # Create main customer blueprint for v2
 customer_bp = Blueprint('customer_v2', __name__)
@@ -12,5 +14,6 @@ customer_bp = Blueprint('customer_v2', __name__)
 # Register sub-blueprints
 customer_bp.register_blueprint(signup_bp)
 customer_bp.register_blueprint(login_bp)
+customer_bp.register_blueprint(lookup_bp)
 
-__all__ = ['customer_bp']
+__all__ = ['customer_bp', 'admin_customer_bp']
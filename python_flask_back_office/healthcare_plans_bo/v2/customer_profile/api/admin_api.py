@@ -0,0 +1,154 @@
+"""
+Customer Back-Office API
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/api/admin_api.py
+"""
+
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from v2.common.admin_auth import admin_key_required
+from v2.common.streaming_export import EXPORT_FORMATS
+from v2.extensions_v2 import jwt, single_flight, login_throttle, bulkheads, query_stats
+from v2.customer_profile.dao import CustomerDAOFactory
+from v2.customer_profile.service import CustomerServiceFactory
+from v2.customer_profile.dto import CustomerListRequestDTO, CustomerExportRequestDTO
+
+admin_customer_bp = Blueprint('admin_customer_v2', __name__)
+
+
+@admin_customer_bp.route('', methods=['GET'])
+@admin_key_required
+def list_customers():
+    """
+    List Customers (back office)
+    
+    GET /api/v2/admin/customers?limit=50&is_active=true&state=KA&cursor=...
+    
+    Headers:
+        X-Admin-Key: <ADMIN_API_KEY>
+    
+    Query Parameters:
+        limit        page size (1-500, default 50)
+        cursor       next_cursor from the previous page
+        is_active    true/false
+        is_verified  true/false
+        city, state  exact match
+    
+    Ordered by signup time (created_at, id). Pages are fetched by keyset,
+    so there is no total count and no page number; follow next_cursor
+    until it is null.
+    
+    Response (200):
+    {
+        "success": true,
+        "data": {
+            "items": [ ... customer profiles ... ],
+            "next_cursor": "WyIyMDI0LTAxLTAx...",
+            "has_more": true
+        }
+    }
+    """
+    try:
+        list_request = CustomerListRequestDTO.from_args(request.args)
+        customer_service = CustomerServiceFactory.get_instance()
+        page = customer_service.list_customers(list_request)
+        
+        return jsonify({
+            'success': True,
+            'data': page.to_dict()
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'An error occurred: {str(e)}'
+        }), 500
+
+
+@admin_customer_bp.route('/export', methods=['GET'])
+@admin_key_required
+def export_customers():
+    """
+    Export Customers (back office)
+    
+    GET /api/v2/admin/customers/export?format=ndjson&is_active=true
+    
+    Headers:
+        X-Admin-Key: <ADMIN_API_KEY>
+    
+    Query Parameters:
+        format       ndjson (default) or csv
+        is_active    true/false
+        is_verified  true/false
+        city, state  exact match
+    
+    Streams every matching customer ordered by (created_at, id) as an
+    attachment, one JSON object per line (NDJSON) or one CSV record per
+    line after a header. The body is produced while rows are read from
+    the database, so there is no Content-Length.
+    """
+    try:
+        export_request = CustomerExportRequestDTO.from_args(request.args)
+        customer_service = CustomerServiceFactory.get_instance()
+        chunks = customer_service.export_customers(export_request)
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'An error occurred: {str(e)}'
+        }), 500
+    
+    _, mimetype, extension = EXPORT_FORMATS[export_request.format]
+    filename = f"customers-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{extension}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@admin_customer_bp.route('/stats', methods=['GET'])
+@admin_key_required
+def runtime_stats():
+    """
+    Read-path counters of this worker process (back office)
+    
+    GET /api/v2/admin/customers/stats
+    
+    Headers:
+        X-Admin-Key: <ADMIN_API_KEY>
+    
+    Response (200):
+    {
+        "success": true,
+        "data": {
+            "single_flight": {"executed": 120, "coalesced": 48, "timeouts": 0, "errors": 0, "in_flight": 1},
+            "customer_cache": { ... } or null when the cache is disabled,
+            "jwt_decode_cache": { ... } or null when the cache is disabled,
+            "login_throttle": {"enabled": true, "shared_store": true, "allowed": 310, "rejected": 5200, ...},
+            "bulkheads": {"credentials": {"active": 2, "queued": 3, "rejected_queue_full": 0, "rejected_timeout": 4, ...}},
+            "queries": {"enabled": true, "endpoints": {"customer_v2.login_v2.login": {"avg_statements": 3.0, "avg_db_ms": 1.8, ...}}}
+        }
+    }
+    """
+    customer_dao = CustomerDAOFactory.get_instance()
+    return jsonify({
+        'success': True,
+        'data': {
+            'single_flight': single_flight.stats(),
+            'customer_cache': customer_dao.stats() if hasattr(customer_dao, 'stats') else None,
+            'jwt_decode_cache': jwt.cache_stats(),
+            'login_throttle': login_throttle.stats(),
+            'bulkheads': bulkheads.stats(),
+            'queries': query_stats.stats()
+        }
+    }), 200
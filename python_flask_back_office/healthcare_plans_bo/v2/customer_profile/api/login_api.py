@@ -3,13 +3,26 @@ Login API
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/api/login_api.py
 """
 
+import math
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token
+from v2.common.conditional import (
+    PreconditionFailedError, make_etag, if_match_timestamp,
+    is_not_modified, set_validators, not_modified
+)
+from v2.common.password_hashing import PasswordHashingError
+from v2.common.single_flight import SingleFlightTimeoutError
+from v2.common.sparse_fields import InvalidFieldsError
+from v2.extensions_v2 import login_throttle
+from v2.customer_profile.dao import ConcurrentUpdateError
 from v2.customer_profile.service import CustomerServiceFactory
-from v2.customer_profile.dto import LoginRequestDTO
+from v2.customer_profile.dto import LoginRequestDTO, PROFILE_FIELDSET
 
 login_bp = Blueprint('login_v2', __name__)
 
+# GET /me?view=
+PROFILE_VIEWS = ('full', 'summary')
+
 
 @login_bp.route('/login', methods=['POST'])
 def login():
@@ -38,6 +51,10 @@ def login():
             }
         }
     }
+    
+    Response (429), with Retry-After: too many attempts from this IP or
+    for this email (see LOGIN_THROTTLE_*); refused before the customer is
+    looked up or the password hashed.
     """
     try:
          # ADD THIS DEBUG
@@ -53,6 +70,15 @@ def login():
                 'message': 'Request body is required'
             }), 400
         
+        retry_after = login_throttle.check(request.remote_addr, data.get('email'))
+        if retry_after:
+            response = jsonify({
+                'success': False,
+                'message': 'Too many login attempts. Please try again later.'
+            })
+            response.headers['Retry-After'] = str(math.ceil(retry_after))
+            return response, 429
+        
         login_request = LoginRequestDTO.from_dict(data)
         customer_service = CustomerServiceFactory.get_instance()
         response = customer_service.login(login_request)
@@ -62,6 +88,11 @@ def login():
         else:
             return jsonify(response.to_dict()), 401
             
+    except PasswordHashingError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -80,6 +111,9 @@ def refresh():
     Headers:
         Authorization: Bearer <refresh_token>
     
+    The new access token carries a fresh profile snapshot when
+    PROFILE_SNAPSHOT_CLAIMS_ENABLED is set.
+    
     Response (200):
     {
         "success": true,
@@ -88,13 +122,22 @@ def refresh():
     """
     try:
         current_user_id = get_jwt_identity()
-        new_access_token = create_access_token(identity=current_user_id)
+        customer_service = CustomerServiceFactory.get_instance()
+        new_access_token = create_access_token(
+            identity=current_user_id,
+            additional_claims=customer_service.get_snapshot_claims(int(current_user_id))
+        )
         
         return jsonify({
             'success': True,
             'access_token': new_access_token
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 404
     except Exception as e:
         return jsonify({
             'success': False,
@@ -109,10 +152,27 @@ def get_current_user():
     Get Current User Profile
     
     GET /api/v2/customers/me
+    GET /api/v2/customers/me?fields=id,full_name,email
+    GET /api/v2/customers/me?view=summary
     
     Headers:
         Authorization: Bearer <access_token>
     
+    Query Parameters:
+        fields   optional comma-separated subset of the profile fields;
+                 only the columns they need are read from the database
+        view     full (default) or summary: id, email, full_name,
+                 is_active and profile_version. With
+                 PROFILE_SNAPSHOT_CLAIMS_ENABLED the summary comes from the
+                 access token's profile snapshot while it is current, so
+                 it usually needs no database query; it has no validators
+                 (ETag / Last-Modified). Cannot be combined with fields.
+    
+    Conditional requests: the response carries ETag and Last-Modified
+    (derived from updated_at); send them back as If-None-Match /
+    If-Modified-Since to get an empty 304 when nothing changed. That check
+    costs one updated_at lookup (or none, from the customer cache).
+    
     Response (200):
     {
         "success": true,
@@ -125,20 +185,129 @@ def get_current_user():
         print(f"JWT Secret (first 20): {current_app.config.get('JWT_SECRET_KEY')[:20]}")
         
 
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
+        view = request.args.get('view', 'full')
+        if view not in PROFILE_VIEWS:
+            return jsonify({
+                'success': False,
+                'message': f"view must be one of: {', '.join(PROFILE_VIEWS)}"
+            }), 400
+        fields = PROFILE_FIELDSET.parse(request.args.get('fields'))
         customer_service = CustomerServiceFactory.get_instance()
-        profile = customer_service.get_profile(int(current_user_id))
+        
+        if view == 'summary':
+            if fields:
+                return jsonify({
+                    'success': False,
+                    'message': 'fields cannot be combined with view=summary'
+                }), 400
+            return jsonify({
+                'success': True,
+                'data': customer_service.get_profile_summary(current_user_id, get_jwt())
+            }), 200
+        
+        version = customer_service.get_profile_version(current_user_id)
+        etag = make_etag(current_user_id, version, variant=fields)
+        if is_not_modified(etag, version):
+            return not_modified(etag, version)
+        
+        if fields:
+            data = customer_service.get_profile_fields(current_user_id, fields)
+        else:
+            data = customer_service.get_profile(current_user_id)
+        
+        response = jsonify({
+            'success': True,
+            'data': data
+        })
+        return set_validators(response, etag, version), 200
+        
+    except InvalidFieldsError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 404
+    except SingleFlightTimeoutError:
+        return jsonify({
+            'success': False,
+            'message': 'Profile lookup timed out, please retry'
+        }), 503
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'An error occurred: {str(e)}'
+        }), 500
+
+
+@login_bp.route('/me', methods=['PUT'])
+@jwt_required()
+def update_current_user():
+    """
+    Update Current User Profile
+    
+    PUT /api/v2/customers/me
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        If-Match: "<ETag from GET /me>"   (optional)
+    
+    Request Body (any of):
+    {
+        "first_name": "John",
+        "last_name": "Doe",
+        "date_of_birth": "1990-01-31",
+        "address": "...",
+        "city": "...",
+        "state": "...",
+        "pincode": "..."
+    }
+    
+    With If-Match, the update is applied only if the profile has not
+    changed since that ETag was issued; otherwise 412 is returned and the
+    client should GET /me again.
+    
+    Response (200):
+    {
+        "success": true,
+        "message": "Profile updated successfully",
+        "data": { ... customer profile ... }
+    }
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True)
+        
+        if not isinstance(data, dict) or not data:
+            return jsonify({
+                'success': False,
+                'message': 'Request body is required'
+            }), 400
+        
+        expected_version = if_match_timestamp(current_user_id)
+        customer_service = CustomerServiceFactory.get_instance()
+        profile = customer_service.update_profile(current_user_id, data, expected_version=expected_version)
         
         return jsonify({
             'success': True,
-            'data': profile.to_dict()
+            'message': 'Profile updated successfully',
+            'data': profile
         }), 200
         
+    except (PreconditionFailedError, ConcurrentUpdateError):
+        return jsonify({
+            'success': False,
+            'message': 'Profile was modified since it was last read'
+        }), 412
     except ValueError as e:
         return jsonify({
             'success': False,
             'message': str(e)
-        }), 404
+        }), 404 if str(e) == 'Customer not found' else 400
     except Exception as e:
         return jsonify({
             'success': False,
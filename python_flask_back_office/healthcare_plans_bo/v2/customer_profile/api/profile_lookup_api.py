@@ -0,0 +1,106 @@
+"""
+Profile Lookup API
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/api/profile_lookup_api.py
+"""
+
+from flask import Blueprint, current_app, request, jsonify
+from v2.common.admin_auth import admin_key_required
+from v2.customer_profile.service import CustomerServiceFactory
+
+lookup_bp = Blueprint('profile_lookup_v2', __name__)
+
+
+def _parse_ids(raw_ids) -> list:
+    """Validate the requested IDs (list or comma-separated string)"""
+    if isinstance(raw_ids, str):
+        raw_ids = [value for value in raw_ids.split(',') if value.strip()]
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise ValueError('ids is required')
+    
+    max_ids = current_app.config.get('PROFILE_LOOKUP_MAX_IDS', 1000)
+    if len(raw_ids) > max_ids:
+        raise ValueError(f'At most {max_ids} ids per request')
+    
+    try:
+        customer_ids = [int(value) for value in raw_ids]
+    except (TypeError, ValueError):
+        raise ValueError('ids must be integers')
+    if any(customer_id < 1 for customer_id in customer_ids):
+        raise ValueError('ids must be positive')
+    return customer_ids
+
+
+def _lookup(raw_ids):
+    """Resolve IDs to profiles, preserving request order"""
+    try:
+        customer_ids = _parse_ids(raw_ids)
+        customer_service = CustomerServiceFactory.get_instance()
+        profiles = customer_service.get_profiles(customer_ids)
+        
+        return jsonify({
+            'success': True,
+            'data': [
+                {'id': customer_id, 'found': True, 'customer': profile}
+                if profile is not None else
+                {'id': customer_id, 'found': False}
+                for customer_id, profile in zip(customer_ids, profiles)
+            ]
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'An error occurred: {str(e)}'
+        }), 500
+
+
+@lookup_bp.route('', methods=['GET'])
+@admin_key_required
+def get_profiles():
+    """
+    Multi-get Customer Profiles
+    
+    GET /api/v2/customers?ids=3,1,99
+    
+    Headers:
+        X-Admin-Key: <ADMIN_API_KEY>
+    
+    Resolves up to PROFILE_LOOKUP_MAX_IDS IDs with one query per 500 IDs.
+    Results follow the request order (duplicates included); unknown IDs
+    are returned with "found": false.
+    
+    Response (200):
+    {
+        "success": true,
+        "data": [
+            {"id": 3, "found": true, "customer": { ... customer profile ... }},
+            {"id": 1, "found": true, "customer": { ... }},
+            {"id": 99, "found": false}
+        ]
+    }
+    """
+    return _lookup(request.args.get('ids', ''))
+
+
+@lookup_bp.route('/lookup', methods=['POST'])
+@admin_key_required
+def lookup_profiles():
+    """
+    Multi-get Customer Profiles (POST variant, for ID lists too long for a URL)
+    
+    POST /api/v2/customers/lookup
+    
+    Request Body:
+    {
+        "ids": [3, 1, 99]
+    }
+    
+    Response: same as GET /api/v2/customers?ids=...
+    """
+    data = request.get_json(silent=True)
+    return _lookup(data.get('ids') if isinstance(data, dict) else None)
@@ -3,9 +3,11 @@ Signup API
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/api/signup_api.py
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from v2.common.admin_auth import admin_key_required
+from v2.common.password_hashing import PasswordHashingError
 from v2.customer_profile.service import CustomerServiceFactory
-from v2.customer_profile.dto import SignupRequestDTO
+from v2.customer_profile.dto import SignupRequestDTO, SignupResponseDTO
 
 signup_bp = Blueprint('signup_v2', __name__)
 
@@ -52,8 +54,94 @@ def signup():
         else:
             return jsonify(response.to_dict()), 400
             
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except PasswordHashingError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'An error occurred: {str(e)}'
         }), 500
+
+
+@signup_bp.route('/batch', methods=['POST'])
+@admin_key_required
+def batch_signup():
+    """
+    Group Enrollment (batch signup)
+    
+    POST /api/v2/customers/batch
+    
+    Headers:
+        X-Admin-Key: <ADMIN_API_KEY>
+    
+    Request Body (up to BATCH_SIGNUP_MAX_ITEMS customers):
+    {
+        "customers": [
+            {"email": "...", "mobile_number": "...", "password": "...",
+             "first_name": "...", "last_name": "..."},
+            ...
+        ]
+    }
+    
+    Response (200, application/x-ndjson), one line per customer in
+    request order, streamed as each chunk is committed:
+    {"index": 0, "success": true, "message": "Account created successfully", "customer_id": 1, "email": "..."}
+    {"index": 1, "success": false, "message": "Email already registered"}
+    
+    If processing fails part-way, a last line {"success": false,
+    "message": ...} without an index is sent; customers reported before it
+    are registered, the remaining ones are not.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('customers') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'success': False,
+            'message': 'Request body must contain a non-empty "customers" list'
+        }), 400
+    
+    max_items = current_app.config.get('BATCH_SIGNUP_MAX_ITEMS', 1000)
+    if len(items) > max_items:
+        return jsonify({
+            'success': False,
+            'message': f'At most {max_items} customers per batch'
+        }), 413
+    
+    # A malformed item (e.g. a non-string field) fails on its own
+    signup_requests, positions, malformed = [], [], {}
+    for index, item in enumerate(items):
+        try:
+            signup_requests.append(SignupRequestDTO.from_dict(item if isinstance(item, dict) else {}))
+            positions.append(index)
+        except ValueError as e:
+            malformed[index] = SignupResponseDTO(success=False, message=str(e))
+    chunk_size = current_app.config.get('BATCH_SIGNUP_CHUNK_SIZE', 100)
+    customer_service = CustomerServiceFactory.get_instance()
+    
+    def line(index, result):
+        return current_app.json.dumps({'index': index, **result.to_dict()}) + '\n'
+    
+    def generate():
+        reported = 0
+        try:
+            for position, result in customer_service.batch_signup(signup_requests, chunk_size=chunk_size):
+                index = positions[position]
+                # Items before it that were not passed on are malformed ones
+                for skipped in range(reported, index):
+                    yield line(skipped, malformed[skipped])
+                yield line(index, result)
+                reported = index + 1
+            for skipped in range(reported, len(items)):
+                yield line(skipped, malformed[skipped])
+        except Exception as e:
+            yield current_app.json.dumps({'success': False, 'message': f'An error occurred: {str(e)}'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -2,7 +2,22 @@
 Customer Profile - DAO Module
 """
 
-from .customer_dao import CustomerDAO
+from .customer_dao import (
+    CustomerDAO,
+    DuplicateCustomerError,
+    ConcurrentUpdateError,
+    InvalidCursorError,
+    CustomerFilter,
+    CustomerPage
+)
 from .customer_dao_factory import CustomerDAOFactory
 
-__all__ = ['CustomerDAO', 'CustomerDAOFactory']
+__all__ = [
+    'CustomerDAO',
+    'DuplicateCustomerError',
+    'ConcurrentUpdateError',
+    'InvalidCursorError',
+    'CustomerFilter',
+    'CustomerPage',
+    'CustomerDAOFactory'
+]
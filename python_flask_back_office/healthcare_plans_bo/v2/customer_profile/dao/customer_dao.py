@@ -4,16 +4,52 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dao/c
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, List, Dict, Iterable, Iterator, Sequence, Set, Tuple
 from v2.customer_profile.model import Customer
 
 
+class DuplicateCustomerError(Exception):
+    """Raised when a write violates the unique email or mobile number constraint"""
+    
+    def __init__(self, field: str):
+        super().__init__(f'Duplicate customer {field}')
+        self.field = field
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when an update expected a version (updated_at) that is no longer current"""
+    pass
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
+
+
+@dataclass
+class CustomerFilter:
+    """Equality filters for customer listings (None = not filtered)"""
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+
+
+@dataclass
+class CustomerPage:
+    """One page of a keyset-paginated listing (Customers, or column tuples)"""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
 class CustomerDAO(ABC):
     """Abstract interface for Customer data access operations"""
     
     @abstractmethod
     def create(self, customer: Customer) -> Customer:
-        """Create a new customer"""
+        """Create a new customer (raises DuplicateCustomerError on email/mobile conflict)"""
         pass
     
     @abstractmethod
@@ -21,9 +57,32 @@ class CustomerDAO(ABC):
         """Find customer by ID"""
         pass
     
+    @abstractmethod
+    def find_columns_by_id(self, customer_id: int, columns: Sequence[str]) -> Optional[dict]:
+        """Load only the given columns of one customer, as a dict"""
+        pass
+    
+    @abstractmethod
+    def find_by_ids(self, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+        """Find many customers by ID; IDs that do not exist are absent from the result"""
+        pass
+    
     @abstractmethod
     def find_by_email(self, email: str) -> Optional[Customer]:
-        """Find customer by email"""
+        """Find customer by email (deferred columns are not loaded)"""
+        pass
+    
+    @abstractmethod
+    def find_credentials_by_email(self, email: str) -> Optional[Customer]:
+        """
+        Find customer by email for authentication: always the stored row
+        (password_hash, is_active), never a cached copy
+        """
+        pass
+    
+    @abstractmethod
+    def find_credentials_by_id(self, customer_id: int) -> Optional[Customer]:
+        """Find customer by ID for a password check: always the stored row, never a cached copy"""
         pass
     
     @abstractmethod
@@ -32,8 +91,32 @@ class CustomerDAO(ABC):
         pass
     
     @abstractmethod
-    def update(self, customer: Customer) -> Customer:
-        """Update existing customer"""
+    def bulk_create(self, rows: Sequence[dict]) -> List[int]:
+        """
+        Insert many customers (column dicts, password already hashed) in
+        one transaction and return their IDs in row order; all-or-nothing.
+        Raises DuplicateCustomerError if any row conflicts on email/mobile.
+        """
+        pass
+    
+    @abstractmethod
+    def find_existing_identifiers(self, emails: Iterable[str],
+                                  mobile_numbers: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Return the subsets of emails and mobile numbers already registered"""
+        pass
+    
+    @abstractmethod
+    def find_version(self, customer_id: int) -> Optional[datetime]:
+        """updated_at of one customer (None if it does not exist)"""
+        pass
+    
+    @abstractmethod
+    def update(self, customer: Customer, expected_updated_at: Optional[datetime] = None) -> Customer:
+        """
+        Update existing customer. With expected_updated_at, the update only
+        happens if the stored updated_at still equals it; otherwise
+        ConcurrentUpdateError is raised.
+        """
         pass
     
     @abstractmethod
@@ -46,6 +129,30 @@ class CustomerDAO(ABC):
         """Find all customers with pagination"""
         pass
     
+    @abstractmethod
+    def find_page(self, limit: int = 50, cursor: Optional[str] = None,
+                  filters: Optional[CustomerFilter] = None,
+                  columns: Optional[Sequence[str]] = None) -> CustomerPage:
+        """
+        Keyset-paginated listing ordered by (created_at, id).
+        
+        cursor is the opaque next_cursor of the previous page (None for the
+        first page); next_cursor is None on the last page.
+        With columns (which must include id and created_at), items are
+        tuples of those columns instead of Customer instances.
+        Raises InvalidCursorError for a malformed cursor.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_rows(self, columns: Sequence[str], filters: Optional[CustomerFilter] = None,
+                  batch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Stream the given columns of all matching customers as plain tuples,
+        ordered by (created_at, id), without building Customer instances.
+        """
+        pass
+    
     @abstractmethod
     def exists_by_email(self, email: str) -> bool:
         """Check if customer exists by email"""
@@ -55,3 +162,8 @@ class CustomerDAO(ABC):
     def exists_by_mobile(self, mobile_number: str) -> bool:
         """Check if customer exists by mobile number"""
         pass
+    
+    @abstractmethod
+    def update_last_logins(self, last_logins: Dict[int, datetime]) -> int:
+        """Bulk-update last_login for many customers"""
+        pass
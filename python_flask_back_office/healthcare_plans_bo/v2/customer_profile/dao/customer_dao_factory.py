@@ -3,8 +3,10 @@ Customer DAO Factory
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dao/customer_dao_factory.py
 """
 
+from flask import current_app, has_app_context
 from v2.customer_profile.dao.customer_dao import CustomerDAO
 from v2.customer_profile.dao.impl.customer_dao_impl import CustomerDAOImpl
+from v2.customer_profile.dao.impl.caching_customer_dao import CachingCustomerDAO
 
 
 class CustomerDAOFactory:
@@ -14,9 +16,18 @@ class CustomerDAOFactory:
     
     @classmethod
     def get_instance(cls) -> CustomerDAO:
-        """Get singleton instance of CustomerDAO"""
+        """Get singleton instance of CustomerDAO (cached if CUSTOMER_CACHE_ENABLED)"""
         if cls._instance is None:
-            cls._instance = CustomerDAOImpl()
+            dao: CustomerDAO = CustomerDAOImpl()
+            config = current_app.config if has_app_context() else {}
+            if config.get('CUSTOMER_CACHE_ENABLED'):
+                dao = CachingCustomerDAO(
+                    dao,
+                    max_size=config.get('CUSTOMER_CACHE_MAX_SIZE', 10000),
+                    ttl_seconds=config.get('CUSTOMER_CACHE_TTL_SECONDS', 30),
+                    negative_ttl_seconds=config.get('CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS', 5)
+                )
+            cls._instance = dao
         return cls._instance
     
     @classmethod
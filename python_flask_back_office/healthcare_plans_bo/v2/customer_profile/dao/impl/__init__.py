@@ -3,5 +3,6 @@ Customer Profile - DAO Implementation Module
 """
 
 from .customer_dao_impl import CustomerDAOImpl
+from .caching_customer_dao import CachingCustomerDAO
 
-__all__ = ['CustomerDAOImpl']
+__all__ = ['CustomerDAOImpl', 'CachingCustomerDAO']
@@ -0,0 +1,224 @@
+"""
+Caching Customer DAO (Decorator)
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dao/impl/caching_customer_dao.py
+"""
+
+from datetime import datetime
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence, Set, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from v2.common.ttl_cache import TTLCache, MISSING
+from v2.customer_profile.model import Customer
+from v2.customer_profile.dao.customer_dao import CustomerDAO, CustomerFilter, CustomerPage
+
+
+class CachingCustomerDAO(CustomerDAO):
+    """
+    Read-through cache in front of any CustomerDAO.
+
+    find_by_id / find_by_email results are cached as detached snapshots
+    (the column values the delegate loaded; deferred columns such as
+    address are only present for find_by_id, which undefers them), so
+    callers always get a fresh detached Customer
+    that is not bound to another request's session. Its values are loaded
+    as committed state, so changes made by the caller are tracked and
+    CustomerDAO.update writes only those columns. Misses are cached as
+    negative entries with their own TTL. create/update/delete invalidate the
+    affected entries after the delegate has committed.
+
+    The cache is per process: other gunicorn workers see a change once
+    their entry expires, so keep ttl_seconds short. Authentication never
+    reads it (find_credentials_by_email / find_credentials_by_id go to the
+    delegate), so a password change or deactivation on another worker
+    takes effect at once.
+    """
+
+    def __init__(self, delegate: CustomerDAO, max_size: int = 10000,
+                 ttl_seconds: float = 30.0, negative_ttl_seconds: float = 5.0):
+        """Wrap a delegate DAO"""
+        self._delegate = delegate
+        self._negative_ttl = negative_ttl_seconds
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def create(self, customer: Customer) -> Customer:
+        """Create a new customer and drop any negative entry for it"""
+        created = self._delegate.create(customer)
+        self._invalidate(created.id, created.email)
+        return created
+
+    def bulk_create(self, rows: Sequence[dict]) -> List[int]:
+        """Insert many customers and drop any negative entries for them"""
+        ids = self._delegate.bulk_create(rows)
+        self._cache.delete(
+            *(('email', row['email'].lower()) for row in rows),
+            *(('id', customer_id) for customer_id in ids)
+        )
+        return ids
+    
+    def find_existing_identifiers(self, emails: Iterable[str],
+                                  mobile_numbers: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Look up registered emails and mobile numbers (not cached)"""
+        return self._delegate.find_existing_identifiers(emails, mobile_numbers)
+    
+    def find_by_id(self, customer_id: int) -> Optional[Customer]:
+        """Find customer by ID (cached)"""
+        return self._read_through(('id', customer_id), self._delegate.find_by_id, customer_id)
+
+    def find_columns_by_id(self, customer_id: int, columns: Sequence[str]) -> Optional[dict]:
+        """Load some columns of one customer, from a cached full snapshot when there is one"""
+        snapshot = self._cache.peek(('id', customer_id))
+        if snapshot is None:
+            return None
+        if snapshot is not MISSING and all(column in snapshot for column in columns):
+            return {column: snapshot[column] for column in columns}
+        return self._delegate.find_columns_by_id(customer_id, columns)
+    
+    def find_by_ids(self, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+        """Find many customers by ID; only the IDs not cached go to the delegate"""
+        found = {}
+        missing = []
+        for customer_id in dict.fromkeys(customer_ids):
+            snapshot = self._cache.get(('id', customer_id))
+            if snapshot is MISSING:
+                missing.append(customer_id)
+            elif snapshot is not None:
+                found[customer_id] = self._restore(snapshot)
+        if not missing:
+            return found
+        
+        generation = self._cache.generation
+        loaded = self._delegate.find_by_ids(missing)
+        for customer_id in missing:
+            customer = loaded.get(customer_id)
+            if customer is None:
+                self._cache.set(('id', customer_id), None,
+                                ttl_seconds=self._negative_ttl, generation=generation)
+            else:
+                self._cache.set(('id', customer_id), self._snapshot(customer), generation=generation)
+                found[customer_id] = customer
+        return found
+    
+    def find_by_email(self, email: str) -> Optional[Customer]:
+        """Find customer by email (cached)"""
+        email = email.lower()
+        return self._read_through(('email', email), self._delegate.find_by_email, email)
+
+    def find_credentials_by_email(self, email: str) -> Optional[Customer]:
+        """Find customer by email for authentication (never cached)"""
+        return self._delegate.find_credentials_by_email(email)
+    
+    def find_credentials_by_id(self, customer_id: int) -> Optional[Customer]:
+        """Find customer by ID for a password check (never cached)"""
+        return self._delegate.find_credentials_by_id(customer_id)
+
+    def find_by_mobile(self, mobile_number: str) -> Optional[Customer]:
+        """Find customer by mobile number"""
+        return self._delegate.find_by_mobile(mobile_number)
+
+    def find_version(self, customer_id: int) -> Optional[datetime]:
+        """updated_at of one customer, from a cached snapshot when there is one"""
+        snapshot = self._cache.peek(('id', customer_id))
+        if snapshot is None:
+            return None
+        if snapshot is not MISSING and 'updated_at' in snapshot:
+            return snapshot['updated_at']
+        return self._delegate.find_version(customer_id)
+    
+    def update(self, customer: Customer, expected_updated_at: Optional[datetime] = None) -> Customer:
+        """Update existing customer and invalidate its entries (also when the update is refused)"""
+        try:
+            updated = self._delegate.update(customer, expected_updated_at)
+        finally:
+            self._invalidate(customer.id, customer.email)
+        return updated
+
+    def delete(self, customer_id: int) -> bool:
+        """Delete customer by ID and invalidate its entries"""
+        deleted = self._delegate.delete(customer_id)
+        self._invalidate(customer_id)
+        return deleted
+
+    def find_all(self, page: int = 1, per_page: int = 10) -> List[Customer]:
+        """Find all customers with pagination"""
+        return self._delegate.find_all(page=page, per_page=per_page)
+
+    def find_page(self, limit: int = 50, cursor: Optional[str] = None,
+                  filters: Optional[CustomerFilter] = None,
+                  columns: Optional[Sequence[str]] = None) -> CustomerPage:
+        """Keyset-paginated listing (not cached)"""
+        return self._delegate.find_page(limit=limit, cursor=cursor, filters=filters, columns=columns)
+    
+    def iter_rows(self, columns: Sequence[str], filters: Optional[CustomerFilter] = None,
+                  batch_size: int = 1000) -> Iterator[tuple]:
+        """Stream column tuples (not cached)"""
+        return self._delegate.iter_rows(columns, filters=filters, batch_size=batch_size)
+    
+    def exists_by_email(self, email: str) -> bool:
+        """Check if customer exists by email"""
+        return self._delegate.exists_by_email(email)
+
+    def exists_by_mobile(self, mobile_number: str) -> bool:
+        """Check if customer exists by mobile number"""
+        return self._delegate.exists_by_mobile(mobile_number)
+
+    def update_last_logins(self, last_logins: Dict[int, datetime]) -> int:
+        """
+        Bulk-update last_login.
+        
+        Cached entries are kept: last_login already lags by the write-behind
+        interval and is not part of any profile response.
+        """
+        return self._delegate.update_last_logins(last_logins)
+
+    def stats(self) -> dict:
+        """Cache hit/miss/eviction counters"""
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._cache.clear()
+
+    def _read_through(self, key, loader, *args) -> Optional[Customer]:
+        """Serve from cache, or load from the delegate and cache the snapshot"""
+        snapshot = self._cache.get(key)
+        if snapshot is not MISSING:
+            return self._restore(snapshot)
+
+        generation = self._cache.generation
+        customer = loader(*args)
+        if customer is None:
+            self._cache.set(key, None, ttl_seconds=self._negative_ttl, generation=generation)
+            return None
+
+        self._cache.set(key, self._snapshot(customer), generation=generation)
+        return customer
+
+    def _invalidate(self, customer_id: int, *emails: str) -> None:
+        """Drop the ID entry and every email entry that may point at it"""
+        keys = [('id', customer_id)] + [('email', email.lower()) for email in emails if email]
+        cached = self._cache.peek(('id', customer_id))
+        if cached is not MISSING and cached is not None:
+            keys.append(('email', cached['email']))
+        self._cache.delete(*keys)
+
+    @staticmethod
+    def _snapshot(customer: Customer) -> dict:
+        """Copy the loaded column values (never triggers a lazy load)"""
+        state = inspect(customer)
+        return {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+
+    @staticmethod
+    def _restore(snapshot: Optional[dict]) -> Optional[Customer]:
+        """Build a detached Customer whose committed state is the snapshot"""
+        if snapshot is None:
+            return None
+        customer = inspect(Customer).class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(customer, key, value)
+        make_transient_to_detached(customer)
+        return customer
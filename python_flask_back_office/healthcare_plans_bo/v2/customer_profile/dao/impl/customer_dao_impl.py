@@ -3,48 +3,236 @@ Customer DAO Implementation
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dao/impl/customer_dao_impl.py
 """
 
-from typing import Optional, List
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence, Set, Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from v2.extensions_v2 import db
 from v2.customer_profile.model import Customer
-from v2.customer_profile.dao.customer_dao import CustomerDAO
+from v2.customer_profile.dao.customer_dao import (
+    CustomerDAO,
+    DuplicateCustomerError,
+    ConcurrentUpdateError,
+    InvalidCursorError,
+    CustomerFilter,
+    CustomerPage
+)
+
+# Bound parameters per IN (...) list; stays below SQLite's historical 999 limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Unique-constraint names as reported by SQLite, MySQL and PostgreSQL
+_DUPLICATE_FIELD_PATTERNS = [
+    ('mobile_number', re.compile(r'customers\.mobile_number|ix_customers_mobile_number|\(mobile_number\)')),
+    ('email', re.compile(r'customers\.email|ix_customers_email|\(email\)'))
+]
+
+
+def backfill_created_at() -> int:
+    """
+    Give customers without created_at one (updated_at, else now).
+    
+    Databases created before the column was NOT NULL can hold such rows,
+    and find_page cannot build a cursor for them. Returns the number of
+    rows fixed; a no-op index lookup once there are none.
+    """
+    table = Customer.__table__
+    result = db.session.execute(
+        update(table)
+        .where(table.c.created_at.is_(None))
+        .values(created_at=func.coalesce(table.c.updated_at, datetime.utcnow()),
+                updated_at=table.c.updated_at)
+    )
+    db.session.commit()
+    return result.rowcount
 
 
 class CustomerDAOImpl(CustomerDAO):
-    """SQLAlchemy implementation of Customer DAO"""
+    """
+    SQLAlchemy implementation of Customer DAO
+    
+    Each write is a single statement. All column defaults (created_at,
+    updated_at, is_active, ...) are generated client-side and the session
+    does not expire objects on commit (see extensions_v2), so nothing has to
+    be read back after a commit: the INSERT gets its primary key through
+    SQLAlchemy's implicit RETURNING id where the dialect supports it
+    (SQLite >= 3.35, PostgreSQL) and cursor.lastrowid on MySQL, and an
+    UPDATE only sends the changed columns (plus the version check with
+    If-Match). Budgets are locked in by tests/v2/test_customer_dao_statements.py.
+    """
     
     def create(self, customer: Customer) -> Customer:
-        """Create a new customer"""
+        """
+        Create a new customer with a single INSERT.
+        
+        Uniqueness of email and mobile number is enforced by the database;
+        a violation is reported as DuplicateCustomerError.
+        """
         db.session.add(customer)
-        db.session.commit()
-        db.session.refresh(customer)
+        try:
+            db.session.commit()
+        except IntegrityError as error:
+            db.session.rollback()
+            field = self._duplicate_field(error)
+            if field is None:
+                raise
+            raise DuplicateCustomerError(field) from error
+        
+        # Columns the INSERT left out (no value, no default) are NULL; say
+        # so instead of letting a deferred one (address) load on access
+        state = inspect(customer)
+        for attr in state.mapper.column_attrs:
+            if attr.key not in state.dict and attr.columns[0].server_default is None:
+                set_committed_value(customer, attr.key, None)
         return customer
     
+    def bulk_create(self, rows: Sequence[dict]) -> List[int]:
+        """
+        Insert many customers with one executemany INSERT and one commit.
+        
+        Column defaults (created_at, is_active, ...) are Core defaults, so
+        they apply here too; no Customer instances are built. The new IDs
+        are read back with one SELECT by email inside the same transaction
+        (an ordered executemany RETURNING would degrade to one INSERT per
+        row without a sentinel column, and MySQL has no RETURNING at all).
+        """
+        if not rows:
+            return []
+        rows = list(rows)
+        try:
+            db.session.execute(insert(Customer.__table__), rows)
+            ids = self._ids_by_email([row['email'] for row in rows])
+            db.session.commit()
+        except IntegrityError as error:
+            db.session.rollback()
+            field = self._duplicate_field(error)
+            if field is None:
+                raise
+            raise DuplicateCustomerError(field) from error
+        return ids
+    
+    def find_existing_identifiers(self, emails: Iterable[str],
+                                  mobile_numbers: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Look up registered emails and mobile numbers with chunked IN queries"""
+        existing = []
+        for column, values in ((Customer.email, [email.lower() for email in emails]),
+                               (Customer.mobile_number, list(mobile_numbers))):
+            found = set()
+            for start in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+                chunk = values[start:start + IN_CLAUSE_CHUNK_SIZE]
+                found.update(db.session.scalars(select(column).where(column.in_(chunk))))
+            existing.append(found)
+        return existing[0], existing[1]
+    
     def find_by_id(self, customer_id: int) -> Optional[Customer]:
-        """Find customer by ID"""
-        return db.session.get(Customer, customer_id)
+        """Find customer by ID (full profile, including deferred columns)"""
+        return db.session.get(Customer, customer_id, options=[undefer(Customer.address)])
+    
+    def find_columns_by_id(self, customer_id: int, columns: Sequence[str]) -> Optional[dict]:
+        """Load only the given columns of one customer with a column SELECT"""
+        statement = select(*(getattr(Customer, column) for column in columns)).where(Customer.id == customer_id)
+        row = db.session.execute(statement).mappings().first()
+        return dict(row) if row is not None else None
+    
+    def find_by_ids(self, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+        """Find many customers by ID with one IN query per IN_CLAUSE_CHUNK_SIZE IDs"""
+        customer_ids = list(dict.fromkeys(customer_ids))
+        found = {}
+        for start in range(0, len(customer_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = customer_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            found.update(
+                (customer.id, customer)
+                for customer in db.session.scalars(
+                    select(Customer).options(undefer(Customer.address)).where(Customer.id.in_(chunk))
+                )
+            )
+        return found
     
     def find_by_email(self, email: str) -> Optional[Customer]:
         """Find customer by email"""
         return Customer.query.filter_by(email=email.lower()).first()
     
+    def find_credentials_by_email(self, email: str) -> Optional[Customer]:
+        """Find customer by email for authentication"""
+        return self.find_by_email(email)
+    
+    def find_credentials_by_id(self, customer_id: int) -> Optional[Customer]:
+        """Find customer by ID for a password check (deferred columns are not loaded)"""
+        return db.session.get(Customer, customer_id)
+    
     def find_by_mobile(self, mobile_number: str) -> Optional[Customer]:
         """Find customer by mobile number"""
         return Customer.query.filter_by(mobile_number=mobile_number).first()
     
-    def update(self, customer: Customer) -> Customer:
-        """Update existing customer"""
+    def find_version(self, customer_id: int) -> Optional[datetime]:
+        """updated_at of one customer, via a single-column SELECT"""
+        return db.session.scalar(select(Customer.updated_at).where(Customer.id == customer_id))
+    
+    def update(self, customer: Customer, expected_updated_at: Optional[datetime] = None) -> Customer:
+        """
+        Update existing customer with a single UPDATE of the changed columns.
+        
+        With expected_updated_at, the version check is part of that UPDATE
+        (compare-and-set, see _update_if_unchanged).
+        """
+        if expected_updated_at is not None:
+            return self._update_if_unchanged(customer, expected_updated_at)
+        
+        state = inspect(customer)
+        if state.detached:
+            # Detached snapshot (e.g. served by CachingCustomerDAO): re-attach
+            # without a SELECT; its change history is kept, so the flush
+            # still writes only the modified columns.
+            if state.identity_key in db.session.identity_map:
+                customer = db.session.merge(customer)
+            else:
+                db.session.add(customer)
+        db.session.commit()
+        return customer
+    
+    def _update_if_unchanged(self, customer: Customer, expected_updated_at: datetime) -> Customer:
+        """
+        UPDATE of the changed columns WHERE id = ? AND updated_at = ?; no
+        matching row means someone else changed the customer since that
+        version. The written values become the committed state of customer
+        (attached or detached), so the commit has nothing left to flush.
+        """
+        state = inspect(customer)
+        changes = {
+            attr.key: state.attrs[attr.key].history.added[0]
+            for attr in state.mapper.column_attrs
+            if state.attrs[attr.key].history.added
+        }
+        changes['updated_at'] = datetime.utcnow()
+        
+        table = Customer.__table__
+        # No autoflush: flushing the pending changes first would bump
+        # updated_at and the WHERE clause could never match.
+        with db.session.no_autoflush:
+            result = db.session.execute(
+                update(table)
+                .where(table.c.id == customer.id, table.c.updated_at == expected_updated_at)
+                .values({table.c[key]: value for key, value in changes.items()})
+            )
+        if result.rowcount == 0:
+            db.session.rollback()
+            raise ConcurrentUpdateError('Customer was modified by another request')
+        
+        for key, value in changes.items():
+            set_committed_value(customer, key, value)
         db.session.commit()
-        db.session.refresh(customer)
         return customer
     
     def delete(self, customer_id: int) -> bool:
-        """Delete customer by ID"""
-        customer = self.find_by_id(customer_id)
-        if customer:
-            db.session.delete(customer)
-            db.session.commit()
-            return True
-        return False
+        """Delete customer by ID with a single DELETE"""
+        result = db.session.execute(delete(Customer).where(Customer.id == customer_id))
+        db.session.commit()
+        return result.rowcount > 0
     
     def find_all(self, page: int = 1, per_page: int = 10) -> List[Customer]:
         """Find all customers with pagination"""
@@ -55,6 +243,71 @@ class CustomerDAOImpl(CustomerDAO):
         )
         return pagination.items
     
+    def find_page(self, limit: int = 50, cursor: Optional[str] = None,
+                  filters: Optional[CustomerFilter] = None,
+                  columns: Optional[Sequence[str]] = None) -> CustomerPage:
+        """
+        Keyset-paginated listing ordered by (created_at, id).
+        
+        Seeks past the last row of the previous page instead of using
+        OFFSET, and fetches limit + 1 rows to detect the last page instead of
+        running COUNT(*), so every page costs one index range scan on the
+        matching ix_customers_*_created_at_id index. With columns, only
+        those are selected and no Customer instances are built.
+        """
+        if columns:
+            statement = select(*(getattr(Customer, column) for column in columns))
+        else:
+            statement = select(Customer).options(undefer(Customer.address))
+        statement = self._apply_filters(statement, filters)
+        
+        if cursor:
+            created_at, customer_id = self._decode_cursor(cursor)
+            # Expanded form of (created_at, id) > (:created_at, :id); row
+            # value comparisons are not used as index ranges by every backend
+            statement = statement.where(or_(
+                Customer.created_at > created_at,
+                and_(Customer.created_at == created_at, Customer.id > customer_id)
+            ))
+        
+        statement = statement.order_by(Customer.created_at, Customer.id).limit(limit + 1)
+        if columns:
+            items = db.session.execute(statement).all()
+        else:
+            items = list(db.session.scalars(statement))
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            if columns:
+                last = dict(zip(columns, last))
+                next_cursor = self._encode_cursor(last['created_at'], last['id'])
+            else:
+                next_cursor = self._encode_cursor(last.created_at, last.id)
+        return CustomerPage(items=items, next_cursor=next_cursor)
+    
+    def iter_rows(self, columns: Sequence[str], filters: Optional[CustomerFilter] = None,
+                  batch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Stream column tuples with one query.
+        
+        yield_per turns on stream_results, so the driver uses a server-side
+        cursor (PyMySQL SSCursor, psycopg named cursor) and only batch_size
+        rows are buffered at a time; no ORM identity map is involved since
+        only columns are selected.
+        """
+        statement = self._apply_filters(
+            select(*(getattr(Customer, column) for column in columns)), filters
+        ).order_by(Customer.created_at, Customer.id)
+        
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for row in result:
+                yield tuple(row)
+        finally:
+            result.close()
+    
     def exists_by_email(self, email: str) -> bool:
         """Check if customer exists by email"""
         return Customer.query.filter_by(email=email.lower()).first() is not None
@@ -62,3 +315,70 @@ class CustomerDAOImpl(CustomerDAO):
     def exists_by_mobile(self, mobile_number: str) -> bool:
         """Check if customer exists by mobile number"""
         return Customer.query.filter_by(mobile_number=mobile_number).first() is not None
+    
+    def update_last_logins(self, last_logins: Dict[int, datetime]) -> int:
+        """
+        Bulk-update last_login with one executemany UPDATE.
+        
+        updated_at is left untouched: a login is not a profile change.
+        """
+        if not last_logins:
+            return 0
+        table = Customer.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(last_login=bindparam('b_last_login'), updated_at=table.c.updated_at)
+        )
+        db.session.execute(statement, [
+            {'b_id': customer_id, 'b_last_login': logged_in_at}
+            for customer_id, logged_in_at in last_logins.items()
+        ])
+        db.session.commit()
+        return len(last_logins)
+    
+    @staticmethod
+    def _ids_by_email(emails: List[str]) -> List[int]:
+        """IDs of just-inserted customers, in the order of emails"""
+        found = {}
+        for start in range(0, len(emails), IN_CLAUSE_CHUNK_SIZE):
+            chunk = emails[start:start + IN_CLAUSE_CHUNK_SIZE]
+            found.update(db.session.execute(
+                select(Customer.email, Customer.id).where(Customer.email.in_(chunk))
+            ).all())
+        return [found[email] for email in emails]
+    
+    @staticmethod
+    def _apply_filters(statement, filters: Optional[CustomerFilter]):
+        """Add the equality filters that are set"""
+        filters = filters or CustomerFilter()
+        for column in ('is_active', 'is_verified', 'city', 'state'):
+            value = getattr(filters, column)
+            if value is not None:
+                statement = statement.where(getattr(Customer, column) == value)
+        return statement
+    
+    @staticmethod
+    def _encode_cursor(created_at: datetime, customer_id: int) -> str:
+        """Opaque cursor for the position after this customer"""
+        payload = json.dumps([created_at.isoformat(), customer_id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Inverse of _encode_cursor"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, customer_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(customer_id)
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError('Invalid cursor') from e
+    
+    @staticmethod
+    def _duplicate_field(error: IntegrityError) -> Optional[str]:
+        """Map a unique-constraint violation to the offending column"""
+        message = str(error.orig)
+        for field, pattern in _DUPLICATE_FIELD_PATTERNS:
+            if pattern.search(message):
+                return field
+        return None
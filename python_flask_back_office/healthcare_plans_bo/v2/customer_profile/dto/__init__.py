@@ -4,12 +4,24 @@ Customer Profile - DTO Module
 
 from .signup_dto import SignupRequestDTO, SignupResponseDTO
 from .login_dto import LoginRequestDTO, LoginResponseDTO
-from .customer_response_dto import CustomerResponseDTO
+from .customer_response_dto import CustomerResponseDTO, PROFILE_FIELDSET
+from .profile_snapshot_dto import ProfileSnapshotDTO, SNAPSHOT_CLAIM
+from .customer_list_dto import (
+    CustomerListRequestDTO,
+    CustomerListResponseDTO,
+    CustomerExportRequestDTO
+)
 
 __all__ = [
     'SignupRequestDTO',
     'SignupResponseDTO',
     'LoginRequestDTO',
     'LoginResponseDTO',
-    'CustomerResponseDTO'
+    'CustomerResponseDTO',
+    'PROFILE_FIELDSET',
+    'ProfileSnapshotDTO',
+    'SNAPSHOT_CLAIM',
+    'CustomerListRequestDTO',
+    'CustomerListResponseDTO',
+    'CustomerExportRequestDTO'
 ]
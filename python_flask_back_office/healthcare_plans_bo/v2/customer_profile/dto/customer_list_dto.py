@@ -0,0 +1,107 @@
+"""
+Customer Listing and Export DTOs (Request/Response)
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dto/customer_list_dto.py
+"""
+
+from dataclasses import field
+from typing import List, Optional
+from v2.common.dto_codegen import dto_class
+from .customer_response_dto import CustomerResponseDTO
+
+_TRUE_VALUES = ('true', '1', 'yes')
+_FALSE_VALUES = ('false', '0', 'no')
+
+
+def _parse_filter_args(args) -> dict:
+    """The is_active/is_verified/city/state query filters (and error) as DTO fields"""
+    values = {
+        'city': (args.get('city') or '').strip() or None,
+        'state': (args.get('state') or '').strip() or None
+    }
+    for name in ('is_active', 'is_verified'):
+        raw = args.get(name)
+        if raw is None or raw == '':
+            continue
+        raw = raw.strip().lower()
+        if raw in _TRUE_VALUES:
+            values[name] = True
+        elif raw in _FALSE_VALUES:
+            values[name] = False
+        else:
+            values['error'] = f'{name} must be true or false'
+    return values
+
+
+@dto_class
+class CustomerListRequestDTO:
+    """DTO for the back-office customer listing (query string)"""
+    limit: int = 50
+    cursor: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    error: Optional[str] = None
+    
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 500
+    
+    @classmethod
+    def from_args(cls, args) -> 'CustomerListRequestDTO':
+        """Create DTO from request query arguments"""
+        values = {'cursor': args.get('cursor') or None}
+        try:
+            values['limit'] = int(args.get('limit', cls.DEFAULT_LIMIT))
+        except ValueError:
+            values['error'] = 'limit must be an integer'
+        values.update(_parse_filter_args(args))
+        return cls(**values)
+    
+    def validate(self) -> tuple[bool, Optional[str]]:
+        """Validate listing parameters"""
+        if self.error:
+            return False, self.error
+        if not 1 <= self.limit <= self.MAX_LIMIT:
+            return False, f'limit must be between 1 and {self.MAX_LIMIT}'
+        return True, None
+
+
+@dto_class
+class CustomerListResponseDTO:
+    """DTO for one page of the customer listing"""
+    items: List[CustomerResponseDTO] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON response (items are serialized as DTOs)"""
+        return {
+            'items': self.items,
+            'next_cursor': self.next_cursor,
+            'has_more': self.next_cursor is not None
+        }
+
+
+@dto_class
+class CustomerExportRequestDTO:
+    """DTO for the back-office customer export (query string or CLI)"""
+    format: str = 'ndjson'
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    error: Optional[str] = None
+    
+    FORMATS = ('ndjson', 'csv')
+    
+    @classmethod
+    def from_args(cls, args) -> 'CustomerExportRequestDTO':
+        """Create DTO from request query arguments"""
+        return cls(format=(args.get('format') or 'ndjson').strip().lower(), **_parse_filter_args(args))
+    
+    def validate(self) -> tuple[bool, Optional[str]]:
+        """Validate export parameters"""
+        if self.error:
+            return False, self.error
+        if self.format not in self.FORMATS:
+            return False, f"format must be one of: {', '.join(self.FORMATS)}"
+        return True, None
@@ -3,14 +3,32 @@ Customer Response DTO
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dto/customer_response_dto.py
 """
 
-from dataclasses import dataclass
+from dataclasses import fields
+from operator import attrgetter
 from typing import Optional
 from datetime import datetime, date
+from v2.common.dto_codegen import dto_class
+from v2.common.sparse_fields import FieldSet
 
 
-@dataclass
+def _full_name(first_name: str, last_name: str) -> str:
+    return f"{first_name} {last_name}"
+
+
+@dto_class(
+    to_dict=True,
+    columns=('id', 'email', 'mobile_number', 'first_name', 'last_name', 'date_of_birth',
+             'address', 'city', 'state', 'pincode', 'is_active', 'is_verified', 'created_at'),
+    derived={'full_name': (('first_name', 'last_name'), _full_name)}
+)
 class CustomerResponseDTO:
-    """DTO for customer profile response"""
+    """
+    DTO for customer profile response
+    
+    Generated: to_dict(), COLUMNS (the customers columns it is built from)
+    and from_row(row) for a row of COLUMNS values, e.g. from
+    select(*COLUMNS), without going through a Customer instance.
+    """
     id: int
     email: str
     mobile_number: str
@@ -28,39 +46,18 @@ class CustomerResponseDTO:
     
     @classmethod
     def from_model(cls, customer) -> 'CustomerResponseDTO':
-        """Create DTO from Customer model"""
-        return cls(
-            id=customer.id,
-            email=customer.email,
-            mobile_number=customer.mobile_number,
-            first_name=customer.first_name,
-            last_name=customer.last_name,
-            full_name=customer.full_name,
-            date_of_birth=customer.date_of_birth,
-            address=customer.address,
-            city=customer.city,
-            state=customer.state,
-            pincode=customer.pincode,
-            is_active=customer.is_active,
-            is_verified=customer.is_verified,
-            created_at=customer.created_at
-        )
-    
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON response"""
-        return {
-            'id': self.id,
-            'email': self.email,
-            'mobile_number': self.mobile_number,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'full_name': self.full_name,
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
-            'address': self.address,
-            'city': self.city,
-            'state': self.state,
-            'pincode': self.pincode,
-            'is_active': self.is_active,
-            'is_verified': self.is_verified,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        """Create DTO from Customer model (one attrgetter call for all columns)"""
+        return cls.from_row(_read_columns(customer))
+
+
+_read_columns = attrgetter(*CustomerResponseDTO.COLUMNS)
+
+
+# Allowlist for ?fields= (sparse profile responses)
+PROFILE_FIELDSET = FieldSet(
+    fields=[field.name for field in fields(CustomerResponseDTO)],
+    derived={
+        'full_name': (('first_name', 'last_name'), lambda row: _full_name(row['first_name'], row['last_name']))
+    },
+    temporal=('date_of_birth', 'created_at')
+)
@@ -3,11 +3,11 @@ Login DTOs (Request/Response)
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dto/login_dto.py
 """
 
-from dataclasses import dataclass
 from typing import Optional
+from v2.common.dto_codegen import dto_class
 
 
-@dataclass
+@dto_class
 class LoginRequestDTO:
     """DTO for customer login request"""
     email: str
@@ -30,7 +30,7 @@ class LoginRequestDTO:
         return True, None
 
 
-@dataclass
+@dto_class
 class LoginResponseDTO:
     """DTO for customer login response"""
     success: bool
@@ -0,0 +1,67 @@
+"""
+Profile Snapshot DTO
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dto/profile_snapshot_dto.py
+"""
+
+from operator import attrgetter
+from typing import Optional
+from v2.common.dto_codegen import dto_class
+from v2.customer_profile.dto.customer_response_dto import _full_name
+
+# Access token claim holding the snapshot
+SNAPSHOT_CLAIM = 'prf'
+
+
+@dto_class(
+    to_dict=True,
+    columns=('id', 'email', 'first_name', 'last_name', 'is_active', 'profile_version'),
+    derived={'full_name': (('first_name', 'last_name'), _full_name)}
+)
+class ProfileSnapshotDTO:
+    """
+    Profile summary (GET /me?view=summary), small enough to travel in the
+    access token.
+    
+    to_claims() / from_claims() convert to and from the compact claim
+    {"prf": {"v": profile_version, "e": email, "n": full_name, "a": is_active}};
+    the id is the token subject.
+    """
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    profile_version: int
+    
+    @classmethod
+    def from_model(cls, customer) -> 'ProfileSnapshotDTO':
+        """Create DTO from Customer model"""
+        return cls.from_row(_read_columns(customer))
+    
+    def to_claims(self) -> dict:
+        """Additional claims for create_access_token()"""
+        return {SNAPSHOT_CLAIM: {
+            'v': self.profile_version,
+            'e': self.email,
+            'n': self.full_name,
+            'a': self.is_active
+        }}
+    
+    @classmethod
+    def from_claims(cls, customer_id: int, claims: dict) -> Optional['ProfileSnapshotDTO']:
+        """Snapshot embedded in verified claims, or None if the token has none"""
+        snapshot = claims.get(SNAPSHOT_CLAIM)
+        if not isinstance(snapshot, dict):
+            return None
+        try:
+            return cls(
+                id=customer_id,
+                email=snapshot['e'],
+                full_name=snapshot['n'],
+                is_active=snapshot['a'],
+                profile_version=snapshot['v']
+            )
+        except KeyError:
+            return None
+
+
+_read_columns = attrgetter(*ProfileSnapshotDTO.COLUMNS)
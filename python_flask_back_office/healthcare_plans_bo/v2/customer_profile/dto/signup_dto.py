@@ -3,11 +3,11 @@ Signup DTOs (Request/Response)
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/dto/signup_dto.py
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Sequence
+from v2.common.dto_codegen import dto_class
 
 
-@dataclass
+@dto_class
 class SignupRequestDTO:
     """DTO for customer signup request"""
     email: str
@@ -18,7 +18,10 @@ class SignupRequestDTO:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'SignupRequestDTO':
-        """Create DTO from dictionary"""
+        """Create DTO from dictionary; ValueError if a field is not a string"""
+        for field in ('email', 'mobile_number', 'password', 'first_name', 'last_name'):
+            if not isinstance(data.get(field, ''), str):
+                raise ValueError(f'{field} must be a string')
         return cls(
             email=data.get('email', '').strip().lower(),
             mobile_number=data.get('mobile_number', '').strip(),
@@ -29,20 +32,24 @@ class SignupRequestDTO:
     
     def validate(self) -> tuple[bool, Optional[str]]:
         """Validate signup data"""
-        if not self.email or '@' not in self.email:
-            return False, 'Valid email is required'
-        if not self.mobile_number or len(self.mobile_number) < 10:
-            return False, 'Valid mobile number is required (minimum 10 digits)'
-        if not self.password or len(self.password) < 8:
-            return False, 'Password must be at least 8 characters'
-        if not self.first_name:
-            return False, 'First name is required'
-        if not self.last_name:
-            return False, 'Last name is required'
-        return True, None
+        error_message = self.validate_many((self,))[0]
+        return error_message is None, error_message
+    
+    @staticmethod
+    def validate_many(requests: Sequence['SignupRequestDTO']) -> List[Optional[str]]:
+        """Validate a batch of requests; the error message (or None) per request"""
+        return [
+            'Valid email is required' if '@' not in request.email else
+            'Valid mobile number is required (minimum 10 digits)' if len(request.mobile_number) < 10 else
+            'Password must be at least 8 characters' if len(request.password) < 8 else
+            'First name is required' if not request.first_name else
+            'Last name is required' if not request.last_name else
+            None
+            for request in requests
+        ]
 
 
-@dataclass
+@dto_class
 class SignupResponseDTO:
     """DTO for customer signup response"""
     success: bool
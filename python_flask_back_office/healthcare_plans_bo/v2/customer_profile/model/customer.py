@@ -4,14 +4,22 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/model
 """
 
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from v2.extensions_v2 import db
+from sqlalchemy.orm import deferred
+from v2.extensions_v2 import db, hash_executor
 
 
 class Customer(db.Model):
     """Customer entity for authentication and profile"""
     
     __tablename__ = 'customers'
+    __table_args__ = (
+        # Keyset pagination: (created_at, id) order, optionally after an
+        # equality filter (see CustomerDAO.find_page)
+        db.Index('ix_customers_created_at_id', 'created_at', 'id'),
+        db.Index('ix_customers_active_created_at_id', 'is_active', 'created_at', 'id'),
+        db.Index('ix_customers_verified_created_at_id', 'is_verified', 'created_at', 'id'),
+        db.Index('ix_customers_state_city_created_at_id', 'state', 'city', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
@@ -22,7 +30,8 @@ class Customer(db.Model):
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
     date_of_birth = db.Column(db.Date, nullable=True)
-    address = db.Column(db.Text, nullable=True)
+    # Deferred: loaded only by queries that undefer it (see CustomerDAOImpl)
+    address = deferred(db.Column(db.Text, nullable=True))
     city = db.Column(db.String(50), nullable=True)
     state = db.Column(db.String(50), nullable=True)
     pincode = db.Column(db.String(10), nullable=True)
@@ -31,18 +40,34 @@ class Customer(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     is_verified = db.Column(db.Boolean, default=False)
     
+    # Bumped by every profile change; access tokens that embed a profile
+    # snapshot (PROFILE_SNAPSHOT_CLAIMS_ENABLED) carry the version it was taken at
+    profile_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # NOT NULL: it is the keyset pagination cursor; rows of older schemas
+    # are backfilled at startup (see backfill_created_at)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime, nullable=True)
     
     def set_password(self, password: str) -> None:
-        """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set password (KDF runs on the hashing process pool)"""
+        self.password_hash = hash_executor.hash(password)
     
     def check_password(self, password: str) -> bool:
-        """Verify password against hash"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify password against hash (KDF runs on the hashing process pool).
+        
+        After a successful verify, a hash created under an older hashing
+        policy is replaced with one for the current policy; the caller's
+        next save persists it.
+        """
+        if not hash_executor.verify(self.password_hash, password):
+            return False
+        if hash_executor.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
     
     def update_last_login(self) -> None:
         """Update last login timestamp"""
@@ -0,0 +1,87 @@
+"""
+Bulk Customer Registration
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/service/bulk_registration.py
+
+Shared write path of the batch signup API and the offline importer.
+"""
+
+from typing import Dict, Hashable, List, Tuple
+from v2.extensions_v2 import hash_executor
+from v2.customer_profile.dao import CustomerDAO, DuplicateCustomerError
+
+DUPLICATE_MESSAGES = {
+    'email': 'Email already registered',
+    'mobile_number': 'Mobile number already registered'
+}
+
+DUPLICATE_IN_BATCH_MESSAGES = {
+    'email': 'Duplicate email in batch',
+    'mobile_number': 'Duplicate mobile number in batch'
+}
+
+
+def register_rows(customer_dao: CustomerDAO, rows: List[Tuple[Hashable, dict]],
+                  bounded_hashing: bool = True) -> Tuple[Dict[Hashable, int], Dict[Hashable, str]]:
+    """
+    Create a chunk of validated customers with a fixed number of queries.
+
+    rows are (key, column dict) pairs; each dict carries either a plain
+    `password` or a ready `password_hash`. Returns (customer id by key,
+    reject reason by key):
+
+    1. emails/mobile numbers repeated within the chunk are rejected
+    2. those already registered are found with one IN query per column
+       and rejected before any KDF work is spent on them
+    3. plain passwords are hashed across the hashing process pool; with
+       bounded_hashing (online requests) the jobs take max_pending slots
+       and the per-job timeout, and may raise PasswordHashingError;
+       offline imports pass False to use the whole pool
+    4. the rest is inserted with one executemany INSERT in one
+       transaction; if a concurrent signup makes it fail on a unique
+       constraint, the chunk is retried row by row
+    """
+    created: Dict[Hashable, int] = {}
+    rejected: Dict[Hashable, str] = {}
+
+    candidates = []
+    seen = {'email': set(), 'mobile_number': set()}
+    for key, row in rows:
+        field = next((name for name in seen if row[name] in seen[name]), None)
+        if field:
+            rejected[key] = DUPLICATE_IN_BATCH_MESSAGES[field]
+            continue
+        for name in seen:
+            seen[name].add(row[name])
+        candidates.append((key, row))
+
+    existing = dict(zip(('email', 'mobile_number'), customer_dao.find_existing_identifiers(
+        seen['email'], seen['mobile_number']
+    )))
+    pending = []
+    for key, row in candidates:
+        field = next((name for name in existing if row[name] in existing[name]), None)
+        if field:
+            rejected[key] = DUPLICATE_MESSAGES[field]
+        else:
+            pending.append((key, dict(row)))
+    if not pending:
+        return created, rejected
+
+    plain = [row for _, row in pending if 'password' in row]
+    hashes = hash_executor.hash_many([row.pop('password') for row in plain], bounded=bounded_hashing)
+    for row, password_hash in zip(plain, hashes):
+        row['password_hash'] = password_hash
+
+    try:
+        ids = customer_dao.bulk_create([row for _, row in pending])
+        created.update(zip((key for key, _ in pending), ids))
+        return created, rejected
+    except DuplicateCustomerError:
+        pass
+
+    for key, row in pending:
+        try:
+            created[key] = customer_dao.bulk_create([row])[0]
+        except DuplicateCustomerError as e:
+            rejected[key] = DUPLICATE_MESSAGES[e.field]
+    return created, rejected
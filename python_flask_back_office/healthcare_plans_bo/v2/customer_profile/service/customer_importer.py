@@ -0,0 +1,209 @@
+"""
+Customer Bulk Importer
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/service/customer_importer.py
+
+Offline loader for migrating customers from another system (used by the
+`flask import-customers` command).
+"""
+
+import csv
+import dataclasses
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+from v2.common.password_hashers import identify_hasher
+from v2.customer_profile.dao import CustomerDAO, CustomerDAOFactory
+from v2.customer_profile.dto import SignupRequestDTO
+from v2.customer_profile.service.bulk_registration import register_rows
+
+# Optional profile columns copied from the input when present
+PROFILE_FIELDS = ('address', 'city', 'state', 'pincode')
+
+
+@dataclass
+class ImportStats:
+    """Running totals of an import (also stored in the checkpoint)"""
+    records: int = 0
+    imported: int = 0
+    rejected: int = 0
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+def iter_records(path: str, input_format: str = 'auto') -> Iterator[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Yield (record, error) per input record of a CSV (with header) or NDJSON
+    file; error is set instead of record when a line cannot be parsed.
+    """
+    if input_format == 'auto':
+        input_format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+    with open(path, newline='', encoding='utf-8') as source:
+        if input_format == 'csv':
+            for row in csv.DictReader(source):
+                yield {key: value for key, value in row.items() if key is not None}, None
+            return
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield None, 'Malformed JSON'
+                continue
+            if isinstance(record, dict):
+                yield record, None
+            else:
+                yield None, 'Record must be a JSON object'
+
+
+class CustomerImporter:
+    """
+    Streams an input file into `customers` in batches.
+
+    Per batch of batch_size records:
+    1. every row is validated with SignupRequestDTO.validate; a row may
+       carry a ready-made `password_hash` (any supported KDF format)
+       instead of `password`
+    2. the valid rows are deduped, hashed and inserted in one transaction
+       by bulk_registration.register_rows
+    3. rejects are appended to the rejects file (NDJSON, no passwords) and
+       the checkpoint file records how many input records are done
+
+    Rerunning with the same checkpoint skips the finished records. A crash
+    between a commit and the checkpoint write only means that batch is
+    read again and its rows are rejected as already registered.
+    """
+
+    def __init__(self, customer_dao: CustomerDAO = None, batch_size: int = 1000,
+                 progress: Optional[Callable[[ImportStats], None]] = None):
+        self._customer_dao = customer_dao or CustomerDAOFactory.get_instance()
+        self._batch_size = max(int(batch_size), 1)
+        self._progress = progress
+
+    def run(self, path: str, checkpoint_path: str, rejects_path: str,
+            input_format: str = 'auto', resume: bool = True) -> ImportStats:
+        """Import a file; returns the totals (including resumed progress)"""
+        stats = self._load_checkpoint(checkpoint_path, path) if resume else None
+        resumed = stats is not None
+        stats = stats or ImportStats()
+        skip = stats.records
+
+        with open(rejects_path, 'a' if resumed else 'w', encoding='utf-8') as rejects:
+            batch: List[Tuple[int, Optional[dict], Optional[str]]] = []
+            for number, (record, error) in enumerate(iter_records(path, input_format), start=1):
+                if number <= skip:
+                    continue
+                batch.append((number, record, error))
+                if len(batch) >= self._batch_size:
+                    self._run_batch(batch, stats, rejects, checkpoint_path, path)
+                    batch = []
+            if batch:
+                self._run_batch(batch, stats, rejects, checkpoint_path, path)
+
+        return stats
+
+    def _run_batch(self, batch, stats: ImportStats, rejects, checkpoint_path: str, path: str) -> None:
+        """Import one batch, then persist rejects and the checkpoint"""
+        imported, rejected = self._register(batch)
+
+        for number, record, reason in sorted(rejected, key=lambda item: item[0]):
+            rejects.write(json.dumps({'record': number, 'reason': reason, 'data': record}, default=str) + '\n')
+        rejects.flush()
+
+        stats.records = batch[-1][0]
+        stats.rejected += len(rejected)
+        stats.imported += imported
+        self._save_checkpoint(checkpoint_path, path, stats)
+        if self._progress:
+            self._progress(stats)
+
+    def _register(self, batch) -> Tuple[int, List[Tuple[int, Optional[dict], str]]]:
+        """Validate and register a batch; returns (imported count, rejects)"""
+        rows = []
+        rejected = []
+        public = {}
+        for number, record, error in batch:
+            if error is None:
+                public[number] = self._public(record)
+                row, error = self._to_row(record)
+            if error:
+                rejected.append((number, public.get(number), error))
+            else:
+                rows.append((number, row))
+
+        created, conflicts = register_rows(self._customer_dao, rows, bounded_hashing=False)
+        rejected.extend((number, public[number], reason) for number, reason in conflicts.items())
+        return len(created), rejected
+
+    @staticmethod
+    def _to_row(record: dict) -> Tuple[Optional[dict], Optional[str]]:
+        """Validate an input record and map it to customers columns"""
+        record = {key: ('' if value is None else str(value)) for key, value in record.items()}
+        password_hash = record.get('password_hash', '').strip()
+
+        signup = SignupRequestDTO.from_dict(record)
+        if password_hash:
+            if identify_hasher(password_hash) is None:
+                return None, 'Unsupported password_hash format'
+            # Only the identity fields can be checked for pre-hashed rows
+            signup = dataclasses.replace(signup, password='x' * 8)
+        is_valid, error_message = signup.validate()
+        if not is_valid:
+            return None, error_message
+
+        row = {
+            'email': signup.email,
+            'mobile_number': signup.mobile_number,
+            'first_name': signup.first_name,
+            'last_name': signup.last_name
+        }
+        if password_hash:
+            row['password_hash'] = password_hash
+        else:
+            row['password'] = signup.password
+
+        for field in PROFILE_FIELDS:
+            value = record.get(field, '').strip()
+            if value:
+                row[field] = value
+        date_of_birth = record.get('date_of_birth', '').strip()
+        if date_of_birth:
+            try:
+                row['date_of_birth'] = date.fromisoformat(date_of_birth)
+            except ValueError:
+                return None, 'date_of_birth must be YYYY-MM-DD'
+        return row, None
+
+    @staticmethod
+    def _public(record: Optional[dict]) -> Optional[dict]:
+        """Copy of an input record without secrets, for the rejects file"""
+        if record is None:
+            return None
+        return {key: value for key, value in record.items() if key not in ('password', 'password_hash')}
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str, path: str) -> Optional[ImportStats]:
+        """Progress of a previous run of the same input, if any"""
+        if not os.path.exists(checkpoint_path):
+            return None
+        with open(checkpoint_path, encoding='utf-8') as source:
+            checkpoint = json.load(source)
+        if checkpoint.get('input') != os.path.abspath(path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('input')}")
+        return ImportStats(**checkpoint['stats'])
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, path: str, stats: ImportStats) -> None:
+        """Atomically replace the checkpoint file"""
+        temporary_path = f'{checkpoint_path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as target:
+            json.dump({
+                'input': os.path.abspath(path),
+                'stats': stats.to_dict(),
+                'updated_at': datetime.utcnow().isoformat()
+            }, target)
+        os.replace(temporary_path, checkpoint_path)
@@ -4,10 +4,14 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/servi
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 from v2.customer_profile.dto import (
     SignupRequestDTO, SignupResponseDTO,
     LoginRequestDTO, LoginResponseDTO,
-    CustomerResponseDTO
+    CustomerResponseDTO, ProfileSnapshotDTO,
+    CustomerListRequestDTO, CustomerListResponseDTO,
+    CustomerExportRequestDTO
 )
 
 
@@ -19,6 +23,12 @@ class CustomerService(ABC):
         """Register a new customer"""
         pass
     
+    @abstractmethod
+    def batch_signup(self, requests: List[SignupRequestDTO],
+                     chunk_size: int = 100) -> Iterator[Tuple[int, SignupResponseDTO]]:
+        """Register many customers; yields (index, result) per request, chunk by chunk"""
+        pass
+    
     @abstractmethod
     def login(self, request: LoginRequestDTO) -> LoginResponseDTO:
         """Authenticate customer and return tokens"""
@@ -30,8 +40,44 @@ class CustomerService(ABC):
         pass
     
     @abstractmethod
-    def update_profile(self, customer_id: int, data: dict) -> CustomerResponseDTO:
-        """Update customer profile"""
+    def get_profile_version(self, customer_id: int) -> datetime:
+        """Current profile version (updated_at), without loading the profile"""
+        pass
+    
+    @abstractmethod
+    def get_profile_fields(self, customer_id: int, fields: Tuple[str, ...]) -> dict:
+        """Get only the requested profile fields (a normalized PROFILE_FIELDSET combination)"""
+        pass
+    
+    @abstractmethod
+    def get_profile_summary(self, customer_id: int, claims: dict) -> ProfileSnapshotDTO:
+        """Profile summary, from the access token's snapshot claim while it is current"""
+        pass
+    
+    @abstractmethod
+    def get_snapshot_claims(self, customer_id: int) -> dict:
+        """Additional access token claims with a profile snapshot ({} when disabled)"""
+        pass
+    
+    @abstractmethod
+    def get_profiles(self, customer_ids: List[int]) -> List[Optional[CustomerResponseDTO]]:
+        """Get many customer profiles, in request order (None where not found)"""
+        pass
+    
+    @abstractmethod
+    def list_customers(self, request: CustomerListRequestDTO) -> CustomerListResponseDTO:
+        """List customers for the back office (keyset-paginated)"""
+        pass
+    
+    @abstractmethod
+    def export_customers(self, request: CustomerExportRequestDTO) -> Iterator[str]:
+        """Stream all matching customers as NDJSON or CSV text chunks"""
+        pass
+    
+    @abstractmethod
+    def update_profile(self, customer_id: int, data: dict,
+                       expected_version: Optional[datetime] = None) -> CustomerResponseDTO:
+        """Update customer profile (only if still at expected_version, when given)"""
         pass
     
     @abstractmethod
@@ -3,60 +3,89 @@ Customer Service Implementation
 Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/service/impl/customer_service_impl.py
 """
 
+from datetime import date, datetime
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple
+from flask import current_app, has_app_context
 from flask_jwt_extended import create_access_token, create_refresh_token
+from v2.common.metrics import timed_stage
+from v2.common.streaming_export import EXPORT_FORMATS
+from v2.common.ttl_cache import TTLCache, MISSING
+from v2.extensions_v2 import single_flight
 from v2.customer_profile.service.customer_service import CustomerService
-from v2.customer_profile.dao import CustomerDAO, CustomerDAOFactory
+from v2.customer_profile.dao import (
+    CustomerDAO, CustomerDAOFactory, DuplicateCustomerError, CustomerFilter
+)
+from v2.customer_profile.service.last_login_recorder import last_login_recorder
+from v2.customer_profile.service.bulk_registration import DUPLICATE_MESSAGES, register_rows
 from v2.customer_profile.model import Customer
 from v2.customer_profile.dto import (
     SignupRequestDTO, SignupResponseDTO,
     LoginRequestDTO, LoginResponseDTO,
-    CustomerResponseDTO
+    CustomerResponseDTO, PROFILE_FIELDSET, ProfileSnapshotDTO,
+    CustomerListRequestDTO, CustomerListResponseDTO,
+    CustomerExportRequestDTO
 )
 
 
 class CustomerServiceImpl(CustomerService):
     """Implementation of Customer business operations"""
     
+    DUPLICATE_MESSAGES = DUPLICATE_MESSAGES
+    
+    # Columns in customer extracts (never the password hash)
+    EXPORT_COLUMNS = (
+        'id', 'email', 'mobile_number', 'first_name', 'last_name',
+        'date_of_birth', 'address', 'city', 'state', 'pincode',
+        'is_active', 'is_verified', 'created_at', 'updated_at', 'last_login'
+    )
+    EXPORT_BATCH_SIZE = 1000
+    
+    # Customers whose profile_version this worker remembers (snapshot checks)
+    PROFILE_VERSION_CACHE_SIZE = 100000
+    
     def __init__(self, customer_dao: CustomerDAO = None):
         """Initialize with DAO dependency"""
         self._customer_dao = customer_dao or CustomerDAOFactory.get_instance()
+        config = current_app.config if has_app_context() else {}
+        self._snapshot_claims = config.get('PROFILE_SNAPSHOT_CLAIMS_ENABLED', False)
+        version_ttl = config.get('PROFILE_SNAPSHOT_VERSION_TTL_SECONDS', 5)
+        self._profile_versions = (
+            TTLCache(max_size=self.PROFILE_VERSION_CACHE_SIZE, ttl_seconds=version_ttl)
+            if version_ttl > 0 else None
+        )
     
     def signup(self, request: SignupRequestDTO) -> SignupResponseDTO:
         """Register a new customer"""
         
         # Validate request
-        is_valid, error_message = request.validate()
+        with timed_stage('signup', 'validate'):
+            is_valid, error_message = request.validate()
         if not is_valid:
             return SignupResponseDTO(
                 success=False,
                 message=error_message
             )
         
-        # Check if email already exists
-        if self._customer_dao.exists_by_email(request.email):
-            return SignupResponseDTO(
-                success=False,
-                message='Email already registered'
-            )
-        
-        # Check if mobile already exists
-        if self._customer_dao.exists_by_mobile(request.mobile_number):
-            return SignupResponseDTO(
-                success=False,
-                message='Mobile number already registered'
-            )
-        
-        # Create new customer
+        # Create new customer (the KDF runs before any transaction is opened)
         customer = Customer(
             email=request.email,
             mobile_number=request.mobile_number,
             first_name=request.first_name,
             last_name=request.last_name
         )
-        customer.set_password(request.password)
-        
-        # Save to database
-        created_customer = self._customer_dao.create(customer)
+        with timed_stage('signup', 'hash'):
+            customer.set_password(request.password)
+        
+        # Save to database; unique constraints reject duplicates atomically
+        try:
+            with timed_stage('signup', 'dao'):
+                created_customer = self._customer_dao.create(customer)
+        except DuplicateCustomerError as e:
+            return SignupResponseDTO(
+                success=False,
+                message=self.DUPLICATE_MESSAGES[e.field]
+            )
         
         return SignupResponseDTO(
             success=True,
@@ -65,11 +94,55 @@ class CustomerServiceImpl(CustomerService):
             email=created_customer.email
         )
     
+    def batch_signup(self, requests: List[SignupRequestDTO],
+                     chunk_size: int = 100) -> Iterator[Tuple[int, SignupResponseDTO]]:
+        """
+        Register many customers (group enrollment).
+        
+        Each chunk costs a fixed number of queries regardless of its size:
+        duplicates are found with one IN query per column, passwords are
+        hashed in parallel on the hashing pool, and the chunk is inserted
+        in one transaction (see bulk_registration.register_rows). Results
+        are yielded per chunk, in request order.
+        """
+        for start in range(0, len(requests), chunk_size):
+            chunk = list(enumerate(requests[start:start + chunk_size], start=start))
+            
+            results = {}
+            rows = []
+            errors = SignupRequestDTO.validate_many([request for _, request in chunk])
+            for (index, request), error_message in zip(chunk, errors):
+                if error_message:
+                    results[index] = SignupResponseDTO(success=False, message=error_message)
+                    continue
+                rows.append((index, {
+                    'email': request.email,
+                    'mobile_number': request.mobile_number,
+                    'first_name': request.first_name,
+                    'last_name': request.last_name,
+                    'password': request.password
+                }))
+            
+            created, rejected = register_rows(self._customer_dao, rows)
+            for index, customer_id in created.items():
+                results[index] = SignupResponseDTO(
+                    success=True,
+                    message='Account created successfully',
+                    customer_id=customer_id,
+                    email=requests[index].email
+                )
+            for index, reason in rejected.items():
+                results[index] = SignupResponseDTO(success=False, message=reason)
+            
+            for index, _ in chunk:
+                yield index, results[index]
+    
     def login(self, request: LoginRequestDTO) -> LoginResponseDTO:
         """Authenticate customer and return tokens"""
         
         # Validate request
-        is_valid, error_message = request.validate()
+        with timed_stage('login', 'validate'):
+            is_valid, error_message = request.validate()
         if not is_valid:
             return LoginResponseDTO(
                 success=False,
@@ -77,7 +150,8 @@ class CustomerServiceImpl(CustomerService):
             )
         
         # Find customer by email
-        customer = self._customer_dao.find_by_email(request.email)
+        with timed_stage('login', 'dao'):
+            customer = self._customer_dao.find_credentials_by_email(request.email)
         
         if not customer:
             return LoginResponseDTO(
@@ -86,7 +160,10 @@ class CustomerServiceImpl(CustomerService):
             )
         
         # Verify password
-        if not customer.check_password(request.password):
+        password_hash = customer.password_hash
+        with timed_stage('login', 'hash'):
+            password_ok = customer.check_password(request.password)
+        if not password_ok:
             return LoginResponseDTO(
                 success=False,
                 message='Invalid email or password'
@@ -99,13 +176,21 @@ class CustomerServiceImpl(CustomerService):
                 message='Account is deactivated. Please contact support.'
             )
         
-        # Update last login
-        customer.update_last_login()
-        self._customer_dao.update(customer)
+        # Persist a hash upgraded to the current hashing policy
+        if customer.password_hash != password_hash:
+            with timed_stage('login', 'dao'):
+                self._customer_dao.update(customer)
+        
+        # Record last login (written behind in batches)
+        last_login_recorder.record(customer.id)
         
         # Generate JWT tokens
-        access_token = create_access_token(identity=str(customer.id))
-        refresh_token = create_refresh_token(identity=str(customer.id))
+        with timed_stage('login', 'token'):
+            access_token = create_access_token(
+                identity=str(customer.id),
+                additional_claims=ProfileSnapshotDTO.from_model(customer).to_claims() if self._snapshot_claims else None
+            )
+            refresh_token = create_refresh_token(identity=str(customer.id))
         
         return LoginResponseDTO(
             success=True,
@@ -117,20 +202,172 @@ class CustomerServiceImpl(CustomerService):
             full_name=customer.full_name
         )
     
+    @single_flight(key=lambda self, customer_id: customer_id)
     def get_profile(self, customer_id: int) -> CustomerResponseDTO:
-        """Get customer profile by ID"""
+        """Get customer profile by ID (concurrent reads of one customer share a DAO call)"""
         
-        customer = self._customer_dao.find_by_id(customer_id)
+        with timed_stage('get_profile', 'dao'):
+            customer = self._customer_dao.find_by_id(customer_id)
         
         if not customer:
             raise ValueError('Customer not found')
         
         return CustomerResponseDTO.from_model(customer)
     
-    def update_profile(self, customer_id: int, data: dict) -> CustomerResponseDTO:
-        """Update customer profile"""
+    @single_flight(key=lambda self, customer_id: customer_id)
+    def get_profile_version(self, customer_id: int) -> datetime:
+        """Current profile version (updated_at), without loading the profile"""
         
-        customer = self._customer_dao.find_by_id(customer_id)
+        version = self._customer_dao.find_version(customer_id)
+        
+        if version is None:
+            raise ValueError('Customer not found')
+        
+        return version
+    
+    def get_profile_fields(self, customer_id: int, fields: Tuple[str, ...]) -> dict:
+        """
+        Get only the requested profile fields.
+        
+        Only the columns those fields need are SELECTed, and the row is
+        serialized by a serializer specialized for the combination; no
+        Customer instance or full DTO is built.
+        """
+        
+        with timed_stage('get_profile_fields', 'dao'):
+            row = self._customer_dao.find_columns_by_id(customer_id, PROFILE_FIELDSET.columns(fields))
+        
+        if row is None:
+            raise ValueError('Customer not found')
+        
+        return PROFILE_FIELDSET.serializer(fields)(row)
+    
+    def get_profile_summary(self, customer_id: int, claims: dict) -> ProfileSnapshotDTO:
+        """
+        Profile summary for the holder of an access token.
+        
+        The token's snapshot is returned while its version still matches
+        the customer's profile_version (remembered per worker for
+        PROFILE_SNAPSHOT_VERSION_TTL_SECONDS, so usually no query at all).
+        A token without a snapshot, or with a stale one, gets the summary
+        from a column SELECT.
+        """
+        
+        snapshot = ProfileSnapshotDTO.from_claims(customer_id, claims)
+        if snapshot is not None and snapshot.profile_version == self._current_profile_version(customer_id):
+            return snapshot
+        
+        return self._load_snapshot(customer_id)
+    
+    def get_snapshot_claims(self, customer_id: int) -> dict:
+        """Additional access token claims with a fresh profile snapshot ({} when disabled)"""
+        
+        if not self._snapshot_claims:
+            return {}
+        return self._load_snapshot(customer_id).to_claims()
+    
+    def _load_snapshot(self, customer_id: int) -> ProfileSnapshotDTO:
+        """Profile snapshot via a SELECT of its columns only"""
+        
+        row = self._customer_dao.find_columns_by_id(customer_id, ProfileSnapshotDTO.COLUMNS)
+        
+        if row is None:
+            raise ValueError('Customer not found')
+        
+        return ProfileSnapshotDTO.from_row(_snapshot_values(row))
+    
+    def _current_profile_version(self, customer_id: int) -> int:
+        """profile_version of one customer, remembered per worker for a short TTL"""
+        
+        versions = self._profile_versions
+        version = versions.get(customer_id) if versions is not None else MISSING
+        if version is MISSING:
+            generation = versions.generation if versions is not None else None
+            row = self._customer_dao.find_columns_by_id(customer_id, ('profile_version',))
+            if row is None:
+                raise ValueError('Customer not found')
+            version = row['profile_version']
+            if versions is not None:
+                # Dropped if the profile changed meanwhile (see TTLCache)
+                versions.set(customer_id, version, generation=generation)
+        return version
+    
+    def _forget_profile_version(self, customer_id: int) -> None:
+        """Called after a profile change: the next snapshot check reads the new version"""
+        if self._profile_versions is not None:
+            self._profile_versions.delete(customer_id)
+    
+    def get_profiles(self, customer_ids: List[int]) -> List[Optional[CustomerResponseDTO]]:
+        """Get many customer profiles, in request order (None where not found)"""
+        
+        customers = self._customer_dao.find_by_ids(customer_ids)
+        profiles = {
+            customer_id: CustomerResponseDTO.from_model(customer)
+            for customer_id, customer in customers.items()
+        }
+        return [profiles.get(customer_id) for customer_id in customer_ids]
+    
+    def list_customers(self, request: CustomerListRequestDTO) -> CustomerListResponseDTO:
+        """List customers for the back office (keyset-paginated)"""
+        
+        is_valid, error_message = request.validate()
+        if not is_valid:
+            raise ValueError(error_message)
+        
+        page = self._customer_dao.find_page(
+            limit=request.limit,
+            cursor=request.cursor,
+            filters=CustomerFilter(
+                is_active=request.is_active,
+                is_verified=request.is_verified,
+                city=request.city,
+                state=request.state
+            ),
+            columns=CustomerResponseDTO.COLUMNS
+        )
+        
+        return CustomerListResponseDTO(
+            items=[CustomerResponseDTO.from_row(row) for row in page.items],
+            next_cursor=page.next_cursor
+        )
+    
+    def export_customers(self, request: CustomerExportRequestDTO) -> Iterator[str]:
+        """
+        Stream all matching customers as NDJSON or CSV text chunks.
+        
+        Rows go straight from the DAO's server-side cursor to the
+        serializer as tuples, so memory use does not grow with the number of
+        customers. Validation happens before the first chunk is requested.
+        """
+        
+        is_valid, error_message = request.validate()
+        if not is_valid:
+            raise ValueError(error_message)
+        
+        serialize = EXPORT_FORMATS[request.format][0]
+        rows = self._customer_dao.iter_rows(
+            self.EXPORT_COLUMNS,
+            filters=CustomerFilter(
+                is_active=request.is_active,
+                is_verified=request.is_verified,
+                city=request.city,
+                state=request.state
+            ),
+            batch_size=self.EXPORT_BATCH_SIZE
+        )
+        return serialize(self.EXPORT_COLUMNS, rows, chunk_rows=self.EXPORT_BATCH_SIZE)
+    
+    def update_profile(self, customer_id: int, data: dict,
+                       expected_version: Optional[datetime] = None) -> CustomerResponseDTO:
+        """
+        Update customer profile.
+        
+        With expected_version (from If-Match), the update is refused with
+        ConcurrentUpdateError if the profile changed since that version.
+        """
+        
+        with timed_stage('update_profile', 'dao'):
+            customer = self._customer_dao.find_by_id(customer_id)
         
         if not customer:
             raise ValueError('Customer not found')
@@ -141,30 +378,49 @@ class CustomerServiceImpl(CustomerService):
             'address', 'city', 'state', 'pincode'
         ]
         
+        if isinstance(data.get('date_of_birth'), str):
+            try:
+                data = dict(data, date_of_birth=date.fromisoformat(data['date_of_birth']))
+            except ValueError:
+                raise ValueError('date_of_birth must be YYYY-MM-DD')
+        
         for field in allowed_fields:
             if field in data and data[field] is not None:
                 setattr(customer, field, data[field])
         
-        updated_customer = self._customer_dao.update(customer)
+        # Invalidates profile snapshots embedded in access tokens
+        customer.profile_version = (customer.profile_version or 0) + 1
+        
+        with timed_stage('update_profile', 'dao'):
+            updated_customer = self._customer_dao.update(customer, expected_updated_at=expected_version)
+        
+        # Reads already in flight started before this write; later ones must not join them
+        self.get_profile.forget(self, customer_id)
+        self.get_profile_version.forget(self, customer_id)
+        self._forget_profile_version(customer_id)
         
         return CustomerResponseDTO.from_model(updated_customer)
     
     def change_password(self, customer_id: int, old_password: str, new_password: str) -> bool:
         """Change customer password"""
         
-        customer = self._customer_dao.find_by_id(customer_id)
+        customer = self._customer_dao.find_credentials_by_id(customer_id)
         
         if not customer:
             raise ValueError('Customer not found')
         
-        if not customer.check_password(old_password):
+        with timed_stage('change_password', 'hash'):
+            password_ok = customer.check_password(old_password)
+        if not password_ok:
             raise ValueError('Current password is incorrect')
         
         if len(new_password) < 8:
             raise ValueError('New password must be at least 8 characters')
         
-        customer.set_password(new_password)
-        self._customer_dao.update(customer)
+        with timed_stage('change_password', 'hash'):
+            customer.set_password(new_password)
+        with timed_stage('change_password', 'dao'):
+            self._customer_dao.update(customer)
         
         return True
     
@@ -177,6 +433,15 @@ class CustomerServiceImpl(CustomerService):
             raise ValueError('Customer not found')
         
         customer.is_active = False
+        customer.profile_version = (customer.profile_version or 0) + 1
         self._customer_dao.update(customer)
         
+        # Reads already in flight started before this write; later ones must not join them
+        self.get_profile.forget(self, customer_id)
+        self.get_profile_version.forget(self, customer_id)
+        self._forget_profile_version(customer_id)
+        
         return True
+
+
+_snapshot_values = itemgetter(*ProfileSnapshotDTO.COLUMNS)
@@ -0,0 +1,63 @@
+"""
+Last Login Recorder
+Location: python_flask_back_office/healthcare_plans_bo/v2/customer_profile/service/last_login_recorder.py
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+from v2.common.write_behind import WriteBehindBuffer
+from v2.customer_profile.dao import CustomerDAOFactory
+
+
+class LastLoginRecorder:
+    """
+    Write-behind recorder for Customer.last_login.
+
+    Logins are collected per worker, repeats for the same customer are
+    coalesced, and the timestamps are written with one executemany UPDATE
+    per batch (LAST_LOGIN_FLUSH_MAX_BATCH) or interval
+    (LAST_LOGIN_FLUSH_INTERVAL_SECONDS), so last_login lags by at most the
+    flush interval. An interval of 0 writes synchronously.
+    """
+
+    def __init__(self, app=None):
+        self._app = None
+        self._buffer: Optional[WriteBehindBuffer] = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config"""
+        if self._buffer is not None:
+            self._buffer.close()
+        self._app = app
+        interval = app.config.get('LAST_LOGIN_FLUSH_INTERVAL_SECONDS', 0)
+        self._buffer = None
+        if interval > 0:
+            self._buffer = WriteBehindBuffer(
+                self._write,
+                max_items=app.config.get('LAST_LOGIN_FLUSH_MAX_BATCH', 500),
+                flush_interval=interval,
+                name='last-login-recorder'
+            )
+
+    def record(self, customer_id: int, logged_in_at: Optional[datetime] = None) -> None:
+        """Record a successful login"""
+        logged_in_at = logged_in_at or datetime.utcnow()
+        if self._buffer is None:
+            CustomerDAOFactory.get_instance().update_last_logins({customer_id: logged_in_at})
+        else:
+            self._buffer.record(customer_id, logged_in_at)
+
+    def flush(self) -> int:
+        """Write pending logins now"""
+        return self._buffer.flush() if self._buffer is not None else 0
+
+    def _write(self, last_logins: Dict[int, datetime]) -> None:
+        """Flush callback (runs on the buffer thread)"""
+        with self._app.app_context():
+            CustomerDAOFactory.get_instance().update_last_logins(last_logins)
+
+
+last_login_recorder = LastLoginRecorder()
@@ -4,11 +4,27 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/extensions_v2.py
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
+from v2.common.bulkhead import Bulkheads
+from v2.common.jwt_cache import CachingJWTManager
+from v2.common.jwt_keys import SigningKeys
+from v2.common.metrics import RequestMetrics
+from v2.common.password_hashing import PasswordHashExecutor
+from v2.common.query_stats import QueryStats
+from v2.common.rate_limit import LoginThrottle
+from v2.common.single_flight import SingleFlight
 
-db = SQLAlchemy()
-jwt = JWTManager()
+# Objects stay usable after commit without a reload; DAO writes set every
+# column value client-side, so there is nothing to refresh.
+db = SQLAlchemy(session_options={'expire_on_commit': False})
+jwt = CachingJWTManager()
+signing_keys = SigningKeys()
 cors = CORS()
 migrate = Migrate()
+hash_executor = PasswordHashExecutor()
+single_flight = SingleFlight()
+login_throttle = LoginThrottle()
+bulkheads = Bulkheads()
+request_metrics = RequestMetrics()
+query_stats = QueryStats()
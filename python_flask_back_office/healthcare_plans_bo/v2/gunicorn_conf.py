@@ -0,0 +1,22 @@
+"""
+Gunicorn Hooks for V2
+Location: python_flask_back_office/healthcare_plans_bo/v2/gunicorn_conf.py
+
+Loaded with `--config python:v2.gunicorn_conf`; worker and thread counts
+stay on the command line (Dockerfile.v2).
+"""
+
+import os
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's in-flight gauge from the multiprocess metrics"""
+    # prometheus_client directly: importing the app's metrics module would
+    # create gauge files for the master process
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid, path)
@@ -4,8 +4,10 @@ Location: python_flask_back_office/healthcare_plans_bo/v2/main_v2.py
 """
 
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from v2.config_v2 import config
-from v2.extensions_v2 import db, jwt, cors, migrate
+from v2.extensions_v2 import db, jwt, signing_keys, cors, migrate, hash_executor, single_flight, login_throttle, bulkheads, request_metrics, query_stats
+from v2.common.json_provider import FastJSONProvider
 
 
 def create_app(config_name=None):
@@ -15,15 +17,33 @@ def create_app(config_name=None):
         config_name = 'development'
     
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(config[config_name])
+    
+    # Client address from the X-Forwarded-For entries of trusted proxies
+    if app.config.get('PROXY_FIX_X_FOR', 0) > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
 
     print(f"JWT_SECRET_KEY: {app.config.get('JWT_SECRET_KEY')[:20]}...")
+    if not app.config.get('ADMIN_API_KEY'):
+        print("⚠️ ADMIN_API_KEY is not set: back-office endpoints answer 503")
     
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
+    signing_keys.init_app(app, jwt)
     cors.init_app(app, resources={r"/api/*": {"origins": app.config.get('CORS_ORIGINS', '*')}})
     migrate.init_app(app, db)
+    hash_executor.init_app(app)
+    single_flight.init_app(app)
+    request_metrics.init_app(app)
+    query_stats.init_app(app)
+    login_throttle.init_app(app)
+    bulkheads.init_app(app)
+    
+    # Write-behind recorder for last_login
+    from v2.customer_profile.service.last_login_recorder import last_login_recorder
+    last_login_recorder.init_app(app)
     
     # Register blueprints
     register_blueprints(app)
@@ -34,6 +54,9 @@ def create_app(config_name=None):
     # Register JWT error handlers
     register_jwt_handlers(app)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Create database tables
     with app.app_context():
         try:
@@ -45,6 +68,10 @@ def create_app(config_name=None):
                 print("✅ Database tables created")
             else:
                 print(f"✅ Database tables already exist: {existing_tables}")
+                from v2.customer_profile.dao.impl.customer_dao_impl import backfill_created_at
+                backfilled = backfill_created_at()
+                if backfilled:
+                    print(f"✅ Backfilled created_at of {backfilled} customers")
         except Exception as e:
             print(f"⚠️ Database initialization: {e}")
     
@@ -58,9 +85,21 @@ def register_blueprints(app):
     from v2.api.health import health_bp
     app.register_blueprint(health_bp, url_prefix='/api/v2')
     
+    # Prometheus metrics
+    from v2.api.metrics import metrics_bp
+    app.register_blueprint(metrics_bp)
+    
+    # Public signing keys (JWKS)
+    from v2.api.well_known import well_known_bp
+    app.register_blueprint(well_known_bp, url_prefix='/.well-known')
+    
     # Customer Profile module
     from v2.customer_profile.api import customer_bp
     app.register_blueprint(customer_bp, url_prefix='/api/v2/customers')
+    
+    # Customer back office
+    from v2.customer_profile.api import admin_customer_bp
+    app.register_blueprint(admin_customer_bp, url_prefix='/api/v2/admin/customers')
 
 
 def register_error_handlers(app):
@@ -137,3 +176,101 @@ def register_jwt_handlers(app):
             'error': 'Authorization Required',
             'message': 'Access token is missing.'
         }), 401
+
+
+def register_commands(app):
+    """Register Flask CLI commands"""
+    
+    import click
+    from v2.common.jwt_keys import ALGORITHMS, generate_signing_key
+    from v2.common.password_hashers import HASHERS, calibrate
+    from v2.customer_profile.dto import CustomerExportRequestDTO
+    
+    @app.cli.command('calibrate-password-hash')
+    @click.option('--hasher', 'hasher_name', type=click.Choice(sorted(HASHERS)),
+                  default=lambda: app.config.get('PASSWORD_HASHER', 'scrypt'),
+                  help='KDF to calibrate (defaults to PASSWORD_HASHER).')
+    @click.option('--target-ms', type=float, default=250.0, show_default=True,
+                  help='Target time for a single hash on this host.')
+    @click.option('--samples', type=int, default=3, show_default=True,
+                  help='Hashes measured per cost step (median is used).')
+    def calibrate_password_hash(hasher_name, target_ms, samples):
+        """Measure KDF cost on this host and recommend hashing parameters"""
+        recommended, measurements = calibrate(hasher_name, target_ms, samples)
+        
+        click.echo(f"Calibrating '{hasher_name}' for a target of {target_ms:.0f} ms per hash")
+        for params, elapsed_ms in measurements:
+            marker = '  <- recommended' if params == recommended else ''
+            click.echo(f"  {params}: {elapsed_ms:8.1f} ms{marker}")
+        
+        if recommended is None:
+            click.echo('Even the cheapest step exceeds the target; consider a larger target.')
+            return
+        click.echo('')
+        click.echo('Set in config_v2.py:')
+        click.echo(f"    PASSWORD_HASHER = '{hasher_name}'")
+        click.echo(f"    PASSWORD_HASHER_PARAMS['{hasher_name}'] = {recommended}")
+    
+    @app.cli.command('generate-jwt-key')
+    @click.option('--algorithm', type=click.Choice(ALGORITHMS), default='EdDSA', show_default=True,
+                  help='Key type: RSA 2048 (RS256) or Ed25519 (EdDSA).')
+    @click.option('--dir', 'directory', default=lambda: app.config.get('JWT_SIGNING_KEYS_DIR'),
+                  help='Key directory (defaults to JWT_SIGNING_KEYS_DIR).')
+    def generate_jwt_key(algorithm, directory):
+        """Add a signing key to the JWT key set"""
+        if not directory:
+            raise click.UsageError('Set JWT_SIGNING_KEYS_DIR or pass --dir')
+        kid = generate_signing_key(directory, algorithm)
+        
+        click.echo(f"Wrote {directory}/{kid}.pem ({algorithm})")
+        click.echo('It is published in /.well-known/jwks.json once the app restarts. To sign with it,')
+        click.echo(f"wait JWKS_MAX_AGE_SECONDS, then set JWT_SIGNING_KID={kid}")
+    
+    @app.cli.command('export-customers')
+    @click.option('--format', 'export_format', type=click.Choice(CustomerExportRequestDTO.FORMATS),
+                  default='ndjson', show_default=True, help='Output format.')
+    @click.option('--output', type=click.File('w', encoding='utf-8'), default='-',
+                  help='File to write (defaults to stdout).')
+    @click.option('--active/--inactive', 'is_active', default=None,
+                  help='Only active or only deactivated customers.')
+    def export_customers(export_format, output, is_active):
+        """Stream all customers to NDJSON or CSV"""
+        from v2.customer_profile.service import CustomerServiceFactory
+        
+        export_request = CustomerExportRequestDTO(format=export_format, is_active=is_active)
+        for chunk in CustomerServiceFactory.get_instance().export_customers(export_request):
+            output.write(chunk)
+    
+    @app.cli.command('import-customers')
+    @click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'input_format', type=click.Choice(['auto', 'csv', 'ndjson']),
+                  default='auto', show_default=True, help='Input format (auto: by file extension).')
+    @click.option('--batch-size', type=int, default=1000, show_default=True,
+                  help='Records validated, hashed and inserted per transaction.')
+    @click.option('--workers', type=int, default=None,
+                  help='Hashing processes (defaults to PASSWORD_HASH_WORKERS).')
+    @click.option('--checkpoint', 'checkpoint_path', type=click.Path(dir_okay=False),
+                  help='Progress file (defaults to INPUT_PATH.checkpoint.json).')
+    @click.option('--rejects', 'rejects_path', type=click.Path(dir_okay=False),
+                  help='Rejected records, NDJSON (defaults to INPUT_PATH.rejects.ndjson).')
+    @click.option('--restart', is_flag=True, help='Ignore an existing checkpoint and start over.')
+    def import_customers(input_path, input_format, batch_size, workers, checkpoint_path, rejects_path, restart):
+        """Bulk-load customers from a CSV or NDJSON file"""
+        from v2.extensions_v2 import hash_executor
+        from v2.customer_profile.service.customer_importer import CustomerImporter
+        
+        if workers is not None:
+            hash_executor.configure(workers=workers, hasher=hash_executor.hasher)
+        
+        def report(stats):
+            click.echo(f"  {stats.records} records: {stats.imported} imported, {stats.rejected} rejected")
+        
+        importer = CustomerImporter(batch_size=batch_size, progress=report)
+        stats = importer.run(
+            input_path,
+            checkpoint_path=checkpoint_path or f'{input_path}.checkpoint.json',
+            rejects_path=rejects_path or f'{input_path}.rejects.ndjson',
+            input_format=input_format,
+            resume=not restart
+        )
+        click.echo(f"Done: {stats.records} records, {stats.imported} imported, {stats.rejected} rejected")
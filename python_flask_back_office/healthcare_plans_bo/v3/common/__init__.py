@@ -0,0 +1,79 @@
+# Common Module
+from v3.common.admin_auth import admin_key_required
+from v3.common.bloom_filter import BloomFilter
+from v3.common.bulkhead import Bulkhead, Bulkheads, BulkheadRejectedError
+from v3.common.conditional import (
+    PreconditionFailedError,
+    make_etag,
+    if_match_timestamp,
+    is_not_modified,
+    set_validators,
+    not_modified
+)
+from v3.common.json_provider import FastJSONProvider
+from v3.common.jwt_cache import CachingJWTManager
+from v3.common.jwt_keys import SigningKeys, SigningKeyError, KeySet, generate_signing_key
+from v3.common.metrics import RequestMetrics, timed_stage
+from v3.common.password_hashers import (
+    PasswordHasher,
+    HASHERS,
+    create_hasher,
+    identify_hasher,
+    calibrate
+)
+from v3.common.password_hashing import (
+    PasswordHashExecutor,
+    PasswordHashingError,
+    PasswordHashingBusyError,
+    PasswordHashingTimeoutError
+)
+from v3.common.query_stats import QueryStats, QueryLog, assert_max_queries, normalize_sql
+from v3.common.rate_limit import LoginThrottle, LocalBucketStore, SQLiteBucketStore
+from v3.common.sparse_fields import FieldSet, InvalidFieldsError
+from v3.common.token_verifier import TokenVerifier
+from v3.common.ttl_cache import TTLCache, MISSING
+from v3.common.write_behind import WriteBehindBuffer
+
+__all__ = [
+    'admin_key_required',
+    'BloomFilter',
+    'Bulkhead',
+    'Bulkheads',
+    'BulkheadRejectedError',
+    'PreconditionFailedError',
+    'make_etag',
+    'if_match_timestamp',
+    'is_not_modified',
+    'set_validators',
+    'not_modified',
+    'FastJSONProvider',
+    'CachingJWTManager',
+    'SigningKeys',
+    'SigningKeyError',
+    'KeySet',
+    'generate_signing_key',
+    'RequestMetrics',
+    'timed_stage',
+    'PasswordHasher',
+    'HASHERS',
+    'create_hasher',
+    'identify_hasher',
+    'calibrate',
+    'PasswordHashExecutor',
+    'PasswordHashingError',
+    'PasswordHashingBusyError',
+    'PasswordHashingTimeoutError',
+    'QueryStats',
+    'QueryLog',
+    'assert_max_queries',
+    'normalize_sql',
+    'LoginThrottle',
+    'LocalBucketStore',
+    'SQLiteBucketStore',
+    'FieldSet',
+    'InvalidFieldsError',
+    'TokenVerifier',
+    'TTLCache',
+    'MISSING',
+    'WriteBehindBuffer'
+]
@@ -0,0 +1,28 @@
+"""
+Admin API Key Authentication for V3
+"""
+
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, request
+
+
+def admin_key_required(view):
+    """
+    Protect an admin view with the X-Admin-Key header (ADMIN_API_KEY).
+
+    Fails closed: without a configured key the view is not reachable at
+    all (503), there is no built-in fallback key.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected_key = current_app.config.get('ADMIN_API_KEY')
+        if not expected_key:
+            return jsonify({'error': 'Admin API is disabled: ADMIN_API_KEY is not configured'}), 503
+        admin_key = request.headers.get('X-Admin-Key', '')
+        if not hmac.compare_digest(admin_key.encode(), expected_key.encode()):
+            return jsonify({'error': 'Unauthorized'}), 401
+        return view(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,52 @@
+"""
+Bloom Filter for V3
+
+Fixed-size set membership sketch: `in` never misses an added key and is
+wrong for a key that was not added with probability ~error_rate (at
+capacity). Keys cannot be removed; rebuild to drop them.
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Bloom filter over string keys.
+
+    The k bit positions come from one 128-bit BLAKE2b digest split into two
+    64-bit halves (Kirsch-Mitzenmacher double hashing), so a lookup costs
+    one hash call whatever k is.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, keys: Iterable[str] = ()):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.size_bits = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size_bits / capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        for key in keys:
+            self.add(key)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size_bits
+        return [(first + i * second) % size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        """Keys added (with repeats)"""
+        return self.count
@@ -0,0 +1,91 @@
+"""
+Conditional Requests for V3
+
+ETag / Last-Modified validators derived from a row's timestamps, so a
+conditional GET can be answered with 304 from a version lookup alone, and
+If-Match can be turned back into the timestamp to compare-and-set on.
+
+ETag format: "<id>-<version>[-<variant>]" where version is one or more
+timestamps as integer microseconds since the epoch (naive UTC, as stored)
+and variant distinguishes sparse representations (?fields=).
+"""
+
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+from flask import Response, request
+
+
+class PreconditionFailedError(Exception):
+    """Raised when an If-Match header cannot match the current version"""
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _stamp(value: Optional[datetime]) -> int:
+    """Naive UTC datetime -> integer microseconds (exact round trip)"""
+    return 0 if value is None else (value - _EPOCH) // _MICROSECOND
+
+
+def make_etag(resource_id: int, *timestamps: Optional[datetime],
+              variant: Optional[Sequence[str]] = None) -> str:
+    """Entity tag (unquoted) for a representation of one row"""
+    tag = '-'.join([str(resource_id)] + [str(_stamp(value)) for value in timestamps])
+    if variant:
+        tag += '-%08x' % zlib.crc32(','.join(variant).encode())
+    return tag
+
+
+def etag_timestamp(etag: str, resource_id: int) -> Optional[datetime]:
+    """The first timestamp encoded in one of our ETags for this resource"""
+    parts = etag.split('-')
+    if len(parts) < 2 or parts[0] != str(resource_id) or not parts[1].isdigit():
+        return None
+    return _EPOCH + int(parts[1]) * _MICROSECOND
+
+
+def if_match_timestamp(resource_id: int) -> Optional[datetime]:
+    """
+    The version an If-Match request expects: None when the header is absent
+    or `*`. Raises PreconditionFailedError when no listed tag is a version
+    of this resource.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    for etag in if_match:
+        timestamp = etag_timestamp(etag, resource_id)
+        if timestamp is not None:
+            return timestamp
+    raise PreconditionFailedError('If-Match does not match the current version')
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (weak comparison), else If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    """Attach ETag/Last-Modified and require revalidation on every use"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Empty 304 response carrying the validators"""
+    return set_validators(Response(status=304), etag, last_modified)
+
+
+def _http_date(value: datetime) -> datetime:
+    """Aware UTC datetime truncated to HTTP-date (second) precision"""
+    return value.replace(microsecond=0, tzinfo=timezone.utc)
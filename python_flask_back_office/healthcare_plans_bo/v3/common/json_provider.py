@@ -0,0 +1,81 @@
+"""
+JSON Provider for V3
+
+Flask JSON provider backed by orjson when it is installed (stdlib json
+otherwise). jsonify/request.get_json go through it, and it serializes
+date/datetime (ISO 8601) and dataclasses itself, so a DTO can be passed to
+jsonify as-is instead of being copied into a dict with to_dict() first.
+
+Dataclasses are written field by field, in field order; DTOs whose wire
+shape differs from their fields keep using to_dict().
+"""
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date, time
+from functools import lru_cache
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
+def _default(value):
+    """Types neither backend serializes natively"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {name: getattr(value, name) for name in _field_names(type(value))}
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider with orjson encoding/decoding.
+
+    Honors sort_keys and compact like the default provider (pretty output
+    in debug mode); calls with stdlib-specific keyword arguments fall back
+    to the stdlib implementation.
+    """
+
+    default = staticmethod(_default)
+
+    def _options(self, indent: bool = False) -> int:
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self._options(indent)) + b'\n',
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,84 @@
+"""
+JWT Decode Cache for V3
+
+CachingJWTManager is a drop-in JWTManager that remembers the verified
+claims of every token it decodes until the token's exp, so a client
+reusing its access token skips the parse, base64 decode and signature
+check on later requests.
+
+Only decoding is cached. The checks Flask-JWT-Extended runs on the decoded
+claims (token type, freshness, the token_in_blocklist_loader revocation
+check, custom verification) still run on every request. Claims are
+verified against the keys loaded at startup; SigningKeys.init_app empties
+the cache when it loads another key set.
+
+The cache hooks into JWTManager._decode_jwt_from_config, a private method
+(written against Flask-JWT-Extended 4.7). init_app checks its parameters;
+when they are not the expected ones the cache stays off and decoding is
+left to the library.
+"""
+
+import hashlib
+import inspect
+import time
+from typing import Optional
+from flask import current_app
+from flask_jwt_extended import JWTManager
+from v3.common.ttl_cache import TTLCache, MISSING
+
+# app.extensions key of the per-app cache (None when disabled)
+CACHE_EXTENSION = 'jwt-decode-cache'
+
+# Parameters of the overridden JWTManager method this cache was written for
+DECODE_HOOK_PARAMETERS = ('self', 'encoded_token', 'csrf_value', 'allow_expired')
+
+
+def decode_hook_supported() -> bool:
+    """Whether the installed Flask-JWT-Extended decodes through the expected hook"""
+    hook = getattr(JWTManager, '_decode_jwt_from_config', None)
+    return hook is not None and tuple(inspect.signature(hook).parameters) == DECODE_HOOK_PARAMETERS
+
+
+def token_digest(encoded_token: str) -> bytes:
+    """Cache key: tokens themselves are not kept in memory"""
+    return hashlib.blake2b(encoded_token.encode(), digest_size=16).digest()
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager with a per-app, size-bounded LRU of decoded claims
+    (JWT_DECODE_CACHE_SIZE entries, 0 disables it), shared by the threads of
+    a worker process. An entry expires at the token's exp (leeway is not
+    extended). Tokens without exp, CSRF-checked decodes and
+    allow_expired decodes are not cached.
+
+    Callers get a shallow copy of the cached claims.
+    """
+
+    def init_app(self, app, add_context_processor: bool = False) -> None:
+        super().init_app(app, add_context_processor)
+        max_size = app.config.get('JWT_DECODE_CACHE_SIZE', 10000)
+        if max_size > 0 and not decode_hook_supported():
+            print("⚠️ JWT decode cache disabled: this Flask-JWT-Extended version has another decode hook")
+            max_size = 0
+        app.extensions[CACHE_EXTENSION] = TTLCache(max_size=max_size, ttl_seconds=0) if max_size > 0 else None
+
+    def _decode_jwt_from_config(self, encoded_token: str, *args, **kwargs) -> dict:
+        # args: csrf_value, allow_expired (see DECODE_HOOK_PARAMETERS)
+        cache = current_app.extensions.get(CACHE_EXTENSION)
+        if cache is None or any(args) or any(kwargs.values()):
+            return super()._decode_jwt_from_config(encoded_token, *args, **kwargs)
+
+        key = token_digest(encoded_token)
+        claims = cache.get(key)
+        if claims is MISSING:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            ttl = claims['exp'] - time.time() if 'exp' in claims else 0
+            if ttl > 0:
+                cache.set(key, claims, ttl_seconds=ttl)
+        return dict(claims)
+
+    def cache_stats(self) -> Optional[dict]:
+        """Counters of the current app's cache, or None when disabled"""
+        cache = current_app.extensions.get(CACHE_EXTENSION)
+        return cache.stats() if cache is not None else None
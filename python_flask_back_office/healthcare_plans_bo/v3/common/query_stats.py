@@ -0,0 +1,280 @@
+"""
+SQL Query Statistics for V3
+
+SQLAlchemy engine event hooks that show what each request asks of the
+database:
+
+- per request: statement count, total DB time and the slowest statement,
+  added up per endpoint (stats()) and, with QUERY_STATS_SERVER_TIMING,
+  sent back in a Server-Timing header
+- slow-query log: a statement taking QUERY_SLOW_THRESHOLD_MS or more
+  (0 = off) is printed as normalized SQL (literals and IN lists folded,
+  whitespace collapsed), never with its parameters
+- N+1 suspects: a normalized statement run QUERY_N_PLUS_ONE_THRESHOLD
+  times or more in one request (typically a lazy load inside a loop) is
+  printed once for that request and counted per endpoint
+
+Statements outside a request (background flushes, CLI commands) only go
+to the slow-query log.
+
+In tests, assert_max_queries locks in the query budget of an endpoint:
+
+    with assert_max_queries(3):
+        response = client.post('/api/v3/customers/login', json=credentials)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# Query logs collecting the statements of this thread (request, test block)
+_active: ContextVar[Tuple['QueryLog', ...]] = ContextVar('query_logs', default=())
+
+# Statements at least this slow are printed; off until an app enables it
+_slow_seconds = float('inf')
+
+_install_lock = threading.Lock()
+_installed = False
+
+# Engine attribute holding the _observe of every copy of this module in the
+# process (v2 and v3 both hook the Engine class, and only the first
+# do_execute hook runs a statement)
+_OBSERVERS = '_query_stats_observers'
+_observers: List[Callable[[str, float], None]] = []
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Shape of a statement: literals become ?, IN lists IN (?), whitespace one space"""
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _IN_LIST.sub('IN (?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryLog:
+    """Statements run while it is active: count, time, slowest and shapes"""
+    __slots__ = ('count', 'seconds', 'slowest', 'slowest_seconds', 'slow', 'shapes', 'statements')
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest: Optional[str] = None
+        self.slowest_seconds = 0.0
+        self.slow = 0
+        self.shapes: Counter = Counter()
+        self.statements = [] if keep_statements else None
+
+    def record(self, shape: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[shape] += 1
+        if seconds > self.slowest_seconds:
+            self.slowest, self.slowest_seconds = shape, seconds
+        if seconds >= _slow_seconds:
+            self.slow += 1
+        if self.statements is not None:
+            self.statements.append(shape)
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Shapes run at least threshold times"""
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+def _install() -> None:
+    """Time the statements of every engine (once per process)"""
+    global _installed, _observers
+    with _install_lock:
+        if not _installed:
+            observers = getattr(Engine, _OBSERVERS, None)
+            if observers is None:
+                observers = []
+                setattr(Engine, _OBSERVERS, observers)
+                event.listen(Engine, 'do_execute', _do_execute)
+                event.listen(Engine, 'do_execute_no_params', _do_execute_no_params)
+                event.listen(Engine, 'do_executemany', _do_executemany)
+            observers.append(_observe)
+            _observers = observers
+            _installed = True
+
+
+# Dialect-level hooks run the statement themselves (returning True tells
+# SQLAlchemy it has been executed). Connection-level cursor_execute events
+# would do the same job but cost ~15us more per statement.
+
+def _do_execute(cursor, statement, parameters, context) -> bool:
+    started = time.perf_counter()
+    try:
+        context.dialect.do_execute(cursor, statement, parameters, context)
+    finally:
+        seconds = time.perf_counter() - started
+        for observe in _observers:
+            observe(statement, seconds)
+    return True
+
+
+def _do_execute_no_params(cursor, statement, context) -> bool:
+    started = time.perf_counter()
+    try:
+        context.dialect.do_execute_no_params(cursor, statement, context)
+    finally:
+        seconds = time.perf_counter() - started
+        for observe in _observers:
+            observe(statement, seconds)
+    return True
+
+
+def _do_executemany(cursor, statement, parameters, context) -> bool:
+    started = time.perf_counter()
+    try:
+        context.dialect.do_executemany(cursor, statement, parameters, context)
+    finally:
+        seconds = time.perf_counter() - started
+        for observe in _observers:
+            observe(statement, seconds)
+    return True
+
+
+def _observe(statement: str, seconds: float) -> None:
+    logs = _active.get()
+    if not logs and seconds < _slow_seconds:
+        return
+    shape = normalize_sql(statement)
+    for log in logs:
+        log.record(shape, seconds)
+    if seconds >= _slow_seconds:
+        print(f"⚠️ Slow query ({seconds * 1000:.1f} ms): {shape}")
+
+
+@contextmanager
+def assert_max_queries(n: int) -> Iterator[QueryLog]:
+    """
+    Fail with AssertionError when the block runs more than n SQL
+    statements (in this thread, so background flushes are not counted).
+    The error lists the statements; the QueryLog is yielded for finer
+    assertions.
+    """
+    _install()
+    log = QueryLog(keep_statements=True)
+    token = _active.set(_active.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active.reset(token)
+    if log.count > n:
+        listing = '\n'.join(f'  {number}. {shape}' for number, shape in enumerate(log.statements, 1))
+        raise AssertionError(f'{log.count} SQL statements, expected at most {n}:\n{listing}')
+
+
+class QueryStats:
+    """
+    Flask extension keeping a QueryLog per request and per-endpoint
+    counters of this worker. The log of a streamed response stays active
+    until the server closes the response, so statements run while the
+    body is produced count for its endpoint too.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.server_timing = False
+        self.n_plus_one_threshold = 5
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, dict] = {}
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config and instrument every request"""
+        global _slow_seconds
+        self.enabled = app.config.get('QUERY_STATS_ENABLED', True)
+        self.server_timing = app.config.get('QUERY_STATS_SERVER_TIMING', False)
+        self.n_plus_one_threshold = app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        self._endpoints = {}
+        if self.enabled:
+            threshold_ms = app.config.get('QUERY_SLOW_THRESHOLD_MS', 100)
+            _slow_seconds = threshold_ms / 1000.0 if threshold_ms > 0 else float('inf')
+            _install()
+            app.before_request(self._start)
+            app.after_request(self._after_request)
+            app.teardown_request(self._finish)
+
+    def stats(self) -> dict:
+        """Per-endpoint statement counts and DB time of this worker"""
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    'requests': counters['requests'],
+                    'avg_statements': round(counters['statements'] / counters['requests'], 2),
+                    'max_statements': counters['max_statements'],
+                    'avg_db_ms': round(1000 * counters['seconds'] / counters['requests'], 2),
+                    'slowest_ms': round(1000 * counters['slowest_seconds'], 2),
+                    'slowest': counters['slowest'],
+                    'slow_statements': counters['slow'],
+                    'n_plus_one_requests': counters['n_plus_one'],
+                    'n_plus_one_example': counters['n_plus_one_example']
+                }
+                for endpoint, counters in sorted(self._endpoints.items())
+            }
+        return {'enabled': self.enabled, 'endpoints': endpoints}
+
+    def _start(self) -> None:
+        log = QueryLog()
+        g._query_log = (log, _active.set(_active.get() + (log,)))
+
+    def _after_request(self, response):
+        if '_query_log' not in g:
+            return response
+        if response.is_streamed:
+            # The body runs after teardown: finish when the server closes it
+            entry, endpoint = g.pop('_query_log'), request.endpoint or '<unmatched>'
+            response.call_on_close(lambda: self._close(entry, endpoint))
+        elif self.server_timing:
+            log = g._query_log[0]
+            response.headers.add('Server-Timing', f'db;dur={log.seconds * 1000:.1f};desc="{log.count} queries"')
+        return response
+
+    def _finish(self, error=None) -> None:
+        entry = g.pop('_query_log', None)
+        if entry is not None:
+            self._close(entry, request.endpoint or '<unmatched>')
+
+    def _close(self, entry: Tuple[QueryLog, Token], endpoint: str) -> None:
+        log, token = entry
+        try:
+            _active.reset(token)
+        except ValueError:
+            # Closed in another context than the one the request ran in
+            _active.set(tuple(active for active in _active.get() if active is not log))
+        repeated = log.repeated(self.n_plus_one_threshold)
+        for shape, count in repeated.items():
+            print(f"⚠️ Possible N+1 in {endpoint}: {count}x {shape}")
+
+        with self._lock:
+            counters = self._endpoints.get(endpoint)
+            if counters is None:
+                counters = self._endpoints[endpoint] = {
+                    'requests': 0, 'statements': 0, 'max_statements': 0, 'seconds': 0.0,
+                    'slowest_seconds': 0.0, 'slowest': None, 'slow': 0,
+                    'n_plus_one': 0, 'n_plus_one_example': None
+                }
+            counters['requests'] += 1
+            counters['statements'] += log.count
+            counters['max_statements'] = max(counters['max_statements'], log.count)
+            counters['seconds'] += log.seconds
+            counters['slow'] += log.slow
+            if log.slowest_seconds > counters['slowest_seconds']:
+                counters['slowest_seconds'], counters['slowest'] = log.slowest_seconds, log.slowest
+            if repeated:
+                counters['n_plus_one'] += 1
+                counters['n_plus_one_example'] = max(repeated, key=repeated.get)
@@ -0,0 +1,79 @@
+"""
+Token Verifier for V3
+
+Verify-only helper for services that trust this API's access tokens
+without calling it: signatures are checked against the published JWK Set
+(/.well-known/jwks.json, see jwt_keys). Needs PyJWT with cryptography, and
+nothing from Flask or this app, so the file can be copied as is:
+
+    verifier = TokenVerifier.from_url('https://api.example.com/.well-known/jwks.json')
+    claims = verifier.verify(bearer_token)   # raises jwt.InvalidTokenError
+    customer_id = int(claims['sub'])
+
+from_url fetches the key set once per `lifespan` seconds and again when a
+token names an unknown kid (a rotated key), so verification is local for
+all other requests. from_jwks verifies fully offline against a saved copy.
+
+Revocation is not visible to verifiers; only refresh tokens are revoked,
+and those are rejected here by the token type check.
+"""
+
+import json
+from typing import Callable, Optional, Sequence, Union
+
+import jwt
+from jwt import PyJWK, PyJWKClient, PyJWKSet
+
+DEFAULT_ALGORITHMS = ('RS256', 'EdDSA')
+
+
+class TokenVerifier:
+    """Checks signature, exp/nbf/iat, and the token type of issued JWTs"""
+
+    def __init__(self, get_key: Callable[[str], PyJWK], algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+                 token_type: Optional[str] = 'access', issuer: Optional[str] = None,
+                 audience: Optional[str] = None, leeway: float = 0):
+        self._get_key = get_key
+        self.algorithms = list(algorithms)
+        self.token_type = token_type
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+
+    @classmethod
+    def from_url(cls, jwks_url: str, lifespan: float = 3600, timeout: float = 5, **kwargs) -> 'TokenVerifier':
+        """Keys fetched from jwks_url and cached for lifespan seconds"""
+        client = PyJWKClient(jwks_url, cache_keys=True, lifespan=lifespan, timeout=timeout)
+        return cls(client.get_signing_key_from_jwt, **kwargs)
+
+    @classmethod
+    def from_jwks(cls, jwks: Union[dict, str], **kwargs) -> 'TokenVerifier':
+        """Keys from a JWK Set dict or JSON document (no network)"""
+        keyset = PyJWKSet.from_dict(json.loads(jwks) if isinstance(jwks, str) else jwks)
+
+        def get_key(token):
+            kid = jwt.get_unverified_header(token).get('kid')
+            try:
+                return keyset[kid]
+            except KeyError:
+                raise jwt.InvalidTokenError(f'Unknown signing key {kid!r}')
+
+        return cls(get_key, **kwargs)
+
+    def verify(self, token: str) -> dict:
+        """Verified claims of token; raises jwt.InvalidTokenError (or PyJWKClientError)"""
+        key = self._get_key(token)
+        if jwt.get_unverified_header(token).get('alg') != key.algorithm_name:
+            raise jwt.InvalidTokenError('Token algorithm does not match its signing key')
+        claims = jwt.decode(
+            token,
+            key.key,
+            algorithms=self.algorithms,
+            issuer=self.issuer,
+            audience=self.audience,
+            leeway=self.leeway,
+            options={'require': ['exp', 'sub'], 'verify_aud': self.audience is not None}
+        )
+        if self.token_type is not None and claims.get('type', 'access') != self.token_type:
+            raise jwt.InvalidTokenError(f'Expected a token of type {self.token_type!r}')
+        return claims
@@ -0,0 +1,110 @@
+"""
+TTL LRU Cache for V3
+
+Thread-safe, size-bounded LRU cache with per-entry expiry and hit/miss/
+eviction counters.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Returned by get() when a key is absent or expired. A cached None is a hit.
+MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache whose entries expire after ttl_seconds.
+
+    Every delete()/clear() bumps a generation counter. Readers that load a
+    value from the backing store can capture `generation` before the load
+    and pass it to set(..., generation=...): the value is dropped if an
+    invalidation happened meanwhile, so a slow reader cannot re-cache data
+    older than a concurrent write.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._max_size = max(int(max_size), 1)
+        self._ttl = float(ttl_seconds)
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter (see class docstring)"""
+        return self._generation
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Any:
+        """Like get(), but without touching LRU order or counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                return MISSING
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None,
+            generation: Optional[int] = None) -> bool:
+        """Cache a value; returns False if skipped due to a newer generation"""
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, *keys: Hashable) -> None:
+        """Invalidate keys"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Invalidate everything"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Counters for monitoring"""
+        return {
+            'size': len(self._entries),
+            'max_size': self._max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
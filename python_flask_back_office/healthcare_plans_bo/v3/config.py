@@ -4,6 +4,7 @@ Supports local Docker MySQL and GCP Cloud SQL
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 
@@ -36,6 +37,98 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # Decoded token claims cached per worker until the token's exp
+    # (0 = verify every request)
+    JWT_DECODE_CACHE_SIZE = int(os.getenv('JWT_DECODE_CACHE_SIZE', '10000'))
+    
+    # Asymmetric signing (RS256 / EdDSA): <kid>.pem private keys in this
+    # directory, public halves served at /.well-known/jwks.json. Unset =
+    # HS256 with JWT_SECRET_KEY. See v3/common/jwt_keys.py for rotation.
+    JWT_SIGNING_KEYS_DIR = os.getenv('JWT_SIGNING_KEYS_DIR') or None
+    JWT_SIGNING_KID = os.getenv('JWT_SIGNING_KID') or None
+    # Keep accepting HS256 tokens while switching to a key set
+    JWT_ACCEPT_HS256_TOKENS = os.getenv('JWT_ACCEPT_HS256_TOKENS', 'false').lower() == 'true'
+    JWKS_MAX_AGE_SECONDS = int(os.getenv('JWKS_MAX_AGE_SECONDS', '3600'))
+    
+    # Password hashing process pool (0 workers = hash inline)
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '64'))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '5.0'))
+    
+    # Password hashing policy: KDF for new hashes and cost parameters per KDF.
+    # Tune with `flask calibrate-password-hash`; existing hashes are upgraded
+    # on the next successful login.
+    PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'scrypt')
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 32768, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 600000},
+        'argon2': {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4},
+        'bcrypt': {'rounds': 12}
+    }
+    
+    # Write-behind last_login updates (0 = write with the login's commit)
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS = float(os.getenv('LAST_LOGIN_FLUSH_INTERVAL_SECONDS', '5'))
+    LAST_LOGIN_FLUSH_MAX_BATCH = int(os.getenv('LAST_LOGIN_FLUSH_MAX_BATCH', '500'))
+    
+    # Revoked refresh token denylist (per worker): Bloom filter sizing, LRU
+    # of exact answers, and how often revocations by other workers are read
+    REVOCATION_FILTER_CAPACITY = int(os.getenv('REVOCATION_FILTER_CAPACITY', '100000'))
+    REVOCATION_FILTER_ERROR_RATE = float(os.getenv('REVOCATION_FILTER_ERROR_RATE', '0.001'))
+    REVOCATION_LRU_SIZE = int(os.getenv('REVOCATION_LRU_SIZE', '10000'))
+    REVOCATION_SYNC_INTERVAL_SECONDS = float(os.getenv('REVOCATION_SYNC_INTERVAL_SECONDS', '5'))
+    REVOCATION_REBUILD_INTERVAL_SECONDS = float(os.getenv('REVOCATION_REBUILD_INTERVAL_SECONDS', '3600'))
+    
+    # refresh_tokens lifecycle: active sessions kept per customer (oldest
+    # are revoked beyond it; 0 = no cap) and the chunked purge of expired
+    # rows (interval 0 = only via `flask purge-refresh-tokens`)
+    REFRESH_TOKENS_PER_CUSTOMER = int(os.getenv('REFRESH_TOKENS_PER_CUSTOMER', '10'))
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv('REFRESH_TOKEN_PURGE_INTERVAL_SECONDS', '3600'))
+    REFRESH_TOKEN_PURGE_CHUNK_SIZE = int(os.getenv('REFRESH_TOKEN_PURGE_CHUNK_SIZE', '1000'))
+    REFRESH_TOKEN_PURGE_PAUSE_SECONDS = float(os.getenv('REFRESH_TOKEN_PURGE_PAUSE_SECONDS', '0.1'))
+    
+    # Proxies in front of the app (Cloud Run's front end is one) whose
+    # X-Forwarded-For entry is trusted as the client address
+    # (request.remote_addr); 0 when clients connect directly
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', '1'))
+    
+    # Login throttling before the customer lookup and password KDF: token
+    # buckets per client IP (request.remote_addr, see PROXY_FIX_X_FOR) and
+    # per email (BURST attempts, refilling at PER_MINUTE), shared by the
+    # workers of a host through a SQLite file (empty path = per worker)
+    LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true'
+    LOGIN_THROTTLE_IP_BURST = int(os.getenv('LOGIN_THROTTLE_IP_BURST', '20'))
+    LOGIN_THROTTLE_IP_PER_MINUTE = float(os.getenv('LOGIN_THROTTLE_IP_PER_MINUTE', '10'))
+    LOGIN_THROTTLE_EMAIL_BURST = int(os.getenv('LOGIN_THROTTLE_EMAIL_BURST', '5'))
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE = float(os.getenv('LOGIN_THROTTLE_EMAIL_PER_MINUTE', '3'))
+    LOGIN_THROTTLE_STORE_PATH = os.getenv(
+        'LOGIN_THROTTLE_STORE_PATH', os.path.join(tempfile.gettempdir(), 'yhp-v3-login-throttle.sqlite3')
+    )
+    
+    # Bulkheads (per worker): concurrent requests admitted per endpoint
+    # class, how many more may wait for a slot, and for how long before a
+    # 503. Unlisted endpoints (/me, /health) are not limited.
+    BULKHEADS_ENABLED = os.getenv('BULKHEADS_ENABLED', 'true').lower() == 'true'
+    BULKHEADS = {
+        'credentials': {
+            'max_concurrent': int(os.getenv('BULKHEAD_CREDENTIALS_MAX_CONCURRENT', '2')),
+            'max_queue': int(os.getenv('BULKHEAD_CREDENTIALS_MAX_QUEUE', '8')),
+            'queue_timeout_seconds': float(os.getenv('BULKHEAD_CREDENTIALS_QUEUE_TIMEOUT_SECONDS', '2')),
+            'endpoints': ['customer.signup', 'customer.login', 'customer.change_password']
+        }
+    }
+    
+    # Prometheus metrics at /metrics (needs prometheus_client). Across
+    # gunicorn workers, set PROMETHEUS_MULTIPROC_DIR (see v3/common/metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # SQL statement counts per request: slow-query log threshold (0 = off), repeats
+    # of one statement shape that count as an N+1 suspect, and whether
+    # responses carry a Server-Timing header with the request's DB time
+    QUERY_STATS_ENABLED = os.getenv('QUERY_STATS_ENABLED', 'true').lower() == 'true'
+    QUERY_SLOW_THRESHOLD_MS = float(os.getenv('QUERY_SLOW_THRESHOLD_MS', '100'))
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', '5'))
+    QUERY_STATS_SERVER_TIMING = os.getenv('QUERY_STATS_SERVER_TIMING', 'false').lower() == 'true'
+    
     # Database Configuration
     SQLALCHEMY_DATABASE_URI = get_database_uri()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -49,6 +142,10 @@ class Config:
         'max_overflow': 10
     }
     
+    # X-Admin-Key of the /api/v3/admin endpoints; unset = those endpoints
+    # answer 503 (there is no default key)
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY') or None
+    
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
 
@@ -57,6 +154,13 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    QUERY_STATS_SERVER_TIMING = True
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 16384, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 100000},
+        'argon2': {'time_cost': 1, 'memory_cost': 19456, 'parallelism': 1},
+        'bcrypt': {'rounds': 10}
+    }
 
 
 class ProductionConfig(Config):
@@ -77,6 +181,18 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    PASSWORD_HASH_WORKERS = 0
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS = 0
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = 0
+    LOGIN_THROTTLE_STORE_PATH = ''
+    ADMIN_API_KEY = 'test-admin-key'
+    PASSWORD_HASHER_PARAMS = {
+        'scrypt': {'n': 1024, 'r': 8, 'p': 1},
+        'pbkdf2': {'hash_name': 'sha256', 'iterations': 1000},
+        'argon2': {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1},
+        'bcrypt': {'rounds': 4}
+    }
 
 
 # Config mapping
@@ -0,0 +1,77 @@
+"""
+Last Login Recorder for V3
+Write-behind batching of customers.last_login updates
+"""
+
+from datetime import datetime
+from sqlalchemy import bindparam, update
+
+from v3.extensions import db
+from v3.common.write_behind import WriteBehindBuffer
+
+
+class LastLoginRecorder:
+    """
+    Collects (customer_id, timestamp) per worker, coalesces repeats and
+    writes them with one executemany UPDATE per batch
+    (LAST_LOGIN_FLUSH_MAX_BATCH) or interval (LAST_LOGIN_FLUSH_INTERVAL_SECONDS).
+    last_login lags by at most the flush interval; 0 writes synchronously
+    with the caller's commit.
+    """
+    
+    def __init__(self, app=None):
+        self._app = None
+        self._buffer = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure from Flask app config"""
+        if self._buffer is not None:
+            self._buffer.close()
+        self._app = app
+        interval = app.config.get('LAST_LOGIN_FLUSH_INTERVAL_SECONDS', 0)
+        self._buffer = None
+        if interval > 0:
+            self._buffer = WriteBehindBuffer(
+                self._write,
+                max_items=app.config.get('LAST_LOGIN_FLUSH_MAX_BATCH', 500),
+                flush_interval=interval,
+                name='last-login-recorder'
+            )
+    
+    def record(self, customer_id, logged_in_at=None):
+        """Record a successful login"""
+        logged_in_at = logged_in_at or datetime.utcnow()
+        if self._buffer is None:
+            db.session.execute(self._statement(), [
+                {'b_id': customer_id, 'b_last_login': logged_in_at}
+            ])
+        else:
+            self._buffer.record(customer_id, logged_in_at)
+    
+    def flush(self):
+        """Write pending logins now"""
+        return self._buffer.flush() if self._buffer is not None else 0
+    
+    def _write(self, last_logins):
+        """Flush callback (runs on the buffer thread)"""
+        with self._app.app_context():
+            db.session.execute(self._statement(), [
+                {'b_id': customer_id, 'b_last_login': logged_in_at}
+                for customer_id, logged_in_at in last_logins.items()
+            ])
+            db.session.commit()
+    
+    @staticmethod
+    def _statement():
+        """UPDATE of last_login only; a login does not bump updated_at"""
+        customers = db.metadata.tables['customers']
+        return (
+            update(customers)
+            .where(customers.c.id == bindparam('b_id'))
+            .values(last_login=bindparam('b_last_login'), updated_at=customers.c.updated_at)
+        )
+
+
+last_login_recorder = LastLoginRecorder()
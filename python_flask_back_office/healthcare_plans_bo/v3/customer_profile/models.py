@@ -4,8 +4,12 @@ MySQL-compatible models
 """
 
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from v3.extensions import db
+from sqlalchemy import select, update
+from sqlalchemy.orm import deferred
+from sqlalchemy.orm.attributes import set_committed_value
+from v3.extensions import db, hash_executor
+from v3.common.sparse_fields import FieldSet
+from v3.customer_profile.last_login import last_login_recorder
 
 
 class Customer(db.Model):
@@ -20,7 +24,8 @@ class Customer(db.Model):
     last_name = db.Column(db.String(100), nullable=False)
     mobile_number = db.Column(db.String(20), nullable=True)
     date_of_birth = db.Column(db.Date, nullable=True)
-    address = db.Column(db.Text, nullable=True)
+    # Deferred: undefer(Customer.address) where the full profile is returned
+    address = deferred(db.Column(db.Text, nullable=True))
     city = db.Column(db.String(100), nullable=True)
     state = db.Column(db.String(100), nullable=True)
     zip_code = db.Column(db.String(20), nullable=True)
@@ -40,17 +45,34 @@ class Customer(db.Model):
                 setattr(self, key, value)
     
     def set_password(self, password):
-        """Hash and set the password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set the password (KDF runs on the hashing process pool)"""
+        self.password_hash = hash_executor.hash(password)
     
     def check_password(self, password):
-        """Verify password against hash"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify password against hash (KDF runs on the hashing process pool).
+        
+        After a successful verify, a hash created under an older hashing
+        policy is replaced with one for the current policy; it is saved with
+        the caller's next commit.
+        """
+        if not hash_executor.verify(self.password_hash, password):
+            return False
+        if hash_executor.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
     
     def update_last_login(self):
-        """Update last login timestamp"""
-        self.last_login = datetime.utcnow()
-        db.session.commit()
+        """
+        Update last login timestamp.
+        
+        The write goes through the write-behind recorder instead of a commit
+        here; the in-memory value is set as committed state so it shows in
+        to_dict() without making the row dirty.
+        """
+        now = datetime.utcnow()
+        set_committed_value(self, 'last_login', now)
+        last_login_recorder.record(self.id, now)
     
     def to_dict(self):
         """Convert model to dictionary"""
@@ -72,20 +94,74 @@ class Customer(db.Model):
             'last_login': self.last_login.isoformat() if self.last_login else None
         }
     
+    @classmethod
+    def load_fields(cls, customer_id, fields):
+        """
+        Serialize only the given PROFILE_FIELDSET fields of one customer,
+        reading just their columns (no Customer instance is built).
+        """
+        columns = PROFILE_FIELDSET.columns(fields)
+        row = db.session.execute(
+            select(*(getattr(cls, column) for column in columns)).where(cls.id == customer_id)
+        ).mappings().first()
+        return PROFILE_FIELDSET.serializer(fields)(row) if row is not None else None
+    
+    @classmethod
+    def load_version(cls, customer_id):
+        """(updated_at, last_login) of one customer, or None if not found"""
+        return db.session.execute(
+            select(cls.updated_at, cls.last_login).where(cls.id == customer_id)
+        ).first()
+    
+    @classmethod
+    def lock_version(cls, customer_id, expected_updated_at):
+        """
+        Compare-and-set guard for If-Match: a no-op UPDATE matching only the
+        expected updated_at, which takes the row lock for the rest of the
+        transaction. Returns False if the customer changed since then.
+        """
+        with db.session.no_autoflush:
+            result = db.session.execute(
+                update(cls.__table__)
+                .where(cls.__table__.c.id == customer_id,
+                       cls.__table__.c.updated_at == expected_updated_at)
+                .values(updated_at=cls.__table__.c.updated_at)
+            )
+        return result.rowcount > 0
+    
     def __repr__(self):
         return f'<Customer {self.email}>'
 
 
+# Allowlist for ?fields= on GET /me (same fields as Customer.to_dict)
+PROFILE_FIELDSET = FieldSet(
+    fields=('id', 'email', 'first_name', 'last_name', 'mobile_number', 'date_of_birth',
+            'address', 'city', 'state', 'zip_code', 'is_active', 'is_verified',
+            'created_at', 'updated_at', 'last_login'),
+    temporal=('date_of_birth', 'created_at', 'updated_at', 'last_login')
+)
+
+
 class RefreshToken(db.Model):
-    """Refresh token storage for JWT"""
+    """
+    Issued refresh tokens, identified by their JWT ID (jti claim); the
+    encoded token itself is not stored.
+    """
     
     __tablename__ = 'refresh_tokens'
+    __table_args__ = (
+        # Logout's revoke and the per-customer session cap
+        db.Index('ix_refresh_tokens_customer_revoked', 'customer_id', 'is_revoked'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customers.id', ondelete='CASCADE'), nullable=False)
-    token = db.Column(db.String(500), unique=True, nullable=False, index=True)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    # Indexed for the chunked purge of expired rows
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     is_revoked = db.Column(db.Boolean, default=False, nullable=False)
+    # Set together with is_revoked; workers sync their denylist on it
+    revoked_at = db.Column(db.DateTime, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationship
@@ -3,18 +3,32 @@ Customer Profile Routes for V3
 RESTful API endpoints for customer management
 """
 
-from flask import Blueprint, request, jsonify
+import math
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import (
     create_access_token, 
     create_refresh_token, 
+    decode_token,
     jwt_required, 
     get_jwt_identity,
     get_jwt
 )
 from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
 
-from v3.extensions import db
-from v3.customer_profile.models import Customer, RefreshToken
+from v3.extensions import db, login_throttle
+from v3.common.metrics import timed_stage
+from v3.common.conditional import (
+    PreconditionFailedError, make_etag, if_match_timestamp,
+    is_not_modified, set_validators, not_modified
+)
+from v3.common.password_hashing import PasswordHashingError
+from v3.common.sparse_fields import InvalidFieldsError
+from v3.customer_profile.models import Customer, RefreshToken, PROFILE_FIELDSET
+from v3.customer_profile.token_denylist import token_denylist
+from v3.customer_profile.token_maintenance import evict_oldest_sessions
 
 customer_bp = Blueprint('customer', __name__)
 
@@ -26,21 +40,14 @@ def signup():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['email', 'password', 'first_name', 'last_name']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
-        
-        # Check if email already exists
-        existing_customer = Customer.query.filter_by(email=data['email'].lower()).first()
-        if existing_customer:
+        with timed_stage('signup', 'validate'):
+            required_fields = ['email', 'password', 'first_name', 'last_name']
+            missing = next((field for field in required_fields if not data.get(field)), None)
+        if missing:
             return jsonify({
                 'success': False,
-                'message': 'Email already registered'
-            }), 409
+                'message': f'{missing} is required'
+            }), 400
         
         # Validate password strength
         password = data['password']
@@ -50,40 +57,60 @@ def signup():
                 'message': 'Password must be at least 8 characters long'
             }), 400
         
-        # Create new customer
-        customer = Customer(
-            email=data['email'],
-            password=password,
-            first_name=data['first_name'],
-            last_name=data['last_name'],
-            mobile_number=data.get('mobile_number'),
-            date_of_birth=data.get('date_of_birth'),
-            address=data.get('address'),
-            city=data.get('city'),
-            state=data.get('state'),
-            zip_code=data.get('zip_code')
-        )
-        
+        # Create new customer (the KDF runs before any transaction is opened)
+        with timed_stage('signup', 'hash'):
+            customer = Customer(
+                email=data['email'],
+                password=password,
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                mobile_number=data.get('mobile_number'),
+                date_of_birth=data.get('date_of_birth'),
+                address=data.get('address'),
+                city=data.get('city'),
+                state=data.get('state'),
+                zip_code=data.get('zip_code')
+            )
+        
+        # Insert; the unique index on email rejects duplicates atomically
         db.session.add(customer)
-        db.session.commit()
+        try:
+            with timed_stage('signup', 'dao'):
+                db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': 'Email already registered'
+            }), 409
         
         # Generate tokens
-        access_token = create_access_token(identity=str(customer.id))
-        refresh_token = create_refresh_token(identity=str(customer.id))
+        with timed_stage('signup', 'token'):
+            access_token = create_access_token(identity=str(customer.id))
+            refresh_token = create_refresh_token(identity=str(customer.id))
         
-        # Store refresh token
-        store_refresh_token(customer.id, refresh_token)
+        # Customer and refresh token are saved in one commit
+        with timed_stage('signup', 'dao'):
+            add_refresh_token(customer.id, refresh_token)
+            customer_data = customer.to_dict()
+            db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Registration successful',
             'data': {
-                'customer': customer.to_dict(),
+                'customer': customer_data,
                 'access_token': access_token,
                 'refresh_token': refresh_token
             }
         }), 201
         
+    except PasswordHashingError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -94,7 +121,13 @@ def signup():
 
 @customer_bp.route('/login', methods=['POST'])
 def login():
-    """Authenticate customer and return tokens"""
+    """
+    Authenticate customer and return tokens
+    
+    429 with Retry-After when this IP or email made too many attempts
+    (LOGIN_THROTTLE_*), before the customer is looked up or the password
+    hashed.
+    """
     try:
         data = request.get_json()
         
@@ -105,10 +138,22 @@ def login():
                 'message': 'Email and password are required'
             }), 400
         
+        retry_after = login_throttle.check(request.remote_addr, data['email'])
+        if retry_after:
+            response = jsonify({
+                'success': False,
+                'message': 'Too many login attempts. Please try again later.'
+            })
+            response.headers['Retry-After'] = str(math.ceil(retry_after))
+            return response, 429
+        
         # Find customer
-        customer = Customer.query.filter_by(email=data['email'].lower()).first()
+        with timed_stage('login', 'dao'):
+            customer = Customer.query.options(undefer(Customer.address)).filter_by(email=data['email'].lower()).first()
         
-        if not customer or not customer.check_password(data['password']):
+        with timed_stage('login', 'hash'):
+            password_ok = customer is not None and customer.check_password(data['password'])
+        if not password_ok:
             return jsonify({
                 'success': False,
                 'message': 'Invalid email or password'
@@ -124,22 +169,32 @@ def login():
         customer.update_last_login()
         
         # Generate tokens
-        access_token = create_access_token(identity=str(customer.id))
-        refresh_token = create_refresh_token(identity=str(customer.id))
+        with timed_stage('login', 'token'):
+            access_token = create_access_token(identity=str(customer.id))
+            refresh_token = create_refresh_token(identity=str(customer.id))
+        
+        # Serialize before the commit expires the loaded attributes
+        customer_data = customer.to_dict()
         
         # Store refresh token
-        store_refresh_token(customer.id, refresh_token)
+        with timed_stage('login', 'dao'):
+            store_refresh_token(customer.id, refresh_token)
         
         return jsonify({
             'success': True,
             'message': 'Login successful',
             'data': {
-                'customer': customer.to_dict(),
+                'customer': customer_data,
                 'access_token': access_token,
                 'refresh_token': refresh_token
             }
         }), 200
         
+    except PasswordHashingError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -150,22 +205,59 @@ def login():
 @customer_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_profile():
-    """Get current customer's profile"""
+    """
+    Get current customer's profile
+    
+    ?fields=first_name,last_name,email returns only those fields and reads
+    only their columns.
+    
+    The response carries ETag and Last-Modified; with a matching
+    If-None-Match / If-Modified-Since an empty 304 is returned after a
+    single (updated_at, last_login) lookup.
+    """
     try:
-        customer_id = get_jwt_identity()
-        customer = Customer.query.get(int(customer_id))
+        customer_id = int(get_jwt_identity())
+        fields = PROFILE_FIELDSET.parse(request.args.get('fields'))
         
-        if not customer:
+        with timed_stage('get_profile', 'dao'):
+            version = Customer.load_version(customer_id)
+        if version is None:
             return jsonify({
                 'success': False,
                 'message': 'Customer not found'
             }), 404
         
-        return jsonify({
+        # last_login is part of the representation but does not bump updated_at
+        updated_at, last_login = version
+        etag = make_etag(customer_id, updated_at, last_login, variant=fields)
+        last_modified = max(updated_at, last_login or updated_at)
+        if is_not_modified(etag, last_modified):
+            return not_modified(etag, last_modified)
+        
+        with timed_stage('get_profile', 'dao'):
+            if fields:
+                data = Customer.load_fields(customer_id, fields)
+            else:
+                customer = Customer.query.options(undefer(Customer.address)).get(customer_id)
+                data = customer.to_dict() if customer else None
+        
+        if data is None:
+            return jsonify({
+                'success': False,
+                'message': 'Customer not found'
+            }), 404
+        
+        response = jsonify({
             'success': True,
-            'data': customer.to_dict()
-        }), 200
+            'data': data
+        })
+        return set_validators(response, etag, last_modified), 200
         
+    except InvalidFieldsError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -176,10 +268,21 @@ def get_profile():
 @customer_bp.route('/me', methods=['PUT'])
 @jwt_required()
 def update_profile():
-    """Update current customer's profile"""
+    """
+    Update current customer's profile
+    
+    With If-Match (an ETag from GET /me), the update is applied only if the
+    profile has not changed since; otherwise 412 is returned.
+    """
     try:
-        customer_id = get_jwt_identity()
-        customer = Customer.query.get(int(customer_id))
+        customer_id = int(get_jwt_identity())
+        expected_updated_at = if_match_timestamp(customer_id)
+        
+        if expected_updated_at is not None and not Customer.lock_version(customer_id, expected_updated_at):
+            db.session.rollback()
+            raise PreconditionFailedError('Profile was modified since it was last read')
+        
+        customer = Customer.query.options(undefer(Customer.address)).get(customer_id)
         
         if not customer:
             return jsonify({
@@ -197,14 +300,23 @@ def update_profile():
             if field in data:
                 setattr(customer, field, data[field])
         
+        # Serialize after the flush (so updated_at is current) but before
+        # the commit expires the instance, to avoid reloading it
+        db.session.flush()
+        customer_data = customer.to_dict()
         db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Profile updated successfully',
-            'data': customer.to_dict()
+            'data': customer_data
         }), 200
         
+    except PreconditionFailedError:
+        return jsonify({
+            'success': False,
+            'message': 'Profile was modified since it was last read'
+        }), 412
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -216,12 +328,18 @@ def update_profile():
 @customer_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
-    """Refresh access token"""
+    """
+    Refresh access token
+    
+    Revoked refresh tokens (see logout) are rejected with 401 before this
+    runs, by the JWT blocklist check.
+    """
     try:
         customer_id = get_jwt_identity()
         
         # Verify customer still exists and is active
-        customer = Customer.query.get(int(customer_id))
+        with timed_stage('refresh', 'dao'):
+            customer = Customer.query.get(int(customer_id))
         if not customer or not customer.is_active:
             return jsonify({
                 'success': False,
@@ -229,7 +347,8 @@ def refresh():
             }), 401
         
         # Generate new access token
-        access_token = create_access_token(identity=str(customer_id))
+        with timed_stage('refresh', 'token'):
+            access_token = create_access_token(identity=str(customer_id))
         
         return jsonify({
             'success': True,
@@ -248,16 +367,25 @@ def refresh():
 def logout():
     """Logout and revoke tokens"""
     try:
-        customer_id = get_jwt_identity()
+        customer_id = int(get_jwt_identity())
         
         # Revoke all refresh tokens for this customer
-        RefreshToken.query.filter_by(
-            customer_id=int(customer_id),
-            is_revoked=False
-        ).update({'is_revoked': True})
-        
+        jtis = db.session.scalars(
+            select(RefreshToken.jti).where(
+                RefreshToken.customer_id == customer_id,
+                RefreshToken.is_revoked.is_(False)
+            )
+        ).all()
+        db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.customer_id == customer_id, RefreshToken.is_revoked.is_(False))
+            .values(is_revoked=True, revoked_at=datetime.utcnow())
+        )
         db.session.commit()
         
+        # Other workers pick the revocations up on their next denylist sync
+        token_denylist.add(jtis)
+        
         return jsonify({
             'success': True,
             'message': 'Logged out successfully'
@@ -295,7 +423,9 @@ def change_password():
             }), 400
         
         # Verify current password
-        if not customer.check_password(data['current_password']):
+        with timed_stage('change_password', 'hash'):
+            password_ok = customer.check_password(data['current_password'])
+        if not password_ok:
             return jsonify({
                 'success': False,
                 'message': 'Current password is incorrect'
@@ -309,14 +439,22 @@ def change_password():
             }), 400
         
         # Update password
-        customer.set_password(data['new_password'])
-        db.session.commit()
+        with timed_stage('change_password', 'hash'):
+            customer.set_password(data['new_password'])
+        with timed_stage('change_password', 'dao'):
+            db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Password changed successfully'
         }), 200
         
+    except PasswordHashingError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -325,16 +463,34 @@ def change_password():
         }), 500
 
 
+def add_refresh_token(customer_id, token):
+    """
+    Add refresh token to the current session (saved by the caller's commit).
+    
+    With REFRESH_TOKENS_PER_CUSTOMER set, the customer's oldest sessions
+    beyond it are revoked; returns their jtis, for token_denylist.add()
+    after the commit.
+    """
+    evicted = []
+    max_sessions = current_app.config.get('REFRESH_TOKENS_PER_CUSTOMER', 0)
+    if max_sessions > 0:
+        evicted = evict_oldest_sessions(customer_id, keep=max_sessions - 1)
+    
+    claims = decode_token(token)
+    db.session.add(RefreshToken(
+        customer_id=customer_id,
+        jti=claims['jti'],
+        expires_at=datetime.utcfromtimestamp(claims['exp'])
+    ))
+    return evicted
+
+
 def store_refresh_token(customer_id, token):
     """Store refresh token in database"""
     try:
-        refresh_token = RefreshToken(
-            customer_id=customer_id,
-            token=token,
-            expires_at=datetime.utcnow() + timedelta(days=30)
-        )
-        db.session.add(refresh_token)
+        evicted = add_refresh_token(customer_id, token)
         db.session.commit()
+        token_denylist.add(evicted)
     except Exception as e:
         db.session.rollback()
         print(f"Failed to store refresh token: {e}")
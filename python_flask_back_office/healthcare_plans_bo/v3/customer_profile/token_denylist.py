@@ -0,0 +1,171 @@
+"""
+Refresh Token Denylist for V3
+Answers "is this jti revoked?" for the JWT blocklist check without a
+database query for the common case of a token that is not revoked.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import select
+
+from v3.extensions import db
+from v3.common.bloom_filter import BloomFilter
+from v3.customer_profile.models import RefreshToken
+
+# Re-read revocations this far behind the last sync, so rows committed
+# late (or stamped by a host with a slightly slower clock) are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenDenylist:
+    """
+    Per-worker view of the revoked jtis in refresh_tokens.
+
+    - A Bloom filter holds every revoked, unexpired jti. A jti it does not
+      contain is not revoked, and no query is made.
+    - An LRU keeps the exact answer for jtis the filter does contain
+      (revoked tokens presented again, and the rare false positive), so
+      those are only looked up once.
+    - At most every REVOCATION_SYNC_INTERVAL_SECONDS, one query on
+      revoked_at adds the jtis revoked since the last sync (by any worker);
+      revocations made by this worker are added right away with add().
+    - The filter is rebuilt from the table every
+      REVOCATION_REBUILD_INTERVAL_SECONDS, or once it holds more than its
+      capacity, which also drops expired jtis.
+
+    A token revoked by another worker is therefore accepted here for at
+    most the sync interval.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._answers: OrderedDict = OrderedDict()
+        self._watermark: Optional[datetime] = None
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self.capacity = 100000
+        self.error_rate = 0.001
+        self.lru_size = 10000
+        self.sync_interval = 5.0
+        self.rebuild_interval = 3600.0
+        self._checks = 0
+        self._lookups = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Configure from Flask app config (the filter is built on first use)"""
+        self.capacity = app.config.get('REVOCATION_FILTER_CAPACITY', 100000)
+        self.error_rate = app.config.get('REVOCATION_FILTER_ERROR_RATE', 0.001)
+        self.lru_size = app.config.get('REVOCATION_LRU_SIZE', 10000)
+        self.sync_interval = app.config.get('REVOCATION_SYNC_INTERVAL_SECONDS', 5.0)
+        self.rebuild_interval = app.config.get('REVOCATION_REBUILD_INTERVAL_SECONDS', 3600.0)
+        with self._lock:
+            self._filter = None
+            self._answers.clear()
+
+    def is_revoked(self, jti: str) -> bool:
+        """Whether jti belongs to a revoked refresh token (call within an app context)"""
+        self._refresh()
+        self._checks += 1
+        if jti not in self._filter:
+            return False
+
+        with self._lock:
+            revoked = self._answers.get(jti)
+            if revoked is not None:
+                self._answers.move_to_end(jti)
+                return revoked
+
+        self._lookups += 1
+        revoked = bool(db.session.execute(
+            select(RefreshToken.is_revoked).where(RefreshToken.jti == jti)
+        ).scalar())
+        with self._lock:
+            self._remember(jti, revoked)
+        return revoked
+
+    def add(self, jtis: Iterable[str]) -> None:
+        """Record jtis this worker has just revoked (after the commit)"""
+        with self._lock:
+            if self._filter is None:
+                return
+            for jti in jtis:
+                if jti not in self._filter:
+                    self._filter.add(jti)
+                self._remember(jti, True)
+
+    def stats(self) -> dict:
+        """Check counters: checks vs. those that needed a database lookup"""
+        return {
+            'checks': self._checks,
+            'lookups': self._lookups,
+            'revoked_in_filter': len(self._filter) if self._filter is not None else 0,
+            'cached_answers': len(self._answers)
+        }
+
+    def _remember(self, jti: str, revoked: bool) -> None:
+        """LRU insert (caller holds the lock)"""
+        self._answers[jti] = revoked
+        self._answers.move_to_end(jti)
+        while len(self._answers) > self.lru_size:
+            self._answers.popitem(last=False)
+
+    def _refresh(self) -> None:
+        """Rebuild or sync when due; only one thread does it at a time"""
+        now = time.monotonic()
+        current = self._filter
+        due_rebuild = (current is None or now - self._built_at >= self.rebuild_interval
+                       or len(current) > current.capacity)
+        if not due_rebuild and now - self._synced_at < self.sync_interval:
+            return
+        # The first build blocks; later refreshes are skipped while one runs
+        if not self._refresh_lock.acquire(blocking=current is None):
+            return
+        try:
+            if current is None and self._filter is not None:
+                return  # built by the thread we waited for
+            if due_rebuild:
+                self._rebuild(now)
+            else:
+                self._sync(now)
+        finally:
+            self._refresh_lock.release()
+
+    def _rebuild(self, now: float) -> None:
+        started_at = datetime.utcnow()
+        jtis = db.session.scalars(
+            select(RefreshToken.jti).where(
+                RefreshToken.is_revoked.is_(True),
+                RefreshToken.expires_at > started_at
+            )
+        ).all()
+        rebuilt = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate, jtis)
+        with self._lock:
+            self._filter = rebuilt
+            self._answers.clear()
+        self._watermark = started_at - SYNC_OVERLAP
+        self._built_at = self._synced_at = now
+
+    def _sync(self, now: float) -> None:
+        started_at = datetime.utcnow()
+        jtis = db.session.scalars(
+            select(RefreshToken.jti).where(RefreshToken.revoked_at >= self._watermark)
+        ).all()
+        with self._lock:
+            for jti in jtis:
+                if jti not in self._filter:
+                    self._filter.add(jti)
+                if jti in self._answers:
+                    self._answers[jti] = True
+        self._watermark = started_at - SYNC_OVERLAP
+        self._synced_at = now
+
+
+token_denylist = TokenDenylist()
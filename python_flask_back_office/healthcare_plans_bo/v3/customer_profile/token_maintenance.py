@@ -0,0 +1,168 @@
+"""
+Refresh Token Maintenance for V3
+Purging expired refresh_tokens rows and capping sessions per customer
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, func, select, text, update
+
+from v3.extensions import db
+from v3.customer_profile.models import RefreshToken
+
+
+def evict_oldest_sessions(customer_id, keep) -> List[str]:
+    """
+    Revoke the customer's active refresh tokens beyond the newest `keep`
+    (in the current transaction); returns their jtis for the denylist.
+
+    Evicted rows are revoked rather than deleted: the denylist is built from
+    revoked rows, so they stay until their token expires.
+    """
+    now = datetime.utcnow()
+    evicted = db.session.execute(
+        select(RefreshToken.id, RefreshToken.jti)
+        .where(RefreshToken.customer_id == customer_id,
+               RefreshToken.is_revoked.is_(False),
+               RefreshToken.expires_at > now)
+        .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+        .offset(keep)
+    ).all()
+    if evicted:
+        db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id.in_([row.id for row in evicted]))
+            .values(is_revoked=True, revoked_at=now)
+        )
+    return [row.jti for row in evicted]
+
+
+class RefreshTokenPurger:
+    """
+    Deletes refresh_tokens rows whose token has expired (revoked or not), in
+    chunks of REFRESH_TOKEN_PURGE_CHUNK_SIZE rows, one short transaction per
+    chunk with REFRESH_TOKEN_PURGE_PAUSE_SECONDS between them, so row locks
+    are held briefly and replicas keep up.
+
+    Each worker runs a purge every REFRESH_TOKEN_PURGE_INTERVAL_SECONDS on a
+    background thread (first run at a random point of the interval, so
+    workers do not line up); 0 leaves it to `flask purge-refresh-tokens`.
+    Concurrent purges are safe: each deletes the ids it selected.
+    """
+
+    def __init__(self, app=None):
+        self._app = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.interval = 0.0
+        self.chunk_size = 1000
+        self.pause = 0.1
+        self._runs = 0
+        self._deleted = 0
+        self._last_run = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure from Flask app config and start purging with the first request"""
+        self._stop.set()
+        self._stop = threading.Event()
+        self._thread = None
+        self._app = app
+        self.interval = app.config.get('REFRESH_TOKEN_PURGE_INTERVAL_SECONDS', 0)
+        self.chunk_size = app.config.get('REFRESH_TOKEN_PURGE_CHUNK_SIZE', 1000)
+        self.pause = app.config.get('REFRESH_TOKEN_PURGE_PAUSE_SECONDS', 0.1)
+        if self.interval > 0:
+            app.before_request(self._ensure_thread)
+
+    def purge(self, chunk_size=None, pause=None, stop: Optional[threading.Event] = None) -> dict:
+        """Delete expired rows now (call within an app context); returns the run's stats"""
+        chunk_size = chunk_size or self.chunk_size
+        pause = self.pause if pause is None else pause
+        cutoff = datetime.utcnow()
+        started = time.perf_counter()
+        deleted = chunks = 0
+
+        while stop is None or not stop.is_set():
+            ids = db.session.scalars(
+                select(RefreshToken.id).where(RefreshToken.expires_at < cutoff).limit(chunk_size)
+            ).all()
+            if not ids:
+                break
+            db.session.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+            db.session.commit()
+            deleted += len(ids)
+            chunks += 1
+            if len(ids) < chunk_size:
+                break
+            time.sleep(pause)
+
+        elapsed = time.perf_counter() - started
+        run = {
+            'finished_at': datetime.utcnow().isoformat(),
+            'deleted': deleted,
+            'chunks': chunks,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(deleted / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        with self._lock:
+            self._runs += 1
+            self._deleted += deleted
+            self._last_run = run
+        return run
+
+    def stats(self) -> dict:
+        """Table size and purge throughput (call within an app context)"""
+        table_rows = table_size()
+        with self._lock:
+            return {
+                'table_rows': table_rows,
+                'purge_runs': self._runs,
+                'purged_rows': self._deleted,
+                'last_purge': self._last_run
+            }
+
+    def _ensure_thread(self):
+        """Start the purge thread in this process (again after a fork)"""
+        if self._thread_pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._thread_pid != os.getpid() or self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(self._app, self._stop),
+                                                name='refresh-token-purger', daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def _run(self, app, stop):
+        """Purge on the interval until init_app is called again"""
+        delay = random.uniform(0, self.interval)
+        while not stop.wait(delay):
+            try:
+                with app.app_context():
+                    self.purge(stop=stop)
+            except Exception as e:
+                print(f"⚠️ refresh-token-purger: purge failed, will retry: {e}")
+            delay = self.interval
+
+
+def table_size() -> int:
+    """
+    Rows in refresh_tokens: the InnoDB estimate on MySQL (COUNT(*) scans
+    the whole index there), an exact count elsewhere.
+    """
+    if db.engine.dialect.name == 'mysql':
+        rows = db.session.execute(text(
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'refresh_tokens'"
+        )).scalar()
+        return int(rows or 0)
+    return db.session.execute(select(func.count()).select_from(RefreshToken)).scalar()
+
+
+refresh_token_purger = RefreshTokenPurger()
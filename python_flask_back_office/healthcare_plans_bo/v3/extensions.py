@@ -5,7 +5,19 @@ Centralized extension initialization
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from v3.common.bulkhead import Bulkheads
+from v3.common.jwt_keys import SigningKeys
+from v3.common.metrics import RequestMetrics
+from v3.common.password_hashing import PasswordHashExecutor
+from v3.common.query_stats import QueryStats
+from v3.common.rate_limit import LoginThrottle
 
 # Initialize extensions without app binding
 db = SQLAlchemy()
 migrate = Migrate()
+hash_executor = PasswordHashExecutor()
+signing_keys = SigningKeys()
+login_throttle = LoginThrottle()
+bulkheads = Bulkheads()
+request_metrics = RequestMetrics()
+query_stats = QueryStats()
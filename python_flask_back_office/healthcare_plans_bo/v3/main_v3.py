@@ -8,21 +8,29 @@ Supports:
 """
 
 import os
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 from datetime import timedelta
 
 from v3.config import Config
-from v3.extensions import db, migrate
+from v3.extensions import db, migrate, hash_executor, signing_keys, login_throttle, bulkheads, request_metrics, query_stats
+from v3.common.admin_auth import admin_key_required
+from v3.common.json_provider import FastJSONProvider
+from v3.common.jwt_cache import CachingJWTManager
 from v3.customer_profile.routes import customer_bp
 
 
 def create_app(config_class=Config):
     """Application factory pattern"""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(config_class)
     
+    # Client address from the X-Forwarded-For entries of trusted proxies
+    if app.config.get('PROXY_FIX_X_FOR', 0) > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
     # Initialize CORS FIRST - before other extensions
     CORS(app, 
          origins=['http://localhost:4200', 'http://localhost:3000', '*'],
@@ -30,12 +38,37 @@ def create_app(config_class=Config):
          allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
          supports_credentials=True)
     
+    if not app.config.get('ADMIN_API_KEY'):
+        print("⚠️ ADMIN_API_KEY is not set: admin endpoints answer 503")
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    hash_executor.init_app(app)
+    request_metrics.init_app(app)
+    query_stats.init_app(app)
+    login_throttle.init_app(app)
+    bulkheads.init_app(app)
+    
+    # Write-behind recorder for last_login
+    from v3.customer_profile.last_login import last_login_recorder
+    last_login_recorder.init_app(app)
+    
+    # Initialize JWT (decoded claims are cached until exp); revoked refresh
+    # tokens are rejected with 401
+    jwt = CachingJWTManager(app)
+    signing_keys.init_app(app, jwt)
+    
+    from v3.customer_profile.token_denylist import token_denylist
+    token_denylist.init_app(app)
+    
+    @jwt.token_in_blocklist_loader
+    def is_token_revoked(jwt_header, jwt_payload):
+        return token_denylist.is_revoked(jwt_payload['jti'])
     
-    # Initialize JWT
-    jwt = JWTManager(app)
+    # Background purge of expired refresh tokens
+    from v3.customer_profile.token_maintenance import refresh_token_purger
+    refresh_token_purger.init_app(app)
     
     # Register blueprints
     app.register_blueprint(customer_bp, url_prefix='/api/v3/customers')
@@ -62,6 +95,25 @@ def create_app(config_class=Config):
         
         return jsonify(health_status), 200 if health_status['status'] == 'healthy' else 503
     
+    # Public signing keys, for services verifying tokens themselves
+    @app.route('/.well-known/jwks.json', methods=['GET'])
+    def jwks():
+        """JSON Web Key Set (empty while tokens are HS256-signed)"""
+        response = jsonify(signing_keys.jwks())
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config.get('JWKS_MAX_AGE_SECONDS', 3600)
+        response.add_etag()
+        return response.make_conditional(request)
+    
+    # Prometheus metrics, for scraping from inside the network
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus text exposition (404 when METRICS_ENABLED is off or prometheus_client is missing)"""
+        if not request_metrics.enabled:
+            return jsonify({'error': 'Metrics are disabled'}), 404
+        body, content_type = request_metrics.exposition()
+        return Response(body, content_type=content_type)
+    
     # Admin migration endpoint (for Cloud Run)
     @app.route('/api/v3/admin/migrate', methods=['POST'])
     def run_migrations():
@@ -82,6 +134,33 @@ def create_app(config_class=Config):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/api/v3/admin/refresh-tokens/stats', methods=['GET'])
+    @admin_key_required
+    def refresh_token_stats():
+        """refresh_tokens size, purge throughput and this worker's denylist (protected endpoint)"""
+        try:
+            return jsonify({
+                **refresh_token_purger.stats(),
+                'denylist': token_denylist.stats()
+            }), 200
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @app.route('/api/v3/admin/bulkheads/stats', methods=['GET'])
+    @admin_key_required
+    def bulkhead_stats():
+        """Occupancy, queue depth and rejections of this worker's bulkheads (protected endpoint)"""
+        return jsonify(bulkheads.stats()), 200
+    
+    @app.route('/api/v3/admin/queries/stats', methods=['GET'])
+    @admin_key_required
+    def query_stats_report():
+        """SQL statements and DB time per endpoint, slow statements and N+1 suspects of this worker (protected endpoint)"""
+        return jsonify(query_stats.stats()), 200
+    
+    # CLI commands
+    register_commands(app)
+    
     # Database initialization
     with app.app_context():
         try:
@@ -105,6 +184,66 @@ def create_app(config_class=Config):
     return app
 
 
+def register_commands(app):
+    """Register Flask CLI commands"""
+    import click
+    from v3.common.jwt_keys import ALGORITHMS, generate_signing_key
+    from v3.common.password_hashers import HASHERS, calibrate
+    
+    @app.cli.command('calibrate-password-hash')
+    @click.option('--hasher', 'hasher_name', type=click.Choice(sorted(HASHERS)),
+                  default=lambda: app.config.get('PASSWORD_HASHER', 'scrypt'),
+                  help='KDF to calibrate (defaults to PASSWORD_HASHER).')
+    @click.option('--target-ms', type=float, default=250.0, show_default=True,
+                  help='Target time for a single hash on this host.')
+    @click.option('--samples', type=int, default=3, show_default=True,
+                  help='Hashes measured per cost step (median is used).')
+    def calibrate_password_hash(hasher_name, target_ms, samples):
+        """Measure KDF cost on this host and recommend hashing parameters"""
+        recommended, measurements = calibrate(hasher_name, target_ms, samples)
+        
+        click.echo(f"Calibrating '{hasher_name}' for a target of {target_ms:.0f} ms per hash")
+        for params, elapsed_ms in measurements:
+            marker = '  <- recommended' if params == recommended else ''
+            click.echo(f"  {params}: {elapsed_ms:8.1f} ms{marker}")
+        
+        if recommended is None:
+            click.echo('Even the cheapest step exceeds the target; consider a larger target.')
+            return
+        click.echo('')
+        click.echo('Set in v3/config.py:')
+        click.echo(f"    PASSWORD_HASHER = '{hasher_name}'")
+        click.echo(f"    PASSWORD_HASHER_PARAMS['{hasher_name}'] = {recommended}")
+    
+    @app.cli.command('generate-jwt-key')
+    @click.option('--algorithm', type=click.Choice(ALGORITHMS), default='EdDSA', show_default=True,
+                  help='Key type: RSA 2048 (RS256) or Ed25519 (EdDSA).')
+    @click.option('--dir', 'directory', default=lambda: app.config.get('JWT_SIGNING_KEYS_DIR'),
+                  help='Key directory (defaults to JWT_SIGNING_KEYS_DIR).')
+    def generate_jwt_key(algorithm, directory):
+        """Add a signing key to the JWT key set"""
+        if not directory:
+            raise click.UsageError('Set JWT_SIGNING_KEYS_DIR or pass --dir')
+        kid = generate_signing_key(directory, algorithm)
+        
+        click.echo(f"Wrote {directory}/{kid}.pem ({algorithm})")
+        click.echo('It is published in /.well-known/jwks.json once the app restarts. To sign with it,')
+        click.echo(f"wait JWKS_MAX_AGE_SECONDS, then set JWT_SIGNING_KID={kid}")
+    
+    @app.cli.command('purge-refresh-tokens')
+    @click.option('--chunk-size', type=int, default=lambda: app.config.get('REFRESH_TOKEN_PURGE_CHUNK_SIZE', 1000),
+                  help='Rows deleted per transaction (defaults to REFRESH_TOKEN_PURGE_CHUNK_SIZE).')
+    @click.option('--pause', type=float, default=lambda: app.config.get('REFRESH_TOKEN_PURGE_PAUSE_SECONDS', 0.1),
+                  help='Seconds to sleep between chunks (defaults to REFRESH_TOKEN_PURGE_PAUSE_SECONDS).')
+    def purge_refresh_tokens(chunk_size, pause):
+        """Delete expired refresh tokens in chunks"""
+        from v3.customer_profile.token_maintenance import refresh_token_purger
+        
+        run = refresh_token_purger.purge(chunk_size=chunk_size, pause=pause)
+        click.echo(f"Deleted {run['deleted']} expired refresh tokens in {run['chunks']} chunks "
+                   f"({run['seconds']:.1f} s, {run['rows_per_second']:.0f} rows/s)")
+
+
 # Create the application instance
 app = create_app()
 